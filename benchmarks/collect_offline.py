@@ -0,0 +1,126 @@
+"""
+get_major 전체 수집(--jobs/--timeout/--retries)을 가짜 rusaint-cli로 오프라인 확인
+
+임시 작업 폴더에 src/classification 링크를 두고 benchmarks/fake_rusaint/를 PATH 앞에 놓은 뒤
+`python -m src.cli.get_major 2025 1 --jobs J --timeout T --retries R`를 실행한다.
+가짜 CLI는 학과마다 FAKE_RUSAINT_DELAY초 쉬고 fixture JSON을 쓰며, 지정한 학과의 첫 시도는 멈추거나(HANG) 실패한다(FAIL).
+  - retries : 멈춘 학과는 시간 초과로 종료된 뒤, 실패한 학과는 바로 재시도되어 모든 학과가 수집되는지
+  - no-retry: --retries 0이면 두 학과만 수집에 실패하고 나머지는 결과가 만들어지는지
+각 경우에 동시 실행 수가 1보다 크고 --jobs를 넘지 않는지, 반쯤 쓰인 파일이나 .collect_ 임시 폴더가 남지 않는지도 확인한다.
+하나라도 어긋나면 종료 코드 1.
+
+사용법 (저장소 루트에서):
+  python benchmarks/collect_offline.py
+  python benchmarks/collect_offline.py --jobs 4 --delay 0.5 --keep
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+FAKE_BIN = os.path.join(ROOT, 'benchmarks', 'fake_rusaint')
+sys.path.insert(0, ROOT)
+YEAR, SEMESTER = 2025, 1
+HANG_DEPARTMENT = '컴퓨터학부'
+FAIL_DEPARTMENT = '경영학부'
+def departments():
+    from src.cli.get_major import split_department
+    from src.core.ssu_data import SSU_DATA
+    return [(college['name'],) + split_department(department)
+            for college in SSU_DATA['colleges'] for department in college['departments']]
+def max_concurrency(log_path):
+    """
+    calls.log의 start/end/fail/hang 기록으로 동시에 실행 중이던 가짜 CLI 수의 최댓값
+    멈춘 호출은 kill되어 끝 기록이 없으므로 살아 있음이 확실한 마지막 시점(hang 기록)까지만 센다.
+    (start + timeout으로 추정하면 부하 중 인터프리터 기동 지연만큼 실제 kill 시각보다 늦어 과대 계산됨)
+    """
+    starts, ends = {}, {}
+    with open(log_path, encoding='utf-8') as f:
+        for line in f:
+            stamp, pid, event, key = line.rstrip('\n').split('\t')
+            if event == 'start':
+                starts[pid] = float(stamp)
+            else:
+                ends[pid] = float(stamp)
+    events = sorted([(stamp, 1) for stamp in starts.values()] + [(stamp, -1) for stamp in ends.values()])
+    running, peak = 0, 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+    return peak
+def run_case(name, jobs, timeout, retries, delay, keep):
+    work_dir = tempfile.mkdtemp(prefix=f'collect_offline_{name}_')
+    state_dir = os.path.join(work_dir, 'state')
+    os.makedirs(state_dir)
+    for link in ('src', 'classification'):
+        os.symlink(os.path.join(ROOT, link), os.path.join(work_dir, link))
+    env = dict(os.environ, PATH=FAKE_BIN + os.pathsep + os.environ.get('PATH', ''), FAKE_RUSAINT_STATE=state_dir,
+               FAKE_RUSAINT_DELAY=str(delay), FAKE_RUSAINT_HANG=HANG_DEPARTMENT, FAKE_RUSAINT_FAIL=FAIL_DEPARTMENT)
+    command = [sys.executable, '-m', 'src.cli.get_major', str(YEAR), str(SEMESTER), '--no-daemon',
+               '--jobs', str(jobs), '--timeout', str(timeout), '--retries', str(retries)]
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=work_dir, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    semester_dir = os.path.join(work_dir, 'result', f'{YEAR}_{SEMESTER}')
+    files = os.listdir(semester_dir) if os.path.isdir(semester_dir) else []
+    sources = [f for f in files if f.endswith('_전공.json')]
+    problems = []
+    if completed.returncode != 0:
+        problems.append(f"종료 코드 {completed.returncode}: {completed.stderr.strip()[-500:]}")
+    expected_failed = set() if retries > 0 else {HANG_DEPARTMENT, FAIL_DEPARTMENT}
+    tasks = departments()
+    for college, department, major in tasks:
+        source = f"{YEAR}_{SEMESTER}학기_{college}_{department}_전공.json"
+        collected = source in files
+        if collected == (department in expected_failed):
+            problems.append(f"{college} {department}: {'수집되면 안 됨' if collected else '원본 파일 없음'}")
+        if collected:
+            try:
+                with open(os.path.join(semester_dir, source), encoding='utf-8') as f:
+                    json.load(f)
+            except ValueError:
+                problems.append(f"{source}: 반쯤 쓰인 파일")
+    outputs = [f for f in files if f.startswith('major_')]
+    expected_outputs = len({(c, d) for c, d, m in tasks if d not in expected_failed})
+    if len(outputs) != expected_outputs:
+        problems.append(f"major_ 결과 파일 {len(outputs)}개 (기대 {expected_outputs}개, 전공이 나뉜 학부는 파일 하나)")
+    leftovers = [f for f in files if f.startswith('.collect_')]
+    if leftovers:
+        problems.append(f"임시 폴더가 남음: {leftovers}")
+    for department, attempts in ((HANG_DEPARTMENT, retries + 1), (FAIL_DEPARTMENT, retries + 1)):
+        college = next(c for c, d, m in tasks if d == department)
+        path = os.path.join(state_dir, f"attempts_{college}_{department}")
+        seen = os.path.getsize(path) if os.path.exists(path) else 0
+        if seen != min(attempts, 2):
+            problems.append(f"{department}: 시도 {seen}회 (기대 {min(attempts, 2)}회)")
+    peak = max_concurrency(os.path.join(state_dir, 'calls.log'))
+    if not 1 < peak <= jobs:
+        problems.append(f"동시 실행 최대 {peak}개 (기대 2~{jobs}개)")
+    sequential = len(tasks) * delay
+    if elapsed >= sequential:
+        problems.append(f"{elapsed:.1f}초 걸림 (순차 실행 추정 {sequential:.1f}초보다 느림)")
+    print(f"{'✅' if not problems else '❌'} {name}: jobs={jobs} timeout={timeout} retries={retries}, "
+          f"{elapsed:.1f}초 (순차 추정 {sequential:.1f}초), 동시 실행 최대 {peak}개, 원본 {len(sources)}개")
+    for problem in problems:
+        print(f"   - {problem}")
+    if keep:
+        print(f"   📁 {work_dir}")
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return not problems
+def main():
+    parser = argparse.ArgumentParser(description='가짜 rusaint-cli로 get_major 전체 수집(--jobs/--timeout/--retries) 확인')
+    parser.add_argument('--jobs', type=int, default=8, help='동시 실행 수 (기본 8)')
+    parser.add_argument('--timeout', type=float, default=2.0, help='호출당 제한 시간(초), 멈춘 학과가 이 시간 뒤 종료됨')
+    parser.add_argument('--delay', type=float, default=0.3, help='가짜 CLI의 호출당 지연(초)')
+    parser.add_argument('--keep', action='store_true', help='작업 폴더를 지우지 않고 경로 출력')
+    args = parser.parse_args()
+    ok = run_case('retries', args.jobs, args.timeout, 1, args.delay, args.keep)
+    ok = run_case('no-retry', args.jobs, args.timeout, 0, args.delay, args.keep) and ok
+    sys.exit(0 if ok else 1)
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+충돌 검사 백엔드(python: ConflictIndex, numpy: SlotMatrixIndex) 일괄 질의 벤치마크
+
+합성 분반 N개(주 1~3회, 50~180분 수업)를 만들어 각 백엔드로
+  - build   : 색인 생성 (numpy는 비트 행렬까지)
+  - free    : 학생 시간표(분반 5개) Q개 각각에 대해 "겹치지 않는 분반 전체" 질의
+  - slots   : 30분 슬롯별 수업 분반 수
+를 재고, 두 백엔드의 결과가 같은지 확인한다.
+
+사용법 (저장소 루트에서):
+  python benchmarks/conflict_backends.py
+  python benchmarks/conflict_backends.py --sizes 3000 30000 --queries 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+DEFAULT_SIZES = [3_000, 30_000]
+WEEKDAYS = ['월', '화', '수', '목', '금', '토']
+def synthetic_sections(n, seed=0):
+    """courseTime만 가진 합성 분반 (code = 위치)"""
+    rng = random.Random(seed)
+    sections = []
+    for i in range(n):
+        course_times = []
+        for day in rng.sample(WEEKDAYS, rng.choice([1, 2, 2, 3])):
+            start = rng.randrange(9 * 60, 21 * 60, 15)
+            end = min(start + rng.choice([50, 75, 90, 120, 180]), 23 * 60 + 59)
+            course_times.append({
+                'week': day,
+                'startTime': f'{start // 60:02d}:{start % 60:02d}',
+                'endTime': f'{end // 60:02d}:{end % 60:02d}'
+            })
+        sections.append({'code': i, 'courseTime': course_times})
+    return sections
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+def run_backend(backend, sections, timetables):
+    from src.core.conflict_checker import get_conflict_index_class
+    index_class = get_conflict_index_class(backend)
+    def build():
+        index = index_class.from_courses(sections)
+        if hasattr(index, 'matrix'):
+            index.matrix
+        return index
+    index, build_seconds = timed(build)
+    free, free_seconds = timed(lambda: [index.conflict_free(intervals) for intervals in timetables])
+    slots, slot_seconds = timed(lambda: index.slot_counts(30))
+    return {'build': build_seconds, 'free': free_seconds, 'slots': slot_seconds, 'result': (free, slots)}
+def main():
+    parser = argparse.ArgumentParser(description='충돌 검사 백엔드 일괄 질의 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='합성 분반 수')
+    parser.add_argument('--queries', type=int, default=100, help='"겹치지 않는 분반" 질의 수')
+    args = parser.parse_args()
+    from src.core.schedule_parser import intervals_from_course_times
+    try:
+        import numpy  # noqa: F401
+        backends = ['python', 'numpy']
+    except ImportError:
+        print("⚠️ NumPy가 없어 python 백엔드만 측정합니다.")
+        backends = ['python']
+    print(f"{'N':>8} {'backend':>8} {'build':>9} {'free×Q':>9} {'per query':>10} {'slots':>9}")
+    for n in args.sizes:
+        sections = synthetic_sections(n)
+        rng = random.Random(n)
+        timetables = [
+            [interval for section in rng.sample(sections, 5)
+             for interval in intervals_from_course_times(section['courseTime'])]
+            for _ in range(args.queries)
+        ]
+        results = {}
+        for backend in backends:
+            stats = run_backend(backend, sections, timetables)
+            results[backend] = stats['result']
+            print(f"{n:>8} {backend:>8} {stats['build'] * 1000:>7.1f}ms {stats['free'] * 1000:>7.1f}ms "
+                  f"{stats['free'] / args.queries * 1000:>8.2f}ms {stats['slots'] * 1000:>7.1f}ms")
+        if len(results) == 2:
+            same = results['python'] == results['numpy']
+            print(f"{'':>8} {'결과 일치' if same else '❌ 결과 불일치'}")
+if __name__ == '__main__':
+    main()
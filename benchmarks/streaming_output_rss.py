@@ -0,0 +1,95 @@
+"""
+filter_subjects 실제 실행 경로의 최대 메모리(RSS) 벤치마크
+
+합성 원본(rusaint-cli 형식) 과목 N개를 임시 result/2025_1/ 아래 파일 하나로 기록하고,
+`python -m src.cli.filter_subjects`와 같은 경로(원본 읽기 → 정규화/스토어 기록 → 필터 → 스트리밍 출력)를
+새 프로세스에서 실행해 최대 RSS를 잰다.
+  - cold : 정규화 스토어(.cache) 없이 실행 (원본을 조각 단위로 읽으며 정규화하고 스토어를 기록)
+  - warm : 앞 실행이 남긴 스토어(mmap 스냅샷)를 읽음
+두 모드(abbr, department)와 두 출력 형식(json, ndjson) 모두 N과 무관하게 평평해야 한다.
+
+사용법 (저장소 루트에서):
+  python benchmarks/streaming_output_rss.py
+  python benchmarks/streaming_output_rss.py --sizes 20000 200000 --modes abbr --formats ndjson
+"""
+import argparse
+import json
+import os
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+MODES = ['abbr', 'department']
+FORMATS = ['json', 'ndjson']
+CACHE_STATES = ['cold', 'warm']
+SEMESTER_DIR = os.path.join('result', '2025_1')
+SOURCE_NAME = '2025_1학기_합성대학_합성_전공.json'
+DEPARTMENT_ARGS = ['--department', '컴퓨터학부', '--year', '3']
+def peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+def prepare_workdir(work_dir, n):
+    """작업 폴더에 합성 원본 파일 하나와 classification 링크를 만들고 원본 크기(bytes) 반환"""
+    from benchmarks.synthetic_catalog import synthetic_raw_courses, write_raw_file
+    folder_path = os.path.join(work_dir, SEMESTER_DIR)
+    os.makedirs(folder_path, exist_ok=True)
+    source_path = os.path.join(folder_path, SOURCE_NAME)
+    write_raw_file(source_path, synthetic_raw_courses(n))
+    os.symlink(os.path.join(ROOT, 'classification'), os.path.join(work_dir, 'classification'))
+    return os.path.getsize(source_path)
+def output_files(work_dir):
+    folder_path = os.path.join(work_dir, SEMESTER_DIR)
+    return [os.path.join(folder_path, f) for f in os.listdir(folder_path) if f.startswith('search_')]
+def run_worker(mode, fmt):
+    """작업 폴더(cwd)에서 filter_subjects CLI를 그대로 실행하고 통계를 JSON 한 줄로 출력"""
+    argv = ['filter_subjects', '--mode', mode, '--format', fmt, '--no-daemon']
+    if mode == 'department':
+        argv += DEPARTMENT_ARGS
+    sys.argv = argv
+    started = time.perf_counter()
+    runpy.run_module('src.cli.filter_subjects', run_name='__main__')
+    seconds = time.perf_counter() - started
+    outputs = output_files(os.getcwd())
+    print(json.dumps({
+        'seconds': seconds,
+        'rss_mb': peak_rss_mb(),
+        'bytes': sum(os.path.getsize(path) for path in outputs)
+    }))
+def main():
+    parser = argparse.ArgumentParser(description='filter_subjects 실제 실행 경로 메모리 벤치마크 (cold/warm 스토어)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='합성 과목 수')
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES, help='필터 모드')
+    parser.add_argument('--formats', nargs='+', default=FORMATS, choices=FORMATS, help='출력 형식')
+    parser.add_argument('--worker', nargs=2, metavar=('MODE', 'FORMAT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        run_worker(*args.worker)
+        return
+    print(f"{'N':>10} {'input':>9} {'mode':>10} {'format':>7} {'cache':>5} {'peak RSS':>10} {'time':>8} {'output':>9}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as work_dir:
+            input_bytes = prepare_workdir(work_dir, n)
+            for mode in args.modes:
+                for fmt in args.formats:
+                    shutil.rmtree(os.path.join(work_dir, SEMESTER_DIR, '.cache'), ignore_errors=True)
+                    for state in CACHE_STATES:
+                        for path in output_files(work_dir):
+                            os.remove(path)
+                        result = subprocess.run(
+                            [sys.executable, os.path.abspath(__file__), '--worker', mode, fmt],
+                            capture_output=True, text=True, encoding='utf-8', cwd=work_dir
+                        )
+                        label = f"{n:>10} {input_bytes / 1e6:>7.1f}MB {mode:>10} {fmt:>7} {state:>5}"
+                        if result.returncode != 0:
+                            print(f"{label} 실패: {(result.stderr.strip().splitlines() or ['?'])[-1]}")
+                            continue
+                        stats = json.loads(result.stdout.strip().splitlines()[-1])
+                        print(f"{label} {stats['rss_mb']:>8.1f}MB {stats['seconds']:>7.1f}s {stats['bytes'] / 1e6:>7.1f}MB")
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+"""
+합성 카탈로그(benchmarks/synthetic_catalog.py) 기반 종합 벤치마크
+
+크기마다 임시 폴더에 result/2025_1 합성 학기를 만들고, 새 프로세스에서 그 폴더를 작업 디렉토리로 삼아
+  - search_cold        : CourseSearcher.search_by_keyword_local 첫 검색 (정규화 스토어·검색 색인 생성 포함)
+  - search_warm        : 색인이 있는 상태에서 다른 키워드 검색 5회 (결과 캐시 미사용)
+  - filter_abbr        : filter_subjects 약칭 표준화 모드 (원본 파일마다)
+  - filter_dept_year   : filter_subjects 학과/학년 모드 (컴퓨터학부 3학년)
+  - parse_full         : parse_categories 전체 처리 + 결과 저장
+  - parse_incremental  : 입력이 그대로일 때 parse_categories 재실행 + 결과 저장
+  - schedule_parse     : 모든 schedule_room에 parse_schedule_entry (메모이즈 캐시를 비운 상태)
+  - department_match   : 새 DepartmentMatcher로 모든 target에 match_all
+  - collect            : 가짜 rusaint-cli를 PATH에 두고 get_all_majors_info 전체 수집 (학과당 N / 학과 수 과목)
+을 재고, 결과를 JSON으로 남긴 뒤 저장된 기준선(benchmarks/baseline.json)과 비교해 느려진 항목을 표시한다.
+같은 크기를 --repeat번(기본 3) 새 프로세스로 돌려 항목별 중앙값으로 비교한다 (최솟값도 함께 기록).
+기준선보다 --threshold 비율 넘게, 그리고 --min-delta초 넘게 느려진 항목만 느려짐으로 보며,
+기준선이 --min-seconds초보다 짧은 항목은 잡음이 커서 표시만 하고 판정하지 않는다. 느려진 항목이 있으면 종료 코드 1.
+
+사용법 (저장소 루트에서):
+  python benchmarks/suite.py
+  python benchmarks/suite.py --sizes 10000 100000 1000000 --output bench.json
+  python benchmarks/suite.py --scenarios search_cold filter_abbr --threshold 0.5
+  python benchmarks/suite.py --update-baseline
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+DEFAULT_SIZES = [10_000]
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+YEAR, SEMESTER = 2025, 1
+SEARCH_KEYWORDS = ['운영체제', '김민', '컴퓨터', '세미나', '경영학부']
+FAKE_RUSAINT_CLI = '''#!{python}
+import argparse, json, os, sys
+sys.path.insert(0, {benchmarks!r})
+from synthetic_catalog import synthetic_raw_courses
+parser = argparse.ArgumentParser()
+parser.add_argument('cmd')
+for name in ('--year', '--semester', '--college', '--department', '--major'):
+    parser.add_argument(name)
+args = parser.parse_args()
+seed = sum(args.department.encode('utf-8'))
+name = f"{{args.year}}_{{args.semester}}학기_{{args.college}}_{{args.department}}_전공.json"
+with open(name, 'w', encoding='utf-8') as f:
+    json.dump(list(synthetic_raw_courses({per_department}, seed=seed)), f, ensure_ascii=False)
+'''
+def semester_dir():
+    return os.path.join('result', f'{YEAR}_{SEMESTER}')
+def source_paths():
+    from src.core.catalog_paths import list_source_files
+    return [os.path.join(semester_dir(), filename) for filename in list_source_files(semester_dir())]
+def raw_values(field):
+    values = []
+    for path in source_paths():
+        with open(path, 'r', encoding='utf-8') as f:
+            values.extend(course.get(field) or '' for course in json.load(f))
+    return values
+def scenario_search_cold(size):
+    from src.cli.find_by_lecture import CourseSearcher
+    return len(CourseSearcher().search_by_keyword_local(YEAR, SEMESTER, '자료구조'))
+def scenario_search_warm(size):
+    from src.cli.find_by_lecture import CourseSearcher
+    searcher = CourseSearcher()
+    return sum(len(searcher.search_by_keyword_local(YEAR, SEMESTER, keyword)) for keyword in SEARCH_KEYWORDS)
+def scenario_filter_abbr(size):
+    from src.cli.filter_subjects import filter_by_abbr
+    paths = source_paths()
+    os.makedirs('out', exist_ok=True)
+    for i, path in enumerate(paths):
+        filter_by_abbr(path, os.path.join('out', f'abbr_{i}.json'))
+    return len(paths)
+def scenario_filter_dept_year(size):
+    from src.cli.filter_subjects import filter_by_department_year
+    paths = source_paths()
+    os.makedirs('out', exist_ok=True)
+    for i, path in enumerate(paths):
+        filter_by_department_year(path, os.path.join('out', f'dept_{i}.json'), '컴퓨터학부', 3)
+    return len(paths)
+def scenario_parse_full(size):
+    from src.utils.parse_categories import parse_2025_1_courses, save_results
+    manifest, changed = parse_2025_1_courses(semester_dir(), full=True)
+    save_results(manifest, semester_dir(), semester_dir())
+    return changed
+def scenario_parse_incremental(size):
+    from src.utils.parse_categories import parse_2025_1_courses, save_results
+    manifest, changed = parse_2025_1_courses(semester_dir())
+    save_results(manifest, semester_dir(), semester_dir())
+    return changed
+def scenario_schedule_parse(size):
+    from src.core.schedule_parser import parse_schedule_entry, tokenize_schedule
+    entries = raw_values('schedule_room')
+    tokenize_schedule.cache_clear()
+    started = time.perf_counter()
+    count = sum(len(parse_schedule_entry(entry)) for entry in entries)
+    return count, time.perf_counter() - started
+def scenario_department_match(size):
+    from src.utils.department_matcher import DepartmentMatcher
+    targets = raw_values('target')
+    started = time.perf_counter()
+    matcher = DepartmentMatcher()
+    count = sum(len(matcher.match_all(target)) for target in targets)
+    return count, time.perf_counter() - started
+def scenario_collect(size):
+    from src.cli.get_major import SSUMajorFinder
+    from src.core.ssu_data import SSU_DATA
+    departments = sum(len(college['departments']) for college in SSU_DATA['colleges'])
+    bin_dir = os.path.abspath('fakebin')
+    os.makedirs(bin_dir, exist_ok=True)
+    script = os.path.join(bin_dir, 'rusaint-cli')
+    with open(script, 'w', encoding='utf-8') as f:
+        f.write(FAKE_RUSAINT_CLI.format(python=sys.executable, benchmarks=os.path.join(ROOT, 'benchmarks'),
+                                        per_department=max(1, size // departments)))
+    os.chmod(script, 0o755)
+    os.environ['PATH'] = bin_dir + os.pathsep + os.environ.get('PATH', '')
+    os.makedirs('collect', exist_ok=True)
+    os.chdir('collect')
+    try:
+        started = time.perf_counter()
+        SSUMajorFinder().get_all_majors_info(YEAR, SEMESTER, jobs=8)
+        elapsed = time.perf_counter() - started
+        return len(os.listdir(semester_dir())), elapsed
+    finally:
+        os.chdir('..')
+SCENARIOS = {
+    'search_cold': scenario_search_cold,
+    'search_warm': scenario_search_warm,
+    'filter_abbr': scenario_filter_abbr,
+    'filter_dept_year': scenario_filter_dept_year,
+    'parse_full': scenario_parse_full,
+    'parse_incremental': scenario_parse_incremental,
+    'schedule_parse': scenario_schedule_parse,
+    'department_match': scenario_department_match,
+    'collect': scenario_collect
+}
+PREREQUISITES = {'search_warm': 'search_cold', 'parse_incremental': 'parse_full'}
+def run_worker(size, work_dir, scenarios, output_path):
+    """
+    work_dir에 합성 학기를 만들고 그곳을 작업 디렉토리로 삼아 시나리오를 차례로 실행
+    시나리오가 (개수, 초)를 돌려주면 그 초를 쓰고 (준비 과정 제외), 개수만 돌려주면 호출 전체 시간을 잰다.
+    search_warm/parse_incremental만 고르면 앞 단계(search_cold/parse_full)를 재지 않고 먼저 실행한다.
+    """
+    from synthetic_catalog import write_semester
+    os.chdir(work_dir)
+    os.symlink(os.path.join(ROOT, 'classification'), 'classification')
+    started = time.perf_counter()
+    write_semester(semester_dir(), size)
+    results = {'generate': {'seconds': time.perf_counter() - started, 'count': size}}
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        for name in scenarios:
+            required = PREREQUISITES.get(name)
+            if required and required not in results:
+                with contextlib.redirect_stdout(devnull):
+                    SCENARIOS[required](size)
+            with contextlib.redirect_stdout(devnull):
+                started = time.perf_counter()
+                outcome = SCENARIOS[name](size)
+                elapsed = time.perf_counter() - started
+            count, seconds = outcome if isinstance(outcome, tuple) else (outcome, elapsed)
+            results[name] = {'seconds': seconds, 'count': count}
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f)
+def run_size(size, scenarios, repeat):
+    """크기 하나를 repeat번 새 프로세스로 실행해 항목별 중앙값(seconds)과 최솟값(min_seconds)"""
+    runs = {}
+    for _ in range(repeat):
+        work_dir = tempfile.mkdtemp(prefix='bench_suite_')
+        output_path = os.path.join(work_dir, 'worker.json')
+        try:
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', '--sizes', str(size),
+                            '--work-dir', work_dir, '--worker-output', output_path, '--scenarios', *scenarios],
+                           check=True)
+            with open(output_path, 'r', encoding='utf-8') as f:
+                for name, stats in json.load(f).items():
+                    runs.setdefault(name, []).append(stats)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        name: {
+            'seconds': statistics.median(stats['seconds'] for stats in samples),
+            'min_seconds': min(stats['seconds'] for stats in samples),
+            'count': samples[-1]['count'],
+            'runs': len(samples)
+        }
+        for name, samples in runs.items()
+    }
+def compare(results, baseline, threshold, min_delta, min_seconds):
+    """
+    기준선 대비 (크기, 항목, 기준 초, 현재 초, 비율, 느려짐 여부) 목록 (양쪽에 모두 있는 항목만)
+    비율과 절대 차이가 모두 한도를 넘어야 느려짐이며, 기준선이 min_seconds보다 짧은 항목은 판정하지 않는다.
+    """
+    rows = []
+    for size, scenarios in results.items():
+        for name, stats in scenarios.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            ratio = stats['seconds'] / base['seconds'] if base['seconds'] else float('inf')
+            regressed = (base['seconds'] >= min_seconds and ratio > 1 + threshold
+                         and stats['seconds'] - base['seconds'] > min_delta)
+            rows.append((size, name, base['seconds'], stats['seconds'], ratio, regressed))
+    return rows
+def load_baseline(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+def main():
+    parser = argparse.ArgumentParser(description='합성 카탈로그 종합 벤치마크 (검색/필터/파싱/수집)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='합성 과목 수 (예: 10000 100000 1000000)')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS), help='실행할 항목')
+    parser.add_argument('--repeat', type=int, default=3, help='크기마다 반복 횟수 (항목별 중앙값으로 비교, 기본 3)')
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='비교할 기준선 JSON')
+    parser.add_argument('--threshold', type=float, default=0.25, help='느려짐으로 볼 비율 (0.25 = 25%% 이상 느려짐)')
+    parser.add_argument('--min-delta', type=float, default=0.05, help='이 초보다 작은 차이는 느려짐으로 보지 않음 (기본 0.05)')
+    parser.add_argument('--min-seconds', type=float, default=0.1,
+                        help='기준선이 이 초보다 짧은 항목은 잡음이 커서 판정하지 않음 (기본 0.1)')
+    parser.add_argument('--update-baseline', action='store_true', help='이번 결과로 기준선 갱신 (크기별로 덮어씀)')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--work-dir', help=argparse.SUPPRESS)
+    parser.add_argument('--worker-output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        run_worker(args.sizes[0], args.work_dir, args.scenarios, args.worker_output)
+        return
+    results = {}
+    for size in args.sizes:
+        print(f"⏱️ 과목 {size:,}개 측정 중...")
+        results[str(size)] = run_size(size, args.scenarios, args.repeat)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': args.repeat
+        },
+        'results': results
+    }
+    print(f"\n{'N':>9} {'scenario':<18} {'median':>9} {'min':>9} {'count':>9}")
+    for size, scenarios in results.items():
+        for name, stats in scenarios.items():
+            print(f"{size:>9} {name:<18} {stats['seconds']:>9.3f} {stats['min_seconds']:>9.3f} {stats['count']:>9}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 결과 저장: {args.output}")
+    baseline = load_baseline(args.baseline)
+    regressions = []
+    if baseline and not args.update_baseline:
+        rows = compare(results, baseline['results'], args.threshold, args.min_delta, args.min_seconds)
+        print(f"\n기준선 비교 ({args.baseline}, 허용 +{args.threshold:.0%})")
+        print(f"{'N':>9} {'scenario':<18} {'baseline':>9} {'now':>9} {'ratio':>7}")
+        for size, name, base, now, ratio, regressed in rows:
+            note = '  ❌ 느려짐' if regressed else ('  (짧아서 판정 제외)' if base < args.min_seconds else '')
+            print(f"{size:>9} {name:<18} {base:>9.3f} {now:>9.3f} {ratio:>6.2f}x{note}")
+        regressions = [row for row in rows if row[-1]]
+    if args.update_baseline:
+        merged = baseline or {'meta': report['meta'], 'results': {}}
+        merged['meta'] = report['meta']
+        merged['results'].update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"\n📁 기준선 갱신: {args.baseline}")
+    if regressions:
+        print(f"\n❌ 기준선보다 느려진 항목 {len(regressions)}개")
+        sys.exit(1)
+if __name__ == '__main__':
+    main()
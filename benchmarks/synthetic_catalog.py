@@ -0,0 +1,154 @@
+"""
+2025_1 원본 데이터를 본뜬 결정적(시드 고정) 합성 과목 생성기
+
+rusaint-cli가 만드는 원본 JSON과 같은 키/문자열 형식으로 과목을 만든다.
+  - category/sub_category : '전선-컴퓨터/부선-컴퓨터', '교필', '전기-AI융합/전기-IT융합/...' 처럼 '/'로 이은 이수구분-학과 약칭
+  - target                : '3학년 컴퓨터 ,소프트 (대상외수강제한)', '전체학년 경영학부;순수외국인입학생', '2학년 전체\\n3학년 전체' 등
+  - schedule_room         : '월 수 15:00-16:15 (조만식기념관 12207 (박명복강의실)-이정규)' 같은 줄을 0~여러 줄
+같은 (n, seed)면 항상 같은 과목이 나온다.
+
+사용법 (저장소 루트에서):
+  python benchmarks/synthetic_catalog.py /tmp/synthetic/result/2025_1 --courses 100000
+"""
+import argparse
+import os
+import random
+from typing import Dict, Iterator, List
+WEEKDAYS = ['월', '화', '수', '목', '금', '토']
+KINDS = [('전선', 30), ('부선', 28), ('복선', 27), ('융선', 14), ('전필', 8), ('전기', 7), ('전공', 7), ('복필', 6),
+         ('교직전공', 1), ('융필', 1), ('부필', 1)]
+GENERAL_CATEGORIES = [('교필', 4), ('교선', 4), ('채플', 1)]
+DEPARTMENT_LABELS = [
+    '경영학부', '글로벌통상', '전기', 'IT융합', '벤처중소', '기계', '전자공학', '회계학과', '화공', '컴퓨터',
+    '글로벌미디어', '산업·정보', 'AI융합', '신소재', '경제', '소프트', '금융학부', '언론홍보', '법학', '사회복지',
+    '의생명시스템', '건축공학', '물리', '국문', '사학', '화학', '영문', '기독교', 'ICT유통물류융합', '행정학부',
+    '실내건축', '국제법무', '수학', '미디어경영', '불문', '독문', '문예창작', '일어일문', '통계·보험', '중문',
+    '철학', '금융경제', '국제무역', '평생교육', '정외', '건축학', '정보사회', '스포츠', '차세대반도체', '자유전공'
+]
+BUILDINGS = [
+    ('조만식기념관', 12, 1124), ('진리관', 11, 833), ('형남공학관', 5, 652), ('미래관', 20, 635), ('숭덕경상관', 2, 581),
+    ('문화관', 3, 489), ('정보과학관', 21, 445), ('웨스트민스터홀', 9, 289), ('벤처중소기업센터', 19, 234),
+    ('백마관', 7, 232), ('베어드홀', 1, 152), ('교육관', 4, 104), ('안익태기념관', 16, 95), ('전산관', 14, 72)
+]
+SLOTS = [('09:00', '10:15'), ('10:30', '11:45'), ('12:00', '13:15'), ('13:30', '14:45'), ('15:00', '16:15'),
+         ('16:30', '17:45'), ('18:00', '19:15'), ('09:00', '09:50'), ('13:00', '13:50'), ('14:00', '14:50'),
+         ('15:00', '17:50'), ('19:00', '21:45')]
+TIME_POINTS = [('3.0/3.0', 74), ('2.0/2.0', 15), ('4.0/3.0', 4), ('2.0/1.0', 2), ('1.0/1.0', 1), ('3.0/2.0', 1)]
+DIVISIONS = [(None, 96), ('(공통-재수강)', 2), ('(팀티칭)', 1), ('(가반)', 1)]
+SURNAMES = '김이박최정강조윤장임한오서신권황안송류홍'
+GIVEN = '민서준지현우수영재은동성하진혜경태미정호선'
+NAME_STEMS = ['자료구조', '운영체제', '회계원리', '미시경제', '국제통상', '디지털논리', '선형대수', '일반화학',
+              '현대문학', '사회조사방법', '재무관리', '기계설계', '전자회로', '알고리즘', '마케팅', '철학입문',
+              '데이터베이스', '컴퓨터구조', '인공지능', '통계학', '글쓰기', '영어회화', '기독교와문화', '창의적사고']
+NAME_SUFFIXES = ['', '', '', '및실습', '및실험', '1', '2', '세미나', '특강', '(영강)']
+def _weighted(rng: random.Random, choices: List[tuple]):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+def _person(rng: random.Random) -> str:
+    return rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN)
+def _category(rng: random.Random, department: str) -> str:
+    """'전선-컴퓨터/부선-컴퓨터' 또는 여러 학과가 같이 듣는 '전기-AI융합/전기-IT융합/...' (교양은 '교필')"""
+    if rng.random() < 0.26:
+        return _weighted(rng, GENERAL_CATEGORIES)
+    kind = _weighted(rng, KINDS[:8])
+    if rng.random() < 0.1:
+        labels = sorted(set(rng.sample(DEPARTMENT_LABELS, rng.randint(2, 15))))
+        return '/'.join(f"{kind}-{label}" for label in labels)
+    tokens = [f"{kind}-{department}"]
+    for extra in rng.sample(['부선', '복선', '융선'], rng.randint(0, 2)):
+        tokens.append(f"{extra}-{department}")
+    return '/'.join(tokens)
+def _sub_category(rng: random.Random, department: str):
+    if rng.random() < 0.5:
+        return None
+    return '/'.join(f"{kind}-{department}" for kind in rng.sample(['복선', '부선', '복필'], rng.randint(1, 2)))
+def _target(rng: random.Random, department: str) -> str:
+    """'전체', 'N학년 학과 ,학과 (대상외수강제한)', '전체학년 학과;순수외국인입학생', 여러 학년 줄 등"""
+    roll = rng.random()
+    if roll < 0.25:
+        return '전체'
+    if roll < 0.3:
+        return '\n'.join(f"{grade}학년 전체" for grade in range(rng.randint(1, 3), 5)) + ' (대상외수강제한)'
+    grade = '전체학년' if roll < 0.5 else f"{rng.randint(1, 4)}학년"
+    departments = [department] + rng.sample(DEPARTMENT_LABELS, rng.choice([0, 0, 0, 1, 2, 4]))
+    text = f"{grade} {' ,'.join(dict.fromkeys(departments))}"
+    if rng.random() < 0.15:
+        text += ';순수외국인입학생'
+    if rng.random() < 0.4:
+        text += ' (대상외수강제한)'
+    return text
+def _schedule_room(rng: random.Random, professors: List[str]) -> str:
+    """요일들 + 시간 + (건물 호실 (강의실 이름)-교수) 줄을 0~4줄 (2% 정도는 빈 문자열)"""
+    lines = rng.choice([0, 1, 1, 1, 1, 1, 1, 2, 2, 3, 4]) if rng.random() > 0.02 else 0
+    rows = []
+    for _ in range(lines):
+        building, number, _weight = rng.choices(BUILDINGS, [b[2] for b in BUILDINGS])[0]
+        start, end = rng.choice(SLOTS)
+        days = ' '.join(sorted(rng.sample(WEEKDAYS[:5], rng.choice([1, 1, 2])), key=WEEKDAYS.index))
+        room = f"{building} {number:02d}{rng.randrange(100, 600)}"
+        if rng.random() < 0.1:
+            room += f" ({_person(rng)}강의실)"
+        rows.append(f"{days} {start}-{end} ({room}-{rng.choice(professors) if professors else ''})")
+    return '\n'.join(rows)
+def department_name(label: str) -> str:
+    """학과 약칭 → 개설 학과명 (예: '컴퓨터' → '컴퓨터학과', '사학' → '사학과', '경영학부'는 그대로)"""
+    if label.endswith(('학부', '학과')):
+        return label
+    return f"{label}과" if label.endswith('학') else f"{label}학과"
+def synthetic_raw_courses(n: int, seed: int = 0, start: int = 0) -> Iterator[Dict]:
+    """원본(rusaint-cli) 형식의 합성 과목 n개 (code는 start부터 이어지는 번호)"""
+    rng = random.Random(seed)
+    for i in range(start, start + n):
+        department = rng.choice(DEPARTMENT_LABELS)
+        professors = [_person(rng) for _ in range(rng.choice([1, 1, 1, 1, 2, 3]))] if rng.random() > 0.01 else []
+        remaining = rng.randrange(0, 40)
+        yield {
+            'syllabus': None,
+            'category': _category(rng, department),
+            'sub_category': _sub_category(rng, department),
+            'abeek_info': None,
+            'field': None,
+            'code': str(i + 1),
+            'name': rng.choice(NAME_STEMS) + rng.choice(NAME_SUFFIXES),
+            'division': _weighted(rng, DIVISIONS),
+            'professor': '\n'.join(professors),
+            'department': department_name(department),
+            'time_points': _weighted(rng, TIME_POINTS),
+            'personeel': str(remaining + rng.randrange(0, 120)),
+            'remaining_seats': str(remaining),
+            'schedule_room': _schedule_room(rng, professors),
+            'target': _target(rng, department)
+        }
+def write_raw_file(path: str, courses: Iterator[Dict]) -> int:
+    """원본 JSON 배열 파일 하나를 스트리밍으로 기록하고 과목 수 반환"""
+    from src.utils.json_writer import JsonArrayWriter
+    with JsonArrayWriter(path, indent=None) as writer:
+        writer.write_all(courses)
+    return writer.count
+def write_semester(folder_path: str, n: int, seed: int = 0, per_file: int = 3000,
+                   year: int = 2025, semester: int = 1) -> List[str]:
+    """
+    학기 폴더에 합성 과목 n개를 per_file개씩 원본 파일로 나눠 기록 (파일마다 시드가 달라 내용이 겹치지 않음)
+    반환: 기록한 파일 이름 목록
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    filenames = []
+    for part, start in enumerate(range(0, n, per_file)):
+        filename = f"{year}_{semester}학기_합성대학_합성{part:04d}_전공.json"
+        write_raw_file(os.path.join(folder_path, filename),
+                       synthetic_raw_courses(min(per_file, n - start), seed=seed * 100003 + part, start=start))
+        filenames.append(filename)
+    return filenames
+def main():
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    parser = argparse.ArgumentParser(description='2025_1 원본 형식의 합성 과목 생성')
+    parser.add_argument('folder', help='학기 폴더 (예: /tmp/synthetic/result/2025_1)')
+    parser.add_argument('--courses', type=int, default=10_000, help='과목 수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--per-file', type=int, default=3000, help='원본 파일 하나당 과목 수')
+    args = parser.parse_args()
+    filenames = write_semester(args.folder, args.courses, args.seed, args.per_file)
+    print(f"✅ {args.folder}: 과목 {args.courses:,}개, 파일 {len(filenames)}개")
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,20 @@
-import ijson
 import json
 import glob
 import os
 import argparse
+import re
 import sys
+from dataclasses import dataclass
+from typing import Dict, FrozenSet
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../core')))
 from ssu_data import SSU_DATA
+from src.core.catalog_paths import add_backend_argument
+from src.core.ingest import iter_canonical
+from src.utils.aho_corasick import AhoCorasick
+from src.utils.daemon_client import add_daemon_argument, query_daemon
+from src.utils.json_writer import OUTPUT_FORMATS, open_json_writer, output_path_for_format
+from src.utils.profiling import add_profile_arguments, profile_run, span, timed_iter
+abbr_map = None
 def load_abbr_map():
     with open('classification/수강분류_가공_전 (3).json', encoding='utf-8') as f:
         raw_keys = json.load(f)
@@ -14,26 +23,77 @@ def load_abbr_map():
     return {k: v for k, v in zip(raw_keys, mapped_keys)}
 INCLUDE_ALL = ['전체', '전체학년', '전체학년 전체']
 EXCLUDE_KEYWORDS = ['외국인', '순수외국인', '유학생']
+GRADE_PATTERN = re.compile(r'(\d)학년')
+DEPARTMENT_COLLEGE = {
+    department: college['name']
+    for college in SSU_DATA['colleges']
+    for department in college['departments']
+}
+COLLEGE_DEPARTMENTS = {college['name']: frozenset(college['departments']) for college in SSU_DATA['colleges']}
+@dataclass(frozen=True)
+class ResolvedTarget:
+    """target 문자열 하나를 한 번 해석한 결과 (같은 target의 과목들이 공유)"""
+    mapped: str
+    included: bool
+    include_all: bool
+    excluded: bool
+    grades: FrozenSet[int]
+    departments: FrozenSet[str]
+    colleges: FrozenSet[str]
+TARGET_TABLE_LIMIT = 8192
+_target_table: Dict[str, ResolvedTarget] = {}
+_department_automaton = None
 def get_college_departments(college_name):
-    for college in SSU_DATA['colleges']:
-        if college['name'] == college_name:
-            return set(college['departments'])
-    return set()
+    return set(COLLEGE_DEPARTMENTS.get(college_name, ()))
+def get_abbr_map():
+    global abbr_map
+    if abbr_map is None:
+        abbr_map = load_abbr_map()
+    return abbr_map
+def _find_departments(text):
+    global _department_automaton
+    if _department_automaton is None:
+        _department_automaton = AhoCorasick((department, department) for department in DEPARTMENT_COLLEGE)
+    return frozenset(_department_automaton.find_all(text))
+def resolve_target(target):
+    """
+    target 해석 결과 (처음 보는 target만 계산하고 이후에는 dict 조회)
+    테이블이 TARGET_TABLE_LIMIT개를 넘으면 비우고 다시 채운다 (서로 다른 target이 끝없이 나와도 메모리 일정).
+    - mapped: 수강분류 사전으로 표준화한 target ('전체' 계열은 '전체')
+    - included: abbr 모드 포함 여부, include_all: 학과/연도와 무관하게 포함
+    - departments/colleges: mapped에 이름이 그대로 등장하는 학과와 그 단과대학
+    """
+    resolved = _target_table.get(target)
+    if resolved is None:
+        raw_include_all = any(word in target for word in INCLUDE_ALL)
+        excluded = any(word in target for word in EXCLUDE_KEYWORDS)
+        mapping = get_abbr_map()
+        mapped = '전체' if raw_include_all else mapping.get(target, target)
+        departments = _find_departments(mapped)
+        resolved = ResolvedTarget(
+            mapped=mapped,
+            included=raw_include_all or (not excluded and target in mapping),
+            include_all='전체' in mapped,
+            excluded=excluded,
+            grades=frozenset(int(grade) for grade in GRADE_PATTERN.findall(mapped)),
+            departments=departments,
+            colleges=frozenset(DEPARTMENT_COLLEGE[department] for department in departments)
+        )
+        if len(_target_table) >= TARGET_TABLE_LIMIT:
+            _target_table.clear()
+        _target_table[target] = resolved
+    return resolved
+def build_target_table():
+    """수강분류 사전의 모든 target을 미리 해석"""
+    for target in get_abbr_map():
+        resolve_target(target)
+    return _target_table
 def is_include(target):
-    if any(word in target for word in INCLUDE_ALL):
-        return True
-    if any(word in target for word in EXCLUDE_KEYWORDS):
-        return False
-    return target in abbr_map
+    return resolve_target(target).included
 def get_mapped_target(target):
-    if any(word in target for word in INCLUDE_ALL):
-        return '전체'
-    return abbr_map.get(target, target)
+    return resolve_target(target).mapped
 def find_college_by_department(department):
-    for college in SSU_DATA['colleges']:
-        if department in college['departments']:
-            return college['name']
-    return None
+    return DEPARTMENT_COLLEGE.get(department)
 def get_college_departments_by_department(department):
     college_name = find_college_by_department(department)
     if college_name:
@@ -47,53 +107,92 @@ def match_department_or_college(target, department):
         if dept in target:
             return True
     return False
-def filter_by_department_year(input_path, output_path, department, year):
-    abbr_map = load_abbr_map()
-    filtered = []
-    with open(input_path, 'r', encoding='utf-8') as f:
-        for item in ijson.items(f, 'item'):
-            target = item.get('target', '')
-            item_year = str(item.get('year', ''))
-            mapped_target = get_mapped_target(target)
-            if '전체' in mapped_target:
-                filtered.append(item)
-                continue
-            if '전체학년' in mapped_target or '전체학년 전체' in mapped_target:
-                if match_department_or_college(mapped_target, department):
-                    filtered.append(item)
-                continue
-            if item_year == str(year) and match_department_or_college(mapped_target, department):
-                filtered.append(item)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(filtered, f, ensure_ascii=False, indent=2)
-    print(f'Filtered by department/year result saved to {output_path}')
-if __name__ == '__main__':
+def iter_items(input_path, backend='json'):
+    if backend == 'sqlite':
+        from src.core.catalog_db import open_catalog_db
+        with open_catalog_db(os.path.dirname(input_path) or '.') as database:
+            yield from database.file_courses(os.path.basename(input_path))
+        return
+    yield from iter_canonical(input_path)
+def iter_abbr_matches(items):
+    for item in items:
+        target = item.get('target', '')
+        if is_include(target):
+            item['target'] = get_mapped_target(target)
+            yield item
+def iter_department_year_matches(items, department, year):
+    """
+    학과/단과대/연도 필터 - target은 해석 테이블에서 찾고, 학과 비교는 집합 교집합으로 한다.
+    (학과명이 SSU_DATA에 없으면 기존처럼 표준화된 target에 대한 부분 문자열 검사)
+    """
+    wanted = get_college_departments_by_department(department)
+    if department in DEPARTMENT_COLLEGE:
+        wanted.add(department)
+    free_text = department if department and department not in DEPARTMENT_COLLEGE else None
+    year = str(year)
+    for item in items:
+        resolved = resolve_target(item.get('target', ''))
+        if resolved.include_all:
+            yield item
+            continue
+        if str(item.get('year', '')) != year:
+            continue
+        if not resolved.departments.isdisjoint(wanted) or (free_text and free_text in resolved.mapped):
+            yield item
+def query_daemon_filter(input_path, params):
+    """
+    serve 데몬이 input_path의 학기를 적재하고 있으면 같은 필터 결과를 받아 옴 (없으면 None)
+    input_path는 result/{연도}_{학기}/ 아래 원본 파일이어야 한다.
+    """
+    folder = os.path.basename(os.path.dirname(os.path.abspath(input_path)))
+    year, _, semester = folder.partition('_')
+    if not (year.isdigit() and semester.isdigit()):
+        return None
+    with span('filter.daemon'):
+        return query_daemon('filter_subjects', dict(params, year=year, semester=semester, file=os.path.basename(input_path)))
+def filter_by_abbr(input_path, output_path, fmt='json', use_daemon=False, backend='json'):
+    items = query_daemon_filter(input_path, {'mode': 'abbr'}) if use_daemon else None
+    if items is None:
+        with span('filter.build_table'):
+            build_target_table()
+        items = iter_abbr_matches(timed_iter('filter.read', iter_items(input_path, backend)))
+    with span('filter.stream'), open_json_writer(output_path, fmt) as writer:
+        writer.write_all(timed_iter('filter.match', items))
+    print(f'Filtered result saved to {output_path} ({writer.count} items)')
+def filter_by_department_year(input_path, output_path, department, year, fmt='json', use_daemon=False, backend='json'):
+    params = {'mode': 'department', 'department': department, 'filter_year': year}
+    items = query_daemon_filter(input_path, params) if use_daemon else None
+    if items is None:
+        with span('filter.build_table'):
+            build_target_table()
+        items = iter_department_year_matches(timed_iter('filter.read', iter_items(input_path, backend)), department, year)
+    with span('filter.stream'), open_json_writer(output_path, fmt) as writer:
+        writer.write_all(timed_iter('filter.match', items))
+    print(f'Filtered by department/year result saved to {output_path} ({writer.count} items)')
+def main():
     parser = argparse.ArgumentParser(description='수강분류 사전 기반 필터링 및 표준화')
     parser.add_argument('--department', type=str, help='학과명')
     parser.add_argument('--year', type=int, help='연도')
     parser.add_argument('--mode', type=str, default='abbr', choices=['abbr', 'department'], help='필터 모드: abbr(기본), department(학과/단과대/연도)')
+    parser.add_argument('--format', type=str, default='json', choices=OUTPUT_FORMATS, help='출력 형식: json(배열, 기본), ndjson(한 줄에 과목 하나)')
+    add_backend_argument(parser)
+    add_daemon_argument(parser)
+    add_profile_arguments(parser)
     args = parser.parse_args()
-    abbr_map = load_abbr_map()
-    input_files = glob.glob('result/2025_1/2025_1학기_*.json')
-    if not input_files:
-        print('No input files found.')
-        exit(1)
-    input_path = input_files[0]
-    if args.mode == 'abbr':
-        output_path = os.path.join(os.path.dirname(input_path), 'search_filtered_2025_1학기.json')
-        filtered = []
-        with open(input_path, 'r', encoding='utf-8') as f:
-            for item in ijson.items(f, 'item'):
-                target = item.get('target', '')
-                if is_include(target):
-                    item['target'] = get_mapped_target(target)
-                    filtered.append(item)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(filtered, f, ensure_ascii=False, indent=2)
-        print(f'Filtered result saved to {output_path}')
-    elif args.mode == 'department':
-        if not args.department or not args.year:
-            print('--department와 --year를 반드시 지정해야 합니다.')
+    with profile_run(args):
+        input_files = glob.glob('result/2025_1/2025_1학기_*.json')
+        if not input_files:
+            print('No input files found.')
             exit(1)
-        output_path = os.path.join(os.path.dirname(input_path), f'search_{args.department}_{args.year}.json')
-        filter_by_department_year(input_path, output_path, args.department, args.year)
+        input_path = input_files[0]
+        if args.mode == 'abbr':
+            output_path = os.path.join(os.path.dirname(input_path), 'search_filtered_2025_1학기.json')
+            filter_by_abbr(input_path, output_path_for_format(output_path, args.format), args.format, not args.no_daemon, args.backend)
+        elif args.mode == 'department':
+            if not args.department or not args.year:
+                print('--department와 --year를 반드시 지정해야 합니다.')
+                exit(1)
+            output_path = os.path.join(os.path.dirname(input_path), f'search_{args.department}_{args.year}.json')
+            filter_by_department_year(input_path, output_path_for_format(output_path, args.format), args.department, args.year, args.format, not args.no_daemon, args.backend)
+if __name__ == '__main__':
+    main()
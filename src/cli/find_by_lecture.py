@@ -1,39 +1,20 @@
 import json
 import os
 import argparse
-import re
 from typing import List, Dict, Optional
-import subprocess
 from dataclasses import dataclass
 from ..core.schedule_parser import ScheduleParser, CourseTime
+from ..core.catalog_paths import add_backend_argument, list_source_files
+from ..utils.daemon_client import add_daemon_argument, query_daemon
+from ..utils.profiling import add_profile_arguments, profile_run, span
+from ..utils.json_writer import OUTPUT_FORMATS, output_path_for_format, write_json_atomic, write_json_stream
 class CourseSearcher:
     def __init__(self):
         self.available_years = ["2018", "2019", "2020", "2021", "2022", "2023", "2024", "2025"]
         self.available_semesters = [1, 2]
         self.schedule_parser = ScheduleParser()
-    def add_course_times(self, courses: List[Dict]) -> List[Dict]:
-        """Add courseTime field to each course using schedule parser and remove schedule_room"""
-        for course in courses:
-            code = course.get('code', '')
-            schedule_room = course.get('schedule_room', '')
-            try:
-                course_code = int(code) if code else 0
-            except (ValueError, TypeError):
-                course_code = 0
-            course_times = self.schedule_parser.parse_schedule_entry(schedule_room, course_code)
-            course['courseTime'] = [
-                {
-                    'week': ct.week,
-                    'startTime': ct.startTime,
-                    'endTime': ct.endTime,
-                    'classroom': ct.classroom,
-                    'courseCode': ct.courseCode
-                }
-                for ct in course_times
-            ]
-            if 'schedule_room' in course:
-                del course['schedule_room']
-        return courses
+        self.use_daemon = True
+        self.backend = 'json'
     def search_by_keyword_local(self, year: int, semester: int, keyword: str,
                                output_file: Optional[str] = None, grade: Optional[str] = None) -> List[Dict]:
         """
@@ -41,87 +22,73 @@ class CourseSearcher:
         """
         folder_path = os.path.join("result", f"{year}_{semester}")
         os.makedirs(folder_path, exist_ok=True)
-        search_file = f"search_{keyword.replace(' ', '_')}.json"
-        search_file_path = os.path.join(folder_path, search_file)
-        if os.path.exists(search_file_path):
-            print(f"🔎 '{keyword}'와 일치하는 search 파일 발견: {search_file}")
-            with open(search_file_path, 'r', encoding='utf-8') as f:
-                results = json.load(f)
-                if grade and grade != 'all':
-                    results = self.filter_by_grade(results, grade)
-                return results
         if not os.path.exists(folder_path):
             print(f"❌ 폴더 '{folder_path}'를 찾을 수 없습니다.")
             print(f"먼저 전공별 데이터를 수집해주세요.")
             return []
-        matching_courses = []
         print(f"🔍 '{keyword}' 키워드로 과목 검색 중...")
-        json_files = [f for f in os.listdir(folder_path) if f.endswith('.json') and not f.startswith('search_')]
-        if not json_files:
+        if not list_source_files(folder_path):
             print(f"❌ '{folder_path}' 폴더에 전공별 JSON 파일이 없습니다.")
             return []
-        for filename in json_files:
-            file_path = os.path.join(folder_path, filename)
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    courses = json.load(f)
-                for course in courses:
-                    course_name = course.get('name', '').lower()
-                    course_professor = course.get('professor', '').lower()
-                    course_department = course.get('department', '').lower()
-                    if (
-                        keyword.lower() in course_name or
-                        keyword.lower() in course_professor or
-                        keyword.lower() in course_department
-                    ):
-                        matching_courses.append(course)
-            except Exception as e:
-                print(f"⚠️ 파일 읽기 오류: {filename} - {e}")
-        matching_courses = self.add_course_times(matching_courses)
-        if grade and grade != 'all':
-            matching_courses = self.filter_by_grade(matching_courses, grade)
+        fields = ('name', 'professor', 'department')
+        matching_courses = None
+        if self.use_daemon:
+            with span('search.daemon'):
+                matching_courses = query_daemon('search', {'year': year, 'semester': semester, 'keyword': keyword, 'grade': grade})
+            if matching_courses is not None:
+                print(f"⚡ serve 데몬 검색 결과 사용")
+        if matching_courses is None:
+            from ..core.result_cache import get_result_cache, make_key
+            cache = get_result_cache(folder_path)
+            cache_key = make_key(year, semester, keyword, grade, fields)
+            with span('search.cache_lookup'):
+                matching_courses = cache.get(cache_key)
+            if matching_courses is not None:
+                print(f"⚡ 캐시된 검색 결과 사용")
+        if matching_courses is None:
+            if self.backend == 'sqlite':
+                from ..core.catalog_db import open_catalog_db
+                with open_catalog_db(folder_path) as database, span('search.query'):
+                    matching_courses = database.search(keyword, fields)
+            else:
+                from ..core.search_index import CourseSearchIndex
+                search_index = CourseSearchIndex.load_or_build(folder_path)
+                with span('search.query'):
+                    matching_courses = search_index.search(keyword, fields)
+            if grade and grade != 'all':
+                matching_courses = self.filter_by_grade(matching_courses, grade)
+            with span('search.cache_store'):
+                cache.put(cache_key, matching_courses)
         print(f"✅ 검색 완료: {len(matching_courses)}개 과목 발견")
         if matching_courses:
-            if not output_file:
-                output_file = f"search_{keyword.replace(' ', '_')}.json"
-            output_path = os.path.join(folder_path, output_file)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(matching_courses, f, ensure_ascii=False, indent=2)
-            print(f"📁 결과 저장: {output_path}")
+            if output_file:
+                output_path = os.path.join(folder_path, output_file)
+                with span('search.write_output'):
+                    write_json_atomic(output_path, matching_courses)
+                print(f"📁 결과 저장: {output_path}")
             self.print_search_summary(matching_courses, keyword)
         return matching_courses
     def search_by_keyword_cli(self, year: int, semester: int, keyword: str) -> bool:
         """
         rusaint-cli find-by-lecture 명령어 실행
         """
+        from ..core.rusaint_runner import find_by_lecture_args, run_rusaint_cli
         try:
             folder_path = os.path.join("result", f"{year}_{semester}")
             os.makedirs(folder_path, exist_ok=True)
-            cmd = [
-                'rusaint-cli', 'find-by-lecture',
-                '--year', str(year),
-                '--semester', str(semester),
-                '--keyword', keyword
-            ]
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                cwd=folder_path
-            )
-            if result.returncode == 0:
+            result = run_rusaint_cli(find_by_lecture_args(year, semester, keyword), folder_path)
+            if result.ok:
                 print(f"✅ rusaint-cli 명령어 실행 완료")
                 return True
             else:
                 print(f"❌ rusaint-cli 명령어 실행 실패: {result.stderr}")
                 return False
-        except subprocess.CalledProcessError as e:
-            print(f"❌ 명령어 실행 오류: {e}")
-            return False
         except FileNotFoundError:
             print("❌ rusaint-cli 명령어를 찾을 수 없습니다.")
             return False
+        except OSError as e:
+            print(f"❌ 명령어 실행 오류: {e}")
+            return False
     def search_with_auto_fallback(self, year: int, semester: int, keyword: str, output_file: Optional[str] = None, force_cli: bool = False, grade: Optional[str] = None) -> List[Dict]:
         """
         로컬 검색 시도 후 결과가 없으면 자동으로 CLI 호출
@@ -129,7 +96,7 @@ class CourseSearcher:
         folder_path = os.path.join("result", f"{year}_{semester}")
         if not force_cli:
             if os.path.exists(folder_path):
-                json_files = [f for f in os.listdir(folder_path) if f.endswith('.json') and not f.startswith('search_')]
+                json_files = list_source_files(folder_path)
                 if json_files:
                     print("💾 로컬 JSON 파일에서 검색 중...")
                     results = self.search_by_keyword_local(year, semester, keyword, output_file, grade)
@@ -145,41 +112,49 @@ class CourseSearcher:
                 print(f"💡 '{folder_path}' 폴더가 존재하지 않습니다.")
                 print("🌐 rusaint-cli를 통해 실시간 검색을 시도합니다...\n")
         print("🌐 rusaint-cli 명령어로 검색 중...")
-        success = self.search_by_keyword_cli(year, semester, keyword)
-        if success:
-            expected_file = os.path.join(folder_path, f"search_{keyword.replace(' ', '_')}.json")
-            if os.path.exists(expected_file):
-                try:
-                    with open(expected_file, 'r', encoding='utf-8') as f:
-                        results = json.load(f)
-                    results = self.add_course_times(results)
-                    if grade and grade != 'all':
-                        results = self.filter_by_grade(results, grade)
-                    with open(expected_file, 'w', encoding='utf-8') as f:
-                        json.dump(results, f, ensure_ascii=False, indent=2)
-                    print(f"📁 결과 저장: {expected_file}")
-                    self.print_search_summary(results, keyword)
-                    return results
-                except Exception as e:
-                    print(f"⚠️ CLI 결과 파일 읽기 오류: {e}")
-            else:
-                print("⚠️ CLI 실행은 성공했으나 결과 파일을 찾을 수 없습니다.")
-        return []
+        from ..core.scrape_fallback import ScrapeFallback
+        results = ScrapeFallback(folder_path).run(
+            keyword, lambda: self.scrape_keyword(year, semester, keyword), use_negative_cache=not force_cli
+        )
+        if not results:
+            return []
+        if grade and grade != 'all':
+            results = self.filter_by_grade(results, grade)
+        self.print_search_summary(results, keyword)
+        return results
+    def scrape_keyword(self, year: int, semester: int, keyword: str) -> Optional[List[Dict]]:
+        """
+        rusaint-cli find-by-lecture로 검색하고 결과 파일을 정규화하여 반환
+        실행 실패 시 None, 실행은 성공했으나 결과가 없으면 빈 목록
+        """
+        folder_path = os.path.join("result", f"{year}_{semester}")
+        if not self.search_by_keyword_cli(year, semester, keyword):
+            return None
+        expected_file = os.path.join(folder_path, f"search_{keyword.replace(' ', '_')}.json")
+        if not os.path.exists(expected_file):
+            print("⚠️ CLI 실행은 성공했으나 결과 파일을 찾을 수 없습니다.")
+            return []
+        try:
+            with span('scrape.read_json'):
+                with open(expected_file, 'r', encoding='utf-8') as f:
+                    results = json.load(f)
+            from ..core.ingest import normalize_courses
+            with span('scrape.normalize'):
+                results = normalize_courses(results)
+            with span('scrape.write_output'):
+                write_json_atomic(expected_file, results)
+        except Exception as e:
+            print(f"⚠️ CLI 결과 파일 읽기 오류: {e}")
+            return None
+        return results
     def filter_by_grade(self, courses: List[Dict], grade: str) -> List[Dict]:
         """
-        target에 '1학년', '2학년' 등 학년이 포함된 과목만 반환
+        해당 학년이 수강 대상인 과목만 반환 (targetInfo의 학년 집합 기준)
         grade는 '1'~'5' 또는 'all' 허용
-        단, target에 '전체'가 포함되어 있으면 무조건 포함
+        '전체학년', '전체'처럼 학년 제한이 없는 과목은 항상 포함
         """
-        grade_str = f"{grade}학년"
-        filtered = []
-        for course in courses:
-            target = course.get('target', '')
-            if '전체' in target:
-                filtered.append(course)
-            elif re.search(rf'\b{grade}학년\b', target):
-                filtered.append(course)
-        return filtered
+        from ..core.target_parser import filter_courses_by_grade
+        return filter_courses_by_grade(courses, grade)
     def print_search_summary(self, courses: List[Dict], keyword: str):
         """
         검색 결과 요약 출력
@@ -250,40 +225,43 @@ def main():
     parser.add_argument('--cli', action='store_true',
                        help='rusaint-cli 명령어 강제 사용 (기본값: 로컬 검색 후 필요시 CLI 자동 호출)')
     parser.add_argument('--output', '-o', type=str,
-                       help='결과 저장 파일명 (선택사항)')
+                       help='결과 저장 경로 (선택사항, 없으면 파일로 저장하지 않고 요약만 출력)')
     parser.add_argument('--grade', type=str, default='all', help='검색할 학년 (1~5, all=전체, 예: --grade 1)')
+    parser.add_argument('--format', type=str, default='json', choices=OUTPUT_FORMATS,
+                       help='최종 결과 파일 형식: json(배열, 기본), ndjson(한 줄에 과목 하나)')
+    parser.add_argument('--cache-stats', action='store_true', help='검색 결과 캐시 적중/미스 통계 출력')
+    add_backend_argument(parser)
+    add_daemon_argument(parser)
+    add_profile_arguments(parser)
     args = parser.parse_args()
-    searcher = CourseSearcher()
-    print(f"🎓 숭실대학교 과목 검색 도구")
-    print(f"📅 검색 조건: {args.year}년 {args.semester}학기")
-    print(f"🔍 검색 키워드: '{args.keyword}'\n")
-    search_keyword = args.keyword.replace('_', ' ')
-    if not searcher.validate_parameters(args.year, args.semester):
-        return
-    results = searcher.search_with_auto_fallback(
-        args.year, args.semester, search_keyword, args.output, force_cli=args.cli, grade=args.grade
-    )
-    if results:
-        if args.output:
-            output_path = args.output
-        else:
-            keyword_part = search_keyword.replace(' ', '_')
-            if args.grade and args.grade != 'all':
-                filename = f"search_{keyword_part}_{args.grade}.json"
-            else:
-                filename = f"search_{keyword_part}_전체.json"
-            output_path = os.path.join(
-                "result", f"{args.year}_{args.semester}",
-                filename
-            )
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-        print(f"📁 최종 결과 저장: {output_path}")
-    if args.cli or (results is None):
-        return
-    if not results:
-        print(f"\n💡 '{search_keyword}' 키워드와 일치하는 과목을 찾을 수 없습니다.")
-        print("다른 키워드로 시도해보거나, 전공별 데이터를 수집해주세요.")
-        return
+    with profile_run(args):
+        searcher = CourseSearcher()
+        searcher.use_daemon = not args.no_daemon
+        searcher.backend = args.backend
+        print(f"🎓 숭실대학교 과목 검색 도구")
+        print(f"📅 검색 조건: {args.year}년 {args.semester}학기")
+        print(f"🔍 검색 키워드: '{args.keyword}'\n")
+        search_keyword = args.keyword.replace('_', ' ')
+        if not searcher.validate_parameters(args.year, args.semester):
+            return
+        results = searcher.search_with_auto_fallback(
+            args.year, args.semester, search_keyword, force_cli=args.cli, grade=args.grade
+        )
+        if results and args.output:
+            output_path = output_path_for_format(args.output, args.format)
+            with span('search.write_output'):
+                write_json_stream(output_path, results, args.format)
+            print(f"📁 최종 결과 저장: {output_path}")
+        if args.cache_stats:
+            from ..core.result_cache import get_result_cache
+            cache = get_result_cache(os.path.join("result", f"{args.year}_{args.semester}"))
+            print(f"📊 검색 캐시(이번 실행): {cache.stats.summary()}")
+            print(f"📊 검색 캐시(누적): {cache.report()['stats'].summary()}")
+        if args.cli or (results is None):
+            return
+        if not results:
+            print(f"\n💡 '{search_keyword}' 키워드와 일치하는 과목을 찾을 수 없습니다.")
+            print("다른 키워드로 시도해보거나, 전공별 데이터를 수집해주세요.")
+            return
 if __name__ == "__main__":
     main()
@@ -1,70 +1,86 @@
-import subprocess
 import os
+import shutil
+import tempfile
+import time
 import argparse
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from src.core.ssu_data import SSU_DATA
 from ..core.schedule_parser import ScheduleParser, CourseTime
+from ..core.catalog_paths import add_backend_argument, major_source_candidates
 from src.cli.rusaint_cli_wrapper import RusaintCLIWrapper
-from src.utils.department_matcher import department_matcher
-import json
-import re
+from src.utils.daemon_client import add_daemon_argument, query_daemon
+from src.utils.json_writer import write_json_atomic
+from src.utils.profiling import add_profile_arguments, count, profile_run, span
+def split_department(department: str) -> Tuple[str, Optional[str]]:
+    """'건축학부 건축공학전공' 형태의 이름을 (학부명, 전공명)으로 분리, 전공이 없으면 (이름, None)"""
+    if ' ' in department and any(keyword in department for keyword in ['전공', '학부']):
+        parts = department.split(' ')
+        if len(parts) >= 2:
+            return parts[0], ' '.join(parts[1:])
+    return department, None
 class SSUMajorFinder:
     def __init__(self):
         self.ssu_data = SSU_DATA
         self.wrapper = RusaintCLIWrapper()
+        self.use_daemon = True
+        self.backend = 'json'
     def filter_by_grade(self, courses: List[Dict], grade: str) -> List[Dict]:
         """
-        target에 '1학년', '2학년' 등 학년이 포함된 과목만 반환
+        해당 학년이 수강 대상인 과목만 반환 (targetInfo의 학년 집합 기준)
         grade는 '1'~'5' 또는 'all' 허용
-        단, target에 '전체'가 포함되어 있으면 무조건 포함
+        '전체학년', '전체'처럼 학년 제한이 없는 과목은 항상 포함
         """
-        grade_str = f"{grade}학년"
-        filtered = []
-        for course in courses:
-            target = course.get('target', '')
-            if '전체' in target:
-                filtered.append(course)
-            elif re.search(rf'\b{grade}학년\b', target):
-                filtered.append(course)
-        return filtered
+        from ..core.target_parser import filter_courses_by_grade
+        return filter_courses_by_grade(courses, grade)
     def filter_by_department(self, courses: List[Dict], departments: List[str]) -> List[Dict]:
         """
-        target에 지정된 학과/학부 중 하나가 포함된 과목만 반환 (줄임말 지원)
+        지정된 학과/학부 중 하나라도 수강 대상인 과목만 반환 (줄임말 지원)
+        학과 제한이 없는 과목('전체')은 포함하고, '(영문제외)' 같은 제외 대상 학과는 뺀다.
         """
-        filtered = []
-        for course in courses:
-            target = course.get('target', '')
-            if not target:
-                continue
-            if '전체' in target:
-                filtered.append(course)
-                continue
-            if department_matcher.matches_any_department(target, departments):
-                filtered.append(course)
-        return filtered
+        from ..core.target_parser import filter_courses_by_department
+        return filter_courses_by_department(courses, departments)
     def find_college_by_department(self, department: str) -> Optional[str]:
         """학부/학과명으로 단과대학 찾기"""
         for college in self.ssu_data['colleges']:
             if department in college['departments']:
                 return college['name']
         return None
+    def possible_base_files(self, year: int, semester: int, college: str, department: str,
+                            major: Optional[str] = None, subdepartments: Optional[List[str]] = None) -> List[str]:
+        """rusaint-cli find-major가 만드는 원본 파일 이름 후보 (우선순위 순)"""
+        return major_source_candidates(year, semester, college, department, major, subdepartments)
+    def find_base_file(self, output_dir: str, possible_base_files: List[str]) -> Optional[str]:
+        for possible_file in possible_base_files:
+            potential_path = os.path.join(output_dir, possible_file)
+            if os.path.exists(potential_path):
+                return potential_path
+        return None
+    def load_major_data(self, base_path: str, department: str, subdepartments: Optional[List[str]] = None,
+                        grade: Optional[str] = None) -> List[Dict]:
+        """원본 파일의 과목에 부전공/학년 필터 적용 (sqlite 백엔드면 학기 카탈로그에 SQL 질의 한 번)"""
+        all_departments = [department] + subdepartments if subdepartments else []
+        if self.backend == 'sqlite':
+            from ..core.catalog_db import open_catalog_db
+            with open_catalog_db(os.path.dirname(base_path)) as database, span('major.filter'):
+                data = database.filter(all_departments, grade, [os.path.basename(base_path)])
+        else:
+            from ..core.ingest import load_canonical
+            with span('major.load_source'):
+                data = load_canonical(base_path)
+            with span('major.filter'):
+                if all_departments:
+                    data = self.filter_by_department(data, all_departments)
+                if grade and grade != 'all':
+                    data = self.filter_by_grade(data, grade)
+        if all_departments:
+            print(f"✅ 부전공 필터 적용: {', '.join(all_departments)}")
+        return data
     def get_major_info(self, year: int, semester: int, college: str,
                       department: str, major: Optional[str] = None, subdepartments: Optional[List[str]] = None, grade: Optional[str] = None) -> dict:
         output_dir = os.path.join("result", f"{year}_{semester}")
         os.makedirs(output_dir, exist_ok=True)
-        possible_base_files = [
-            f"{year}_{semester}학기_{college}_{department}_전공.json",
-            f"{college}_{department}_{major}.json" if major else f"{college}_{department}.json"
-        ]
-        if subdepartments:
-            for subdept in subdepartments:
-                possible_base_files.insert(0, f"{year}_{semester}학기_{college}_{department}_{subdept}_전공.json")
-        base_path = None
-        for possible_file in possible_base_files:
-            potential_path = os.path.join(output_dir, possible_file)
-            if os.path.exists(potential_path):
-                base_path = potential_path
-                break
+        possible_base_files = self.possible_base_files(year, semester, college, department, major, subdepartments)
+        base_path = self.find_base_file(output_dir, possible_base_files)
         college_part = college.replace(' ', '')
         department_part = department.replace(' ', '')
         subdept_part = ""
@@ -78,103 +94,188 @@ class SSUMajorFinder:
         output_path = os.path.join(output_dir, output_file)
         if os.path.exists(output_path):
             print(f"✅ 로컬 파일 사용: {output_path}")
-            with open(output_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            from ..core.catalog_snapshot import load_courses
+            with span('major.load_local'):
+                data = load_courses(output_path)
             return data
+        if self.use_daemon:
+            with span('major.daemon'):
+                data = query_daemon('major', {
+                    'year': year, 'semester': semester, 'college': college, 'department': department,
+                    'major': major, 'sub': subdepartments, 'grade': grade
+                })
+            if data is not None:
+                print(f"⚡ serve 데몬 결과 사용")
+                with span('major.write_output'):
+                    write_json_atomic(output_path, data)
+                print(f"✅ 결과 저장: {output_path}")
+                return data
         if base_path:
             print(f"✅ 원본 파일 사용: {base_path}")
-            with open(base_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            wrapper = RusaintCLIWrapper()
-            data = wrapper.add_course_times(data)
-            if subdepartments:
-                all_departments = [department] + subdepartments
-                data = self.filter_by_department(data, all_departments)
-                print(f"✅ 부전공 필터 적용: {', '.join(all_departments)}")
-            if grade and grade != 'all':
-                data = self.filter_by_grade(data, grade)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            data = self.load_major_data(base_path, department, subdepartments, grade)
+            with span('major.write_output'):
+                write_json_atomic(output_path, data)
             print(f"✅ 결과 저장: {output_path}")
             return data
         print(f"🌐 로컬 파일 없음, rusaint_cli_wrapper로 수집")
-        self.wrapper.get_major_info(year, semester, college, department, major)
-        for possible_file in possible_base_files:
-            potential_path = os.path.join(output_dir, possible_file)
-            if os.path.exists(potential_path):
-                base_path = potential_path
-                break
+        self.collect_major_file(year, semester, college, department, major, output_dir)
+        base_path = self.find_base_file(output_dir, possible_base_files)
         if base_path:
-            with open(base_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            wrapper = RusaintCLIWrapper()
-            data = wrapper.add_course_times(data)
-            if subdepartments:
-                all_departments = [department] + subdepartments
-                data = self.filter_by_department(data, all_departments)
-                print(f"✅ 부전공 필터 적용: {', '.join(all_departments)}")
-            if grade and grade != 'all':
-                data = self.filter_by_grade(data, grade)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            data = self.load_major_data(base_path, department, subdepartments, grade)
+            with span('major.write_output'):
+                write_json_atomic(output_path, data)
             print(f"✅ 결과 저장: {output_path}")
             return data
         else:
             print(f"❌ rusaint-cli 실행 후에도 파일을 찾을 수 없습니다")
             print(f"   확인된 파일들: {[f for f in os.listdir(output_dir) if f.endswith('.json')]}")
             return {}
+    def collect_major_file(self, year: int, semester: int, college: str, department: str,
+                           major: Optional[str] = None, output_dir: Optional[str] = None,
+                           timeout: Optional[float] = None, retries: int = 0, backoff: float = 1.0) -> Tuple[bool, int]:
+        """학과 하나 수집 (collect_major_file_async를 동시 실행 1개짜리 실행기로 돌리는 동기 API)"""
+        from ..core.rusaint_runner import AsyncRusaintRunner, run_sync
+        with span('rusaint.subprocess'):
+            return run_sync(self.collect_major_file_async(AsyncRusaintRunner(max_concurrency=1), year, semester,
+                                                          college, department, major, output_dir, timeout, retries, backoff))
+    async def collect_major_file_async(self, runner, year: int, semester: int, college: str, department: str,
+                                       major: Optional[str] = None, output_dir: Optional[str] = None,
+                                       timeout: Optional[float] = None, retries: int = 0,
+                                       backoff: float = 1.0) -> Tuple[bool, int]:
+        """
+        rusaint-cli find-major를 임시 폴더에서 실행한 뒤, 생성된 JSON을 os.replace로 output_dir에 옮긴다.
+        (중단되거나 시간 초과된 호출의 반쯤 쓰인 파일이 결과 폴더에 남지 않음)
+        실패 시 backoff * 2^(시도-1)초 쉬고 최대 retries번 재시도, (성공 여부, 시도 횟수) 반환
+        동시 실행 수는 runner의 max_concurrency로 제한되며, 재시도 대기 중에는 자리를 차지하지 않는다.
+        """
+        import asyncio
+        output_dir = output_dir or os.path.join("result", f"{year}_{semester}")
+        os.makedirs(output_dir, exist_ok=True)
+        attempts = 0
+        while True:
+            attempts += 1
+            work_dir = tempfile.mkdtemp(prefix='.collect_', dir=output_dir)
+            count('major.collect_attempts')
+            try:
+                ok = await self.wrapper.get_major_info_async(runner, year, semester, college, department, major,
+                                                             output_dir=work_dir, timeout=timeout)
+                produced = [f for f in os.listdir(work_dir) if f.endswith('.json')]
+                if ok and produced:
+                    for filename in produced:
+                        os.replace(os.path.join(work_dir, filename), os.path.join(output_dir, filename))
+                    return True, attempts
+                if ok:
+                    print(f"⚠️ rusaint-cli가 결과 파일을 만들지 않았습니다: {college} {department}")
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            if attempts > retries:
+                return False, attempts
+            delay = backoff * 2 ** (attempts - 1)
+            print(f"🔁 {college} {department} 재시도 {attempts}/{retries} ({delay:.1f}초 후)")
+            await asyncio.sleep(delay)
+    async def collect_all_async(self, year: int, semester: int, semester_dir: str,
+                                tasks: List[Tuple[str, str, Optional[str]]], jobs: int = 1,
+                                timeout: Optional[float] = None, retries: int = 0,
+                                backoff: float = 1.0) -> Set[Tuple[str, str, Optional[str]]]:
+        """
+        tasks의 학과들을 이벤트 루프 하나에서 동시에 수집 (AsyncRusaintRunner 하나를 공유해 동시 실행 jobs개로 제한)
+        끝나는 순서대로 진행 상황을 출력하고, 수집에 실패한 (단과대학, 학과, 전공) 집합을 반환
+        """
+        import asyncio
+        from ..core.rusaint_runner import AsyncRusaintRunner
+        runner = AsyncRusaintRunner(max_concurrency=jobs)
+        started = time.monotonic()
+        async def collect(task):
+            try:
+                ok, attempts = await self.collect_major_file_async(runner, year, semester, *task, semester_dir,
+                                                                   timeout, retries, backoff)
+            except Exception as e:
+                print(f"❌ {task[0]} {task[1]} 수집 오류: {e}")
+                ok, attempts = False, 1
+            return task, ok, attempts
+        failed = set()
+        for done, finished in enumerate(asyncio.as_completed([collect(task) for task in tasks]), 1):
+            task, ok, attempts = await finished
+            if not ok:
+                failed.add(task)
+            status = "✅" if ok else "❌"
+            print(f"[{done}/{len(tasks)}] {status} {task[0]} {task[1]}"
+                  f"{' ' + task[2] if task[2] else ''} (시도 {attempts}회, {time.monotonic() - started:.1f}초 경과)")
+        return failed
     def get_all_majors_info(self, year: int, semester: int,
-                           output_dir: str = 'result', grade: Optional[str] = None):
-        """모든 학부/학과의 전공 정보 가져오기"""
+                           output_dir: str = 'result', grade: Optional[str] = None,
+                           jobs: int = 1, timeout: Optional[float] = None,
+                           retries: int = 0, backoff: float = 1.0):
+        """
+        모든 학부/학과의 전공 정보 가져오기
+        1) 원본 파일이 없는 학과만 collect_all_async로 jobs개까지 동시에 rusaint-cli 수집 (timeout/retries 적용)
+        2) 수집된 원본으로 학년 필터 결과 파일 생성 (수집에 실패한 학과는 건너뜀)
+        """
+        semester_dir = os.path.join(output_dir, f"{year}_{semester}")
+        os.makedirs(semester_dir, exist_ok=True)
+        tasks = []
         for college in self.ssu_data['colleges']:
-            college_name = college['name']
-            print(f"\n=== {college_name} 처리 중 ===")
             for department in college['departments']:
-                print(f"  - {department} 조회 중...")
-                if ' ' in department and any(keyword in department for keyword in ['전공', '학부']):
-                    parts = department.split(' ')
-                    if len(parts) >= 2:
-                        dept_name = parts[0]
-                        major_name = ' '.join(parts[1:])
-                        self.get_major_info(year, semester, college_name, dept_name, major_name, subdepartments=None, grade=grade)
-                    else:
-                        self.get_major_info(year, semester, college_name, department, subdepartments=None, grade=grade)
-                else:
-                    self.get_major_info(year, semester, college_name, department, subdepartments=None, grade=grade)
+                dept_name, major_name = split_department(department)
+                tasks.append((college['name'], dept_name, major_name))
+        missing = [
+            task for task in tasks
+            if not self.find_base_file(semester_dir, self.possible_base_files(year, semester, *task))
+        ]
+        failed = set()
+        if missing:
+            from ..core.rusaint_runner import run_sync
+            print(f"🌐 원본 파일이 없는 {len(missing)}/{len(tasks)}개 학과 수집 (동시 작업 {jobs}개)")
+            with span('major.collect_all'):
+                failed = run_sync(self.collect_all_async(year, semester, semester_dir, missing,
+                                                         jobs, timeout, retries, backoff))
+            print(f"📊 수집 완료: 성공 {len(missing) - len(failed)}개, 실패 {len(failed)}개")
+        current_college = None
+        for college_name, dept_name, major_name in tasks:
+            if college_name != current_college:
+                current_college = college_name
+                print(f"\n=== {college_name} 처리 중 ===")
+            if (college_name, dept_name, major_name) in failed:
+                print(f"  - {dept_name} 건너뜀 (수집 실패)")
+                continue
+            print(f"  - {dept_name} 조회 중...")
+            self.get_major_info(year, semester, college_name, dept_name, major_name, subdepartments=None, grade=grade)
 def main():
     parser = argparse.ArgumentParser(description='숭실대학교 전공 정보 수집 스크립트')
     parser.add_argument('year', type=int, help='연도 (예: 2025)')
     parser.add_argument('semester', type=int, choices=[1, 2], help='학기 (1 또는 2)')
     parser.add_argument('--department', '-d', action='append', help='학과/학부명 (여러 번 사용 가능, 첫 번째는 주전공, 나머지는 부전공)')
     parser.add_argument('--grade', type=str, default='all', help='검색할 학년 (1~5, all=전체, 예: --grade 1)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='전체 수집 시 동시에 실행할 rusaint-cli 수')
+    parser.add_argument('--timeout', type=float, default=None, help='rusaint-cli 호출당 제한 시간(초)')
+    parser.add_argument('--retries', type=int, default=0, help='실패한 호출의 재시도 횟수 (지수 백오프)')
+    add_backend_argument(parser)
+    add_daemon_argument(parser)
+    add_profile_arguments(parser)
     args = parser.parse_args()
-    finder = SSUMajorFinder()
-    print(f"=== 숭실대학교 전공 정보 수집 스크립트 ({args.year}년 {args.semester}학기) ===\n")
-    if args.department:
-        college = finder.find_college_by_department(args.department[0])
-        if college:
-            print(f"단과대학: {college}")
-            print(f"학과/학부: {args.department[0]}")
-            if args.department[1:]:
-                print(f"부전공: {', '.join(args.department[1:])}")
-            if ' ' in args.department[0] and any(keyword in args.department[0] for keyword in ['전공', '학부']):
-                parts = args.department[0].split(' ')
-                if len(parts) >= 2:
-                    dept_name = parts[0]
-                    major_name = ' '.join(parts[1:])
-                    finder.get_major_info(args.year, args.semester, college, dept_name, major_name, args.department[1:] if len(args.department) > 1 else None, args.grade)
-                else:
-                    finder.get_major_info(args.year, args.semester, college, args.department[0], subdepartments=args.department[1:] if len(args.department) > 1 else None, grade=args.grade)
+    with profile_run(args):
+        finder = SSUMajorFinder()
+        finder.use_daemon = not args.no_daemon
+        finder.backend = args.backend
+        print(f"=== 숭실대학교 전공 정보 수집 스크립트 ({args.year}년 {args.semester}학기) ===\n")
+        if args.department:
+            college = finder.find_college_by_department(args.department[0])
+            if college:
+                print(f"단과대학: {college}")
+                print(f"학과/학부: {args.department[0]}")
+                if args.department[1:]:
+                    print(f"부전공: {', '.join(args.department[1:])}")
+                dept_name, major_name = split_department(args.department[0])
+                finder.get_major_info(args.year, args.semester, college, dept_name, major_name, args.department[1:] if len(args.department) > 1 else None, args.grade)
             else:
-                finder.get_major_info(args.year, args.semester, college, args.department[0], subdepartments=args.department[1:] if len(args.department) > 1 else None, grade=args.grade)
+                print(f"오류: '{args.department[0]}' 학과/학부를 찾을 수 없습니다.")
+                print("사용 가능한 학과/학부 목록:")
+                for college in finder.ssu_data['colleges']:
+                    print(f"\n[{college['name']}]")
+                    for dept in college['departments']:
+                        print(f"  - {dept}")
         else:
-            print(f"오류: '{args.department[0]}' 학과/학부를 찾을 수 없습니다.")
-            print("사용 가능한 학과/학부 목록:")
-            for college in finder.ssu_data['colleges']:
-                print(f"\n[{college['name']}]")
-                for dept in college['departments']:
-                    print(f"  - {dept}")
-    else:
-        finder.get_all_majors_info(args.year, args.semester, grade=args.grade)
+            finder.get_all_majors_info(args.year, args.semester, grade=args.grade,
+                                       jobs=args.jobs, timeout=args.timeout, retries=args.retries)
 if __name__ == "__main__":
     main()
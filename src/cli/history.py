@@ -0,0 +1,111 @@
+import argparse
+from typing import Dict, List
+from ..core.history_store import HistoryStore, QueryPlan, category_changes, parse_semester_key, semester_label
+from ..utils.json_writer import write_json_atomic
+from ..utils.profiling import add_profile_arguments, profile_run
+def print_plan(plan: QueryPlan):
+    print(f"🗂️ {plan.describe()}")
+    if plan.scanned:
+        print(f"   조회: {', '.join(semester_label(key) for key in plan.scanned)}")
+def run_professors(store: HistoryStore, args) -> Dict:
+    plan = store.plan(args.start, args.end, keyword=args.course)
+    print_plan(plan)
+    taught = store.professors(args.course, exact=args.exact, plan=plan)
+    if not taught:
+        print(f"❌ '{args.course}' 과목을 찾을 수 없습니다.")
+    for key, names in sorted(taught.items()):
+        print(f"  📅 {semester_label(key)}: {', '.join(names) if names else '(교수 미정)'}")
+    return {semester_label(key): names for key, names in sorted(taught.items())}
+def run_search(store: HistoryStore, args) -> Dict:
+    plan = store.plan(args.start, args.end, keyword=args.keyword)
+    print_plan(plan)
+    fields = tuple(args.field) if args.field else ('name', 'professor', 'department')
+    found: Dict[str, List[Dict]] = {}
+    for key, course in store.search(args.keyword, fields=fields, plan=plan):
+        found.setdefault(semester_label(key), []).append(course.to_dict())
+    for name, courses in found.items():
+        print(f"  📅 {name}: {len(courses)}개 과목")
+    print(f"✅ 검색 완료: {sum(len(courses) for courses in found.values())}개 과목 ({len(found)}개 학기)")
+    return found
+def run_category(store: HistoryStore, args) -> List[Dict]:
+    plan = store.plan(args.start, args.end, department=args.department, kind=args.kind)
+    print_plan(plan)
+    changes = category_changes(store.category_history(args.department, args.kind, plan=plan))
+    label = f"{args.department} {args.kind}" if args.kind else args.department
+    print(f"📊 {label} 과목 변화")
+    for change in changes:
+        diff = ''
+        if change['added'] or change['removed']:
+            diff = f" (+{len(change['added'])} / -{len(change['removed'])})"
+        print(f"  📅 {change['semester']}: {len(change['courses'])}개{diff}")
+        for name in change['added']:
+            print(f"     ➕ {name}")
+        for name in change['removed']:
+            print(f"     ➖ {name}")
+    return changes
+def run_partitions(store: HistoryStore, args) -> List[Dict]:
+    partitions = []
+    for key in store.keys():
+        summary = store.summary(key)
+        partitions.append({
+            'semester': semester_label(key),
+            'files': len(summary.sources) if summary else None,
+            'courses': summary.courses if summary else None
+        })
+        state = f"파일 {len(summary.sources)}개, 과목 {summary.courses:,}개" if summary else "요약 없음 (첫 조회 때 생성)"
+        print(f"  📅 {semester_label(key)}: {state}")
+    return partitions
+COMMANDS = {
+    'professors': run_professors,
+    'search': run_search,
+    'category': run_category,
+    'partitions': run_partitions
+}
+def main():
+    parser = argparse.ArgumentParser(
+        description='여러 학기에 걸친 과목 이력 조회 (학기별 파티션, 범위 밖 학기는 읽지 않음)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python -m src.cli.history professors 자료구조 --from 2020_1 --to 2025_1
+  python -m src.cli.history category 컴퓨터학부 --kind 전필 --from 2023_1
+  python -m src.cli.history search 인공지능 --field name
+  python -m src.cli.history partitions
+        """
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--result-dir', default='result', help='학기 폴더들이 있는 디렉터리 (기본: result)')
+    common.add_argument('--from', dest='start', help='시작 학기 (예: 2020_1, 기본: 가장 오래된 학기)')
+    common.add_argument('--to', dest='end', help='끝 학기 (예: 2025_1, 기본: 가장 최근 학기)')
+    common.add_argument('--output', '-o', help='결과를 JSON 파일로 저장')
+    add_profile_arguments(common)
+    commands = parser.add_subparsers(dest='command', required=True)
+    professors = commands.add_parser('professors', parents=[common], help='학기별 과목 담당 교수')
+    professors.add_argument('course', help='과목명 (부분 일치)')
+    professors.add_argument('--exact', action='store_true', help='과목명이 정확히 같은 과목만')
+    search = commands.add_parser('search', parents=[common], help='학기별 키워드 검색')
+    search.add_argument('keyword', help='검색 키워드')
+    search.add_argument('--field', action='append', choices=['name', 'professor', 'department'],
+                        help='검색할 필드 (여러 번 사용 가능, 기본: 전체)')
+    category = commands.add_parser('category', parents=[common], help='학기별 학과 이수구분 과목과 변화')
+    category.add_argument('department', help='학과명 (약칭, 정식 학과명, 상위 학부명)')
+    category.add_argument('--kind', help='이수구분 (예: 전필, 전선, 전기, 기본: 전체)')
+    commands.add_parser('partitions', parents=[common], help='학기 파티션 목록')
+    args = parser.parse_args()
+    try:
+        args.start = parse_semester_key(args.start)
+        args.end = parse_semester_key(args.end)
+    except ValueError as e:
+        print(f"❌ {e}")
+        exit(1)
+    with profile_run(args):
+        store = HistoryStore(args.result_dir)
+        if not store.keys():
+            print(f"❌ '{args.result_dir}'에 학기 원본 파일이 없습니다 ({args.result_dir}/{{연도}}_{{학기}}/)")
+            exit(1)
+        result = COMMANDS[args.command](store, args)
+        if args.output:
+            write_json_atomic(args.output, result)
+            print(f"📁 결과 저장: {args.output}")
+if __name__ == '__main__':
+    main()
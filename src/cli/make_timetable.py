@@ -0,0 +1,94 @@
+import json
+import os
+import argparse
+from itertools import islice
+from typing import Dict, List
+from ..core.catalog_snapshot import load_courses
+from ..core.course_model import Catalog, to_json
+from ..core.ingest import normalize_courses, open_canonical
+from ..core.search_index import list_source_files
+from ..core.timetable_generator import DEFAULT_SLOT_MINUTES, TimetableGenerator, group_sections_by_name
+def load_semester_courses(year: int, semester: int) -> Catalog:
+    """학기 폴더의 모든 원본 파일을 정규화된 과목 목록(Course 레코드)으로 읽기"""
+    folder_path = os.path.join("result", f"{year}_{semester}")
+    courses = Catalog()
+    for filename in list_source_files(folder_path):
+        try:
+            courses.extend(open_canonical(os.path.join(folder_path, filename)))
+        except Exception as e:
+            print(f"⚠️ 파일 읽기 오류: {filename} - {e}")
+    return courses
+def load_input_courses(paths: List[str]) -> List[Dict]:
+    """find_by_lecture/get_major 결과 파일 읽기 (courseTime이 없으면 정규화)"""
+    courses = []
+    for path in paths:
+        data = load_courses(path)
+        if any('courseTime' not in course for course in data):
+            data = normalize_courses(data)
+        courses.extend(data)
+    return courses
+def deduplicate_sections(courses: List[Dict]) -> List[Dict]:
+    """여러 파일에 중복 수록된 같은 분반 제거 (과목명, code, 교수 기준)"""
+    seen = set()
+    unique = []
+    for course in courses:
+        key = (course.get('name'), course.get('code'), course.get('professor'))
+        if key not in seen:
+            seen.add(key)
+            unique.append(course)
+    return unique
+def format_timetable(timetable: List[Dict]) -> List[str]:
+    lines = []
+    for section in timetable:
+        times = ', '.join(
+            f"{ct['week']} {ct['startTime']}-{ct['endTime']}" for ct in section.get('courseTime', [])
+        ) or '시간 정보 없음'
+        lines.append(f"{section.get('name')} [{section.get('code')}] {section.get('professor', '')} ({times})")
+    return lines
+def main():
+    parser = argparse.ArgumentParser(
+        description='숭실대학교 시간표 조합 생성 도구',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python -m src.cli.make_timetable 2025 1 --course "자료구조" --course "컴퓨터구조"
+  python -m src.cli.make_timetable 2025 1 --course "자료구조" --input 자료구조.json --limit 5
+        """
+    )
+    parser.add_argument('year', type=int, help='연도 (예: 2025)')
+    parser.add_argument('semester', type=int, choices=[1, 2], help='학기 (1 또는 2)')
+    parser.add_argument('--course', '-c', action='append', required=True, help='수강할 과목명 (여러 번 사용 가능)')
+    parser.add_argument('--input', '-i', action='append', help='후보 분반 JSON 파일 (기본값: 학기 전체 데이터)')
+    parser.add_argument('--contains', action='store_true', help='과목명 부분 일치 허용')
+    parser.add_argument('--slot', type=int, default=DEFAULT_SLOT_MINUTES, choices=[5, 10], help='시간 슬롯 단위(분)')
+    parser.add_argument('--limit', type=int, default=10, help='생성할 최대 시간표 수 (0=전체)')
+    parser.add_argument('--output', '-o', type=str, help='생성된 시간표 저장 파일 (JSON)')
+    args = parser.parse_args()
+    if args.input:
+        courses = load_input_courses(args.input)
+    else:
+        courses = load_semester_courses(args.year, args.semester)
+    sections = group_sections_by_name(deduplicate_sections(courses), args.course, exact=not args.contains)
+    print(f"🗓️ {args.year}년 {args.semester}학기 시간표 조합 생성")
+    for name, candidates in sections.items():
+        print(f"  - {name}: 분반 {len(candidates)}개")
+    generator = TimetableGenerator(sections, args.slot)
+    timetables = generator.generate()
+    if args.limit > 0:
+        timetables = islice(timetables, args.limit)
+    results = []
+    for i, timetable in enumerate(timetables, 1):
+        if i <= 5:
+            print(f"\n[{i}]")
+            for line in format_timetable(timetable):
+                print(f"  {line}")
+        if args.output:
+            results.append([to_json(section) for section in timetable])
+    stats = generator.stats
+    print(f"\n✅ 시간표 {stats.timetables}개 생성 (탐색 노드 {stats.nodes}개, 충돌로 제외 {stats.pruned}개, 막힌 분기 {stats.dead_ends}개)")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"📁 결과 저장: {args.output}")
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
 import json
 import os
 import argparse
-import subprocess
 import re
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 from ..core.schedule_parser import ScheduleParser, CourseTime
+from ..core.catalog_paths import list_source_files
+from ..utils.profiling import add_profile_arguments, count, profile_run, span
+from ..utils.json_writer import write_json_atomic
 from src.core.ssu_data import SSU_DATA
 class RusaintCLIWrapper:
     def __init__(self):
@@ -20,29 +22,6 @@ class RusaintCLIWrapper:
             if department in college['departments']:
                 return college['name']
         return None
-    def add_course_times(self, courses: List[Dict]) -> List[Dict]:
-        """Add courseTime field to each course using schedule parser and remove schedule_room"""
-        for course in courses:
-            code = course.get('code', '')
-            schedule_room = course.get('schedule_room', '')
-            try:
-                course_code = int(code) if code else 0
-            except (ValueError, TypeError):
-                course_code = 0
-            course_times = self.schedule_parser.parse_schedule_entry(schedule_room, course_code)
-            course['courseTime'] = [
-                {
-                    'week': ct.week,
-                    'startTime': ct.startTime,
-                    'endTime': ct.endTime,
-                    'classroom': ct.classroom,
-                    'courseCode': ct.courseCode
-                }
-                for ct in course_times
-            ]
-            if 'schedule_room' in course:
-                del course['schedule_room']
-        return courses
     def search_by_keyword_local(self, year: int, semester: int, keyword: str,
                                output_file: Optional[str] = None) -> List[Dict]:
         """
@@ -54,66 +33,55 @@ class RusaintCLIWrapper:
             print(f"❌ 폴더 '{folder_path}'를 찾을 수 없습니다.")
             print(f"먼저 전공별 데이터를 수집해주세요.")
             return []
-        matching_courses = []
         print(f"🔍 '{keyword}' 키워드로 과목 검색 중...")
-        json_files = [f for f in os.listdir(folder_path) if f.endswith('.json') and not f.startswith('search_')]
-        if not json_files:
+        if not list_source_files(folder_path):
             print(f"❌ '{folder_path}' 폴더에 전공별 JSON 파일이 없습니다.")
             return []
-        for filename in json_files:
-            file_path = os.path.join(folder_path, filename)
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    courses = json.load(f)
-                for course in courses:
-                    course_name = course.get('name', '').lower()
-                    if keyword.lower() in course_name:
-                        matching_courses.append(course)
-            except Exception as e:
-                print(f"⚠️ 파일 읽기 오류: {filename} - {e}")
-        matching_courses = self.add_course_times(matching_courses)
+        from ..core.result_cache import get_result_cache, make_key
+        from ..core.search_index import CourseSearchIndex
+        fields = ('name',)
+        cache = get_result_cache(folder_path)
+        cache_key = make_key(year, semester, keyword, None, fields)
+        with span('search.cache_lookup'):
+            matching_courses = cache.get(cache_key)
+        if matching_courses is not None:
+            print(f"⚡ 캐시된 검색 결과 사용")
+        else:
+            search_index = CourseSearchIndex.load_or_build(folder_path)
+            with span('search.query'):
+                matching_courses = search_index.search(keyword, fields)
+            with span('search.cache_store'):
+                cache.put(cache_key, matching_courses)
         print(f"✅ 검색 완료: {len(matching_courses)}개 과목 발견")
         if matching_courses:
-            if not output_file:
-                output_file = f"search_{keyword.replace(' ', '_')}.json"
-            output_path = os.path.join(folder_path, output_file)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(matching_courses, f, ensure_ascii=False, indent=2)
-            print(f"📁 결과 저장: {output_path}")
+            if output_file:
+                output_path = os.path.join(folder_path, output_file)
+                with span('search.write_output'):
+                    write_json_atomic(output_path, matching_courses)
+                print(f"📁 결과 저장: {output_path}")
             self.print_search_summary(matching_courses, keyword)
         return matching_courses
     def search_by_keyword_cli(self, year: int, semester: int, keyword: str) -> bool:
         """
         rusaint-cli find-by-lecture 명령어 실행
         """
+        from ..core.rusaint_runner import find_by_lecture_args, run_rusaint_cli
         try:
             folder_path = os.path.join("result", f"{year}_{semester}")
             os.makedirs(folder_path, exist_ok=True)
-            cmd = [
-                'rusaint-cli', 'find-by-lecture',
-                '--year', str(year),
-                '--semester', str(semester),
-                '--keyword', keyword
-            ]
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                cwd=folder_path
-            )
-            if result.returncode == 0:
+            result = run_rusaint_cli(find_by_lecture_args(year, semester, keyword), folder_path)
+            if result.ok:
                 print(f"✅ rusaint-cli 명령어 실행 완료")
                 return True
             else:
                 print(f"❌ rusaint-cli 명령어 실행 실패: {result.stderr}")
                 return False
-        except subprocess.CalledProcessError as e:
-            print(f"❌ 명령어 실행 오류: {e}")
-            return False
         except FileNotFoundError:
             print("❌ rusaint-cli 명령어를 찾을 수 없습니다.")
             return False
+        except OSError as e:
+            print(f"❌ 명령어 실행 오류: {e}")
+            return False
     def search_with_auto_fallback(self, year: int, semester: int, keyword: str,
                                  output_file: Optional[str] = None, force_cli: bool = False) -> List[Dict]:
         """
@@ -122,7 +90,7 @@ class RusaintCLIWrapper:
         folder_path = os.path.join("result", f"{year}_{semester}")
         if not force_cli:
             if os.path.exists(folder_path):
-                json_files = [f for f in os.listdir(folder_path) if f.endswith('.json') and not f.startswith('search_')]
+                json_files = list_source_files(folder_path)
                 if json_files:
                     print("💾 로컬 JSON 파일에서 검색 중...")
                     results = self.search_by_keyword_local(year, semester, keyword, output_file)
@@ -138,55 +106,85 @@ class RusaintCLIWrapper:
                 print(f"💡 '{folder_path}' 폴더가 존재하지 않습니다.")
                 print("🌐 rusaint-cli를 통해 실시간 검색을 시도합니다...\n")
         print("🌐 rusaint-cli 명령어로 검색 중...")
-        success = self.search_by_keyword_cli(year, semester, keyword)
-        if success:
-            expected_file = os.path.join(folder_path, f"search_{keyword.replace(' ', '_')}.json")
-            if os.path.exists(expected_file):
-                try:
-                    with open(expected_file, 'r', encoding='utf-8') as f:
-                        results = json.load(f)
-                    results = self.add_course_times(results)
-                    with open(expected_file, 'w', encoding='utf-8') as f:
-                        json.dump(results, f, ensure_ascii=False, indent=2)
-                    print(f"✅ CLI 검색 결과를 로드했습니다: {len(results)}개 과목")
-                    self.print_search_summary(results, keyword)
-                    return results
-                except Exception as e:
-                    print(f"⚠️ CLI 결과 파일 읽기 오류: {e}")
-            else:
-                print("⚠️ CLI 실행은 성공했으나 결과 파일을 찾을 수 없습니다.")
-        return []
+        from ..core.scrape_fallback import ScrapeFallback
+        results = ScrapeFallback(folder_path).run(
+            keyword, lambda: self.scrape_keyword(year, semester, keyword), use_negative_cache=not force_cli
+        )
+        if not results:
+            return []
+        print(f"✅ CLI 검색 결과를 로드했습니다: {len(results)}개 과목")
+        self.print_search_summary(results, keyword)
+        return results
+    def scrape_keyword(self, year: int, semester: int, keyword: str) -> Optional[List[Dict]]:
+        """
+        rusaint-cli find-by-lecture로 검색하고 결과 파일을 정규화하여 반환
+        실행 실패 시 None, 실행은 성공했으나 결과가 없으면 빈 목록
+        """
+        folder_path = os.path.join("result", f"{year}_{semester}")
+        if not self.search_by_keyword_cli(year, semester, keyword):
+            return None
+        expected_file = os.path.join(folder_path, f"search_{keyword.replace(' ', '_')}.json")
+        if not os.path.exists(expected_file):
+            print("⚠️ CLI 실행은 성공했으나 결과 파일을 찾을 수 없습니다.")
+            return []
+        try:
+            with span('scrape.read_json'):
+                with open(expected_file, 'r', encoding='utf-8') as f:
+                    results = json.load(f)
+            from ..core.ingest import normalize_courses
+            with span('scrape.normalize'):
+                results = normalize_courses(results)
+            with span('scrape.write_output'):
+                write_json_atomic(expected_file, results)
+        except Exception as e:
+            print(f"⚠️ CLI 결과 파일 읽기 오류: {e}")
+            return None
+        return results
     def get_major_info(self, year: int, semester: int, college: str,
-                      department: str, major: Optional[str] = None) -> bool:
-        """rusaint-cli를 사용하여 전공 정보 가져오기"""
-        output_dir = os.path.join("result", f"{year}_{semester}")
+                      department: str, major: Optional[str] = None,
+                      output_dir: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """
+        rusaint-cli를 사용하여 전공 정보 가져오기
+        output_dir: rusaint-cli 실행 위치(결과 파일 생성 위치), 기본값 result/{년도}_{학기}
+        timeout: 호출당 제한 시간(초), 초과 시 프로세스를 종료하고 실패 처리
+        """
+        from ..core.rusaint_runner import find_major_args, run_rusaint_cli
+        output_dir = output_dir or os.path.join("result", f"{year}_{semester}")
         os.makedirs(output_dir, exist_ok=True)
-        cmd = [
-            'rusaint-cli', 'find-major',
-            '--year', str(year),
-            '--semester', str(semester),
-            '--college', college,
-            '--department', department
-        ]
-        if major:
-            cmd.extend(['--major', major])
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                cwd=output_dir
-            )
-            if result.returncode == 0:
-                print(f"✅ {year}_{semester}_{college}_{department} 완료")
-                return True
-            else:
-                print(f"❌ 명령어 실행 실패: {result.stderr}")
-                return False
-        except subprocess.CalledProcessError as e:
+            result = run_rusaint_cli(find_major_args(year, semester, college, department, major), output_dir, timeout)
+        except FileNotFoundError:
+            print("❌ rusaint-cli 명령어를 찾을 수 없습니다.")
+            return False
+        except OSError as e:
+            print(f"❌ 명령어 실행 실패: {e}")
+            return False
+        return self._report_major_result(result, f"{year}_{semester}_{college}_{department}", timeout)
+    async def get_major_info_async(self, runner, year: int, semester: int, college: str,
+                                   department: str, major: Optional[str] = None,
+                                   output_dir: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """get_major_info의 비동기판 - 공유 AsyncRusaintRunner로 실행하므로 여러 학과를 한 이벤트 루프에서 동시에 수집"""
+        output_dir = output_dir or os.path.join("result", f"{year}_{semester}")
+        os.makedirs(output_dir, exist_ok=True)
+        count('rusaint.calls')
+        try:
+            result = await runner.find_major(year, semester, college, department, major, cwd=output_dir, timeout=timeout)
+        except FileNotFoundError:
+            print("❌ rusaint-cli 명령어를 찾을 수 없습니다.")
+            return False
+        except OSError as e:
             print(f"❌ 명령어 실행 실패: {e}")
             return False
+        return self._report_major_result(result, f"{year}_{semester}_{college}_{department}", timeout)
+    def _report_major_result(self, result, label: str, timeout: Optional[float]) -> bool:
+        if result.ok:
+            print(f"✅ {label} 완료")
+            return True
+        if result.timed_out:
+            print(f"⏱️ 시간 초과({timeout}초): {label}")
+        else:
+            print(f"❌ 명령어 실행 실패: {result.stderr}")
+        return False
     def print_search_summary(self, courses: List[Dict], keyword: str):
         """
         검색 결과 요약 출력
@@ -270,34 +268,37 @@ def main():
     major_parser.add_argument('--college', required=True, help='단과대학명')
     major_parser.add_argument('--department', required=True, help='학부/학과명')
     major_parser.add_argument('--major', help='세부 전공명 (선택사항)')
+    for subparser in (lecture_parser, major_parser):
+        add_profile_arguments(subparser)
     args = parser.parse_args()
     if not args.command:
         parser.print_help()
         return
-    wrapper = RusaintCLIWrapper()
-    print(f"🎓 숭실대학교 rusaint-cli 통합 도구")
-    print(f"📅 검색 조건: {args.year}년 {args.semester}학기")
-    if not wrapper.validate_parameters(args.year, args.semester):
-        return
-    if args.command == 'find-by-lecture':
-        print(f"🔍 과목 검색 모드 - 키워드: '{args.keyword}'\n")
-        results = wrapper.search_with_auto_fallback(
-            args.year, args.semester, args.keyword, args.output, force_cli=args.cli
-        )
-        if not results:
-            print(f"\n💡 '{args.keyword}' 키워드와 일치하는 과목을 찾을 수 없습니다.")
-            print("다른 키워드로 시도해보거나, 전공별 데이터를 수집해주세요.")
-    elif args.command == 'find-major':
-        print(f"🏛️ 전공별 과목 조회 모드 - {args.college} {args.department}")
-        if args.major:
-            print(f"   세부 전공: {args.major}")
-        print()
-        success = wrapper.get_major_info(
-            args.year, args.semester, args.college, args.department, args.major
-        )
-        if success:
-            print("✅ 전공별 과목 조회가 완료되었습니다.")
-        else:
-            print("❌ 전공별 과목 조회에 실패했습니다.")
+    with profile_run(args):
+        wrapper = RusaintCLIWrapper()
+        print(f"🎓 숭실대학교 rusaint-cli 통합 도구")
+        print(f"📅 검색 조건: {args.year}년 {args.semester}학기")
+        if not wrapper.validate_parameters(args.year, args.semester):
+            return
+        if args.command == 'find-by-lecture':
+            print(f"🔍 과목 검색 모드 - 키워드: '{args.keyword}'\n")
+            results = wrapper.search_with_auto_fallback(
+                args.year, args.semester, args.keyword, args.output, force_cli=args.cli
+            )
+            if not results:
+                print(f"\n💡 '{args.keyword}' 키워드와 일치하는 과목을 찾을 수 없습니다.")
+                print("다른 키워드로 시도해보거나, 전공별 데이터를 수집해주세요.")
+        elif args.command == 'find-major':
+            print(f"🏛️ 전공별 과목 조회 모드 - {args.college} {args.department}")
+            if args.major:
+                print(f"   세부 전공: {args.major}")
+            print()
+            success = wrapper.get_major_info(
+                args.year, args.semester, args.college, args.department, args.major
+            )
+            if success:
+                print("✅ 전공별 과목 조회가 완료되었습니다.")
+            else:
+                print("❌ 전공별 과목 조회에 실패했습니다.")
 if __name__ == "__main__":
     main()
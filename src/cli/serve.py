@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import signal
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from ..core.conflict_checker import CONFLICT_BACKENDS
+from ..core.query_service import QueryService, semester_name
+from ..utils.daemon_client import DAEMON_STATE_PATH, query_daemon, read_daemon_state
+from ..utils.json_writer import write_json_atomic
+DEFAULT_PORT = 8765
+LATENCY_SAMPLES = 2048
+class QueryError(Exception):
+    """요청 처리 오류 (HTTP 상태 코드 포함)"""
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+class EndpointStats:
+    """엔드포인트 하나의 요청 수, 오류 수, 최근 지연 시간 표본"""
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=LATENCY_SAMPLES)
+    def summary(self) -> Dict:
+        ordered = sorted(self.samples)
+        def percentile(p: float) -> float:
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000 if ordered else 0.0
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'meanMs': round(self.total / self.requests * 1000, 3) if self.requests else 0.0,
+            'p50Ms': round(percentile(0.5), 3),
+            'p95Ms': round(percentile(0.95), 3),
+            'maxMs': round(self.max * 1000, 3)
+        }
+class ServerStats:
+    """엔드포인트별 지연 시간(평균/p50/p95/최대)과 전체 처리량"""
+    def __init__(self):
+        self.started = time.time()
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+    def record(self, endpoint: str, elapsed: float, error: bool):
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = EndpointStats()
+            stats.requests += 1
+            stats.errors += error
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+            stats.samples.append(elapsed)
+    def summary(self) -> Dict:
+        with self._lock:
+            uptime = time.time() - self.started
+            requests = sum(stats.requests for stats in self.endpoints.values())
+            return {
+                'uptimeSeconds': round(uptime, 1),
+                'requests': requests,
+                'qps': round(requests / uptime, 3) if uptime else 0.0,
+                'endpoints': {name: stats.summary() for name, stats in sorted(self.endpoints.items())}
+            }
+def _param(params: Dict[str, List[str]], name: str, required: bool = False) -> Optional[str]:
+    values = params.get(name)
+    if not values or values[0] == '':
+        if required:
+            raise QueryError(400, f"'{name}' 파라미터가 필요합니다")
+        return None
+    return values[0]
+def _int_param(params: Dict[str, List[str]], name: str) -> int:
+    value = _param(params, name, required=True)
+    try:
+        return int(value)
+    except ValueError:
+        raise QueryError(400, f"'{name}'는 정수여야 합니다: {value}")
+class CatalogServer:
+    """QueryService를 HTTP 엔드포인트로 노출 (엔드포인트 이름 → 처리 메서드)"""
+    def __init__(self, service: QueryService):
+        self.service = service
+        self.stats = ServerStats()
+        self.handlers = {
+            'health': self.handle_health,
+            'stats': self.handle_stats,
+            'search': self.handle_search,
+            'major': self.handle_major,
+            'filter': self.handle_filter,
+            'filter_subjects': self.handle_filter_subjects,
+            'conflicts': self.handle_conflicts,
+            'reload': self.handle_reload
+        }
+    def catalog(self, params: Dict[str, List[str]]):
+        name = semester_name(_int_param(params, 'year'), _int_param(params, 'semester'))
+        catalog = self.service.get(name)
+        if catalog is None:
+            raise QueryError(404, f"적재되지 않은 학기입니다: {name}")
+        return catalog
+    def handle(self, endpoint: str, params: Dict[str, List[str]]):
+        handler = self.handlers.get(endpoint)
+        if handler is None:
+            raise QueryError(404, f"알 수 없는 엔드포인트입니다: /{endpoint}")
+        return handler(params)
+    def handle_health(self, params):
+        return {'status': 'ok', 'pid': os.getpid(), 'semesters': sorted(self.service.catalogs)}
+    def handle_stats(self, params):
+        summary = self.stats.summary()
+        summary['reloads'] = self.service.reloads
+        summary['semesters'] = [catalog.info() for _name, catalog in sorted(self.service.catalogs.items())]
+        return summary
+    def handle_search(self, params):
+        return self.catalog(params).search(_param(params, 'keyword', required=True), _param(params, 'grade'))
+    def handle_major(self, params):
+        catalog = self.catalog(params)
+        data = catalog.major(
+            _int_param(params, 'year'), _int_param(params, 'semester'),
+            _param(params, 'college', required=True), _param(params, 'department', required=True),
+            _param(params, 'major'), params.get('sub'), _param(params, 'grade')
+        )
+        if data is None:
+            raise QueryError(404, '학과 원본 파일이 적재되어 있지 않습니다')
+        return data
+    def handle_filter(self, params):
+        return self.catalog(params).filter(params.get('department', []), _param(params, 'grade'))
+    def handle_filter_subjects(self, params):
+        """filter_subjects와 같은 결과 (원본 파일 하나에 abbr 또는 department 모드 필터)"""
+        from src.cli.filter_subjects import build_target_table, iter_abbr_matches, iter_department_year_matches
+        catalog = self.catalog(params)
+        filename = _param(params, 'file', required=True)
+        if filename not in catalog.courses_by_file:
+            raise QueryError(404, f"적재되지 않은 원본 파일입니다: {filename}")
+        build_target_table()
+        items = (dict(course) for course in catalog.courses_by_file[filename])
+        mode = _param(params, 'mode') or 'abbr'
+        if mode == 'abbr':
+            return list(iter_abbr_matches(items))
+        if mode == 'department':
+            return list(iter_department_year_matches(
+                items, _param(params, 'department', required=True), _int_param(params, 'filter_year')
+            ))
+        raise QueryError(400, f"알 수 없는 mode입니다: {mode}")
+    def handle_conflicts(self, params):
+        codes = [code for value in params.get('code', []) for code in value.split(',') if code]
+        if not codes:
+            raise QueryError(400, "'code' 파라미터가 필요합니다")
+        return self.catalog(params).conflicts(codes, free=_param(params, 'free') in ('1', 'true'))
+    def handle_reload(self, params):
+        return {'reloaded': self.service.refresh(), 'semesters': sorted(self.service.catalogs)}
+    def make_handler(self):
+        server = self
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            def do_GET(self):
+                started = time.perf_counter()
+                url = urlparse(self.path)
+                endpoint = url.path.strip('/')
+                # http.server는 요청 줄을 latin-1로 읽으므로 퍼센트 인코딩하지 않은 UTF-8 쿼리도 되돌림
+                query = url.query.encode('latin-1', 'replace').decode('utf-8', 'replace')
+                try:
+                    status, body = 200, {'result': server.handle(endpoint, parse_qs(query))}
+                except QueryError as e:
+                    status, body = e.status, {'error': str(e)}
+                except Exception as e:
+                    status, body = 500, {'error': f"{type(e).__name__}: {e}"}
+                payload = json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                if endpoint in server.handlers:
+                    server.stats.record(endpoint, time.perf_counter() - started, status != 200)
+            def log_message(self, format, *args):
+                pass
+        return Handler
+def watch(service: QueryService, interval: float, stop: threading.Event):
+    """interval초마다 result/ 원본 변경을 확인해 바뀐 학기만 다시 적재 (적재 중에도 이전 카탈로그로 응답)"""
+    while not stop.wait(interval):
+        try:
+            reloaded = service.refresh()
+        except Exception as e:
+            print(f"⚠️ 다시 적재 실패: {e}")
+            continue
+        for name in reloaded:
+            catalog = service.get(name)
+            print(f"🔄 {name} 다시 적재: 과목 {len(catalog.courses):,}개 ({catalog.load_seconds:.2f}초)")
+def print_stats() -> bool:
+    """실행 중인 데몬의 /stats를 받아 출력"""
+    stats = query_daemon('stats')
+    if stats is None:
+        print("❌ 실행 중인 serve 데몬이 없습니다")
+        return False
+    print(f"⏱️ 가동 {stats['uptimeSeconds']}초, 요청 {stats['requests']:,}개 ({stats['qps']} req/s), 다시 적재 {stats['reloads']}회")
+    for semester in stats['semesters']:
+        print(f"  📚 {semester['semester']}: 파일 {semester['files']}개, 과목 {semester['courses']:,}개 (적재 {semester['loadSeconds']}초)")
+    print(f"  {'endpoint':<16} {'requests':>9} {'errors':>7} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+    for name, endpoint in stats['endpoints'].items():
+        print(f"  {name:<16} {endpoint['requests']:>9} {endpoint['errors']:>7} {endpoint['meanMs']:>7.2f}ms "
+              f"{endpoint['p50Ms']:>7.2f}ms {endpoint['p95Ms']:>7.2f}ms {endpoint['maxMs']:>7.2f}ms")
+    return True
+def main():
+    parser = argparse.ArgumentParser(description='학기 카탈로그를 메모리에 올려 두고 검색/전공/필터/시간표 충돌 질의에 답하는 로컬 서버')
+    parser.add_argument('--semester', action='append', help='적재할 학기 폴더 이름 (여러 번 사용 가능, 예: 2025_1, 기본: result/ 아래 전체)')
+    parser.add_argument('--host', default='127.0.0.1', help='바인딩 주소 (기본: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'포트 (기본: {DEFAULT_PORT}, 0이면 빈 포트)')
+    parser.add_argument('--watch-interval', type=float, default=2.0, help='result/ 변경 확인 주기(초), 0이면 자동 다시 적재 안 함')
+    parser.add_argument('--conflict-backend', default='auto', choices=CONFLICT_BACKENDS, help='시간표 충돌 색인 구현')
+    parser.add_argument('--stats', action='store_true', help='서버를 띄우지 않고 실행 중인 데몬의 지연 시간/처리량 통계 출력')
+    args = parser.parse_args()
+    if args.stats:
+        exit(0 if print_stats() else 1)
+    running = read_daemon_state()
+    if running and query_daemon('health', state=running, timeout=1.0) is not None:
+        print(f"❌ 이미 serve 데몬이 실행 중입니다 (pid {running.get('pid')}, 포트 {running['port']})")
+        exit(1)
+    service = QueryService(args.semester, conflict_backend=args.conflict_backend)
+    started = time.perf_counter()
+    service.refresh()
+    if not service.catalogs:
+        print("❌ 적재할 학기 원본 파일이 없습니다 (result/{연도}_{학기}/)")
+        exit(1)
+    for name, catalog in sorted(service.catalogs.items()):
+        print(f"📚 {name}: 파일 {len(catalog.courses_by_file)}개, 과목 {len(catalog.courses):,}개 적재")
+    print(f"✅ 적재 완료 ({time.perf_counter() - started:.2f}초)")
+    catalog_server = CatalogServer(service)
+    httpd = ThreadingHTTPServer((args.host, args.port), catalog_server.make_handler())
+    httpd.daemon_threads = True
+    host, port = httpd.server_address[:2]
+    os.makedirs(os.path.dirname(DAEMON_STATE_PATH), exist_ok=True)
+    write_json_atomic(DAEMON_STATE_PATH, {
+        'host': host, 'port': port, 'pid': os.getpid(), 'semesters': sorted(service.catalogs)
+    })
+    stop = threading.Event()
+    if args.watch_interval > 0:
+        threading.Thread(target=watch, args=(service, args.watch_interval, stop), daemon=True).start()
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=httpd.shutdown).start())
+    print(f"🚀 http://{host}:{port} 에서 대기 중 (Ctrl+C로 종료)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        httpd.server_close()
+        state = read_daemon_state()
+        if state and state.get('pid') == os.getpid():
+            os.remove(DAEMON_STATE_PATH)
+        print("👋 서버 종료")
+if __name__ == '__main__':
+    main()
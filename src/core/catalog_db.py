@@ -0,0 +1,349 @@
+import argparse
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+from .catalog_paths import get_cache_dir, list_source_files, source_signature
+from .category_parser import course_category_entries
+from .ingest import load_canonical
+from .schedule_parser import TimeInterval, intervals_from_course_times
+from .search_index import SEARCH_FIELDS, normalize_text
+from .target_parser import DEPARTMENT_COLLEGE, course_target_info, parse_grade, resolve_department_names
+from ..utils.profiling import count, span
+DB_VERSION = 2
+DB_FILE_NAME = 'catalog.sqlite3'
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE courses (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE sections (
+    id INTEGER PRIMARY KEY,
+    course_id INTEGER NOT NULL REFERENCES courses(id),
+    file TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    code TEXT,
+    division TEXT,
+    department TEXT,
+    category TEXT,
+    sub_category TEXT,
+    hours REAL,
+    credits REAL,
+    personeel INTEGER,
+    remaining_seats INTEGER,
+    target TEXT,
+    targeted INTEGER NOT NULL,
+    all_grades INTEGER NOT NULL,
+    open_to_all INTEGER NOT NULL,
+    restricted INTEGER NOT NULL,
+    foreign_only INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE course_times (
+    section_id INTEGER NOT NULL REFERENCES sections(id),
+    week TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    start_minute INTEGER,
+    end_minute INTEGER,
+    classroom TEXT
+);
+CREATE TABLE professors (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE section_professors (
+    section_id INTEGER NOT NULL REFERENCES sections(id),
+    professor_id INTEGER NOT NULL REFERENCES professors(id)
+);
+CREATE TABLE target_grades (section_id INTEGER NOT NULL REFERENCES sections(id), grade INTEGER NOT NULL);
+CREATE TABLE target_departments (
+    section_id INTEGER NOT NULL REFERENCES sections(id),
+    department TEXT NOT NULL,
+    excluded INTEGER NOT NULL
+);
+CREATE TABLE target_colleges (
+    section_id INTEGER NOT NULL REFERENCES sections(id),
+    college TEXT NOT NULL,
+    excluded INTEGER NOT NULL
+);
+CREATE TABLE section_categories (
+    section_id INTEGER NOT NULL REFERENCES sections(id),
+    field TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    department TEXT
+);
+"""
+INDEXES = """
+CREATE INDEX sections_file ON sections(file, position);
+CREATE INDEX sections_course ON sections(course_id);
+CREATE INDEX sections_code ON sections(code);
+CREATE INDEX course_times_span ON course_times(start_minute, end_minute);
+CREATE INDEX course_times_section ON course_times(section_id);
+CREATE INDEX section_professors_professor ON section_professors(professor_id);
+CREATE INDEX target_grades_grade ON target_grades(grade, section_id);
+CREATE INDEX target_departments_department ON target_departments(department, excluded, section_id);
+CREATE INDEX target_colleges_college ON target_colleges(college, excluded, section_id);
+CREATE INDEX section_categories_department ON section_categories(department, kind, section_id);
+"""
+def get_db_path(folder_path: str) -> str:
+    """학기 폴더의 SQLite 카탈로그 경로 ({폴더}/.cache/catalog.sqlite3)"""
+    return os.path.join(get_cache_dir(folder_path), DB_FILE_NAME)
+def _execute_script(connection: sqlite3.Connection, script: str):
+    """세미콜론으로 나뉜 DDL을 현재 트랜잭션 안에서 실행 (executescript는 먼저 COMMIT하므로 쓰지 않음)"""
+    for statement in script.split(';'):
+        if statement.strip():
+            connection.execute(statement)
+def _create_search_table(connection: sqlite3.Connection) -> bool:
+    """
+    과목명/교수명/학과명 검색 테이블 생성 (FTS5 trigram, 정규화된 텍스트)
+    SQLite에 FTS5나 trigram 토크나이저가 없으면 일반 테이블을 만들고 False 반환 (LIKE 전체 검색)
+    """
+    columns = ', '.join(SEARCH_FIELDS)
+    try:
+        connection.execute(f"CREATE VIRTUAL TABLE section_search USING fts5({columns}, tokenize='trigram')")
+        return True
+    except sqlite3.OperationalError:
+        connection.execute(f"CREATE TABLE section_search (rowid INTEGER PRIMARY KEY, {columns})")
+        return False
+class _Ids:
+    """이름 → 정수 id 사전 (courses, professors 테이블 행)"""
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+    def get(self, name: str) -> int:
+        if name not in self.ids:
+            self.ids[name] = len(self.ids) + 1
+        return self.ids[name]
+    def rows(self) -> Iterator[tuple]:
+        return ((id_, name) for name, id_ in self.ids.items())
+def import_semester(folder_path: str, db_path: Optional[str] = None) -> Dict[str, int]:
+    """
+    학기 폴더의 원본 JSON(정규화 스토어 경유)을 SQLite 카탈로그로 일괄 적재
+    임시 파일에 트랜잭션 하나로 모두 넣고 색인을 만든 뒤 os.replace로 교체한다 (적재 중에도 기존 DB를 읽을 수 있음).
+    반환: 파일/과목/시간표 행 수
+    """
+    db_path = db_path or get_db_path(folder_path)
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    tmp_path = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    files = list_source_files(folder_path)
+    signature = source_signature(folder_path, files)
+    connection = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        connection.execute('PRAGMA journal_mode = OFF')
+        connection.execute('PRAGMA synchronous = OFF')
+        connection.execute('BEGIN')
+        _execute_script(connection, SCHEMA)
+        fts = _create_search_table(connection)
+        courses, professors = _Ids(), _Ids()
+        sections, times, section_professors, grades, departments, colleges, categories, search_rows = \
+            [], [], [], [], [], [], [], []
+        imported_files = 0
+        for filename in files:
+            with span('catalog_db.read'):
+                try:
+                    file_courses = load_canonical(os.path.join(folder_path, filename))
+                except Exception as e:
+                    # 서명은 그대로 기록해 둔다: 파일이 고쳐지면(크기/mtime 변경) 다시 만들고, 그대로면 매번 재생성하지 않음
+                    print(f"⚠️ 파일 읽기 오류 (바뀔 때까지 건너뜀): {filename} - {e}")
+                    continue
+            imported_files += 1
+            for position, course in enumerate(file_courses):
+                section_id = len(sections) + 1
+                info = course_target_info(course)
+                sections.append((
+                    section_id, courses.get(course.get('name') or ''), filename, position, course.get('code'),
+                    course.get('division'), course.get('department'), course.get('category'), course.get('sub_category'),
+                    course.get('hours'), course.get('credits'), course.get('personeel'), course.get('remaining_seats'),
+                    course.get('target'), bool(course.get('target')), info.all_grades, info.open_to_all,
+                    info.restricted, info.foreign, json.dumps(course, ensure_ascii=False, separators=(',', ':'))
+                ))
+                for course_time in course.get('courseTime') or []:
+                    interval = TimeInterval.from_strings(course_time.get('week'), course_time.get('startTime'),
+                                                         course_time.get('endTime'))
+                    times.append((
+                        section_id, course_time.get('week'), course_time.get('startTime'), course_time.get('endTime'),
+                        interval.start if interval else None, interval.end if interval else None,
+                        course_time.get('classroom')
+                    ))
+                for name in course.get('professors') or []:
+                    section_professors.append((section_id, professors.get(name)))
+                grades.extend((section_id, grade) for grade in info.grades)
+                departments.extend((section_id, name, 0) for name in info.departments)
+                departments.extend((section_id, name, 1) for name in info.excluded_departments)
+                colleges.extend((section_id, name, 0) for name in info.colleges)
+                colleges.extend((section_id, name, 1) for name in info.excluded_colleges)
+                categories.extend(
+                    (section_id, entry.field, entry.kind, entry.department) for entry in course_category_entries(course)
+                )
+                search_rows.append((section_id,) + tuple(normalize_text(course.get(field)) for field in SEARCH_FIELDS))
+        with span('catalog_db.insert'):
+            connection.executemany('INSERT INTO courses VALUES (?, ?)', courses.rows())
+            connection.executemany(f"INSERT INTO sections VALUES ({', '.join('?' * 20)})", sections)
+            connection.executemany('INSERT INTO course_times VALUES (?, ?, ?, ?, ?, ?, ?)', times)
+            connection.executemany('INSERT INTO professors VALUES (?, ?)', professors.rows())
+            connection.executemany('INSERT INTO section_professors VALUES (?, ?)', section_professors)
+            connection.executemany('INSERT INTO target_grades VALUES (?, ?)', grades)
+            connection.executemany('INSERT INTO target_departments VALUES (?, ?, ?)', departments)
+            connection.executemany('INSERT INTO target_colleges VALUES (?, ?, ?)', colleges)
+            connection.executemany('INSERT INTO section_categories VALUES (?, ?, ?, ?)', categories)
+            connection.executemany(
+                f"INSERT INTO section_search (rowid, {', '.join(SEARCH_FIELDS)}) VALUES (?, ?, ?, ?)", search_rows
+            )
+        with span('catalog_db.index'):
+            _execute_script(connection, INDEXES)
+        connection.executemany('INSERT INTO meta VALUES (?, ?)', [
+            ('version', str(DB_VERSION)), ('sources', json.dumps(signature, sort_keys=True)), ('fts', str(int(fts)))
+        ])
+        connection.execute('COMMIT')
+    except BaseException:
+        connection.close()
+        os.remove(tmp_path)
+        raise
+    connection.close()
+    os.replace(tmp_path, db_path)
+    count('catalog_db.sections', len(sections))
+    return {'files': imported_files, 'sections': len(sections), 'courseTimes': len(times)}
+def _like_pattern(text: str) -> str:
+    return '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+def _placeholders(values: Sequence) -> str:
+    return ', '.join('?' * len(values))
+class CatalogDatabase:
+    """
+    학기 카탈로그 SQLite 백엔드 (읽기 전용 조회)
+    조회 결과는 정규화된 과목 dict(원본 순서)로, JSON 경로(CourseSearchIndex, filter_courses_by_*)와 같은 결과를 돌려준다.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+        meta = dict(self.connection.execute('SELECT key, value FROM meta'))
+        self.version = int(meta.get('version', 0))
+        self.sources = json.loads(meta.get('sources', '{}'))
+        self.fts = meta.get('fts') == '1'
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+    def close(self):
+        self.connection.close()
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM sections').fetchone()[0]
+    def is_fresh(self, folder_path: str) -> bool:
+        return self.version == DB_VERSION and self.sources == source_signature(folder_path, list_source_files(folder_path))
+    def _courses(self, sql: str, params: Sequence = ()) -> List[Dict]:
+        """sections의 id를 고르는 sql → 원본 순서의 과목 dict 목록"""
+        rows = self.connection.execute(f"SELECT data FROM sections WHERE id IN ({sql}) ORDER BY id", params)
+        return [json.loads(data) for data, in rows]
+    def file_courses(self, filename: str) -> List[Dict]:
+        """원본 파일 하나의 과목 (파일 안 순서)"""
+        rows = self.connection.execute('SELECT data FROM sections WHERE file = ? ORDER BY position', (filename,))
+        return [json.loads(data) for data, in rows]
+    def files(self) -> List[str]:
+        return [file for file, in self.connection.execute('SELECT DISTINCT file FROM sections ORDER BY id')]
+    def search(self, keyword: str, fields: Sequence[str] = SEARCH_FIELDS) -> List[Dict]:
+        """
+        과목명/교수명/학과명 부분 일치 검색 (CourseSearchIndex.search와 같은 결과)
+        3자 이상은 FTS5 trigram 구절 질의(부분 문자열 일치와 같음), 그보다 짧으면 검색 테이블 LIKE 검사
+        """
+        normalized = normalize_text(keyword)
+        fields = [field for field in SEARCH_FIELDS if field in fields]
+        if not fields:
+            return []
+        if self.fts and len(normalized) >= 3:
+            phrase = '"' + normalized.replace('"', '""') + '"'
+            sql = "SELECT rowid FROM section_search WHERE section_search MATCH ?"
+            params = [f"{{{' '.join(fields)}}} : {phrase}"]
+        else:
+            pattern = _like_pattern(normalized)
+            sql = "SELECT rowid FROM section_search WHERE " + ' OR '.join(f"{field} LIKE ? ESCAPE '\\'" for field in fields)
+            params = [pattern] * len(fields)
+        with span('catalog_db.search'):
+            return self._courses(sql, params)
+    def _department_sql(self, department: str) -> tuple:
+        """학과 학생이 수강 대상인 section id (TargetIndex.department_positions와 같은 집합 연산)"""
+        college = DEPARTMENT_COLLEGE.get(department)
+        sql = ("SELECT id FROM sections WHERE open_to_all = 1"
+               " UNION SELECT section_id FROM target_departments WHERE department = ? AND excluded = 0"
+               " UNION SELECT section_id FROM target_colleges WHERE college = ? AND excluded = 0"
+               " EXCEPT SELECT section_id FROM target_departments WHERE department = ? AND excluded = 1"
+               " EXCEPT SELECT section_id FROM target_colleges WHERE college = ? AND excluded = 1")
+        return sql, [department, college, department, college]
+    def filter(self, departments: Iterable[str] = (), grade: Optional[str] = None,
+               files: Optional[Sequence[str]] = None) -> List[Dict]:
+        """
+        학과(들) 학생이 수강 대상이고 해당 학년이 들을 수 있는 과목 (filter_courses_by_department/grade와 같은 결과)
+        files를 주면 그 원본 파일의 과목만 대상으로 한다.
+        """
+        conditions, params = [], []
+        if files is not None:
+            conditions.append(f"file IN ({_placeholders(files)})")
+            params.extend(files)
+        departments = list(departments)
+        if departments:
+            parts = [self._department_sql(name) for name in sorted(resolve_department_names(departments))]
+            conditions.append('targeted = 1')
+            # 학과마다 하위 질의로 감싸야 한 학과의 EXCEPT가 앞 학과 결과까지 빼지 않음
+            union = ' UNION '.join(f"SELECT * FROM ({sql})" for sql, _ in parts)
+            conditions.append(f"id IN ({union or 'SELECT NULL'})")
+            params.extend(value for _, values in parts for value in values)
+        grade_number = parse_grade(grade)
+        if grade_number is not None:
+            conditions.append("id IN (SELECT id FROM sections WHERE all_grades = 1"
+                              " UNION SELECT section_id FROM target_grades WHERE grade = ?)")
+            params.append(grade_number)
+        sql = 'SELECT id FROM sections' + (' WHERE ' + ' AND '.join(conditions) if conditions else '')
+        with span('catalog_db.filter'):
+            return self._courses(sql, params)
+    def overlapping(self, intervals: Iterable[TimeInterval]) -> List[Dict]:
+        """주어진 주간 구간들과 수업 시간이 겹치는 과목 (course_times의 시작/끝 분 색인 사용)"""
+        intervals = list(intervals)
+        if not intervals:
+            return []
+        sql = ' UNION '.join(
+            'SELECT section_id FROM course_times WHERE start_minute < ? AND end_minute > ?' for _ in intervals
+        )
+        return self._courses(sql, [value for interval in intervals for value in (interval.end, interval.start)])
+    def overlapping_course_times(self, course_times: List[Dict]) -> List[Dict]:
+        return self.overlapping(intervals_from_course_times(course_times))
+    def by_professor(self, name: str) -> List[Dict]:
+        return self._courses(
+            'SELECT section_id FROM section_professors JOIN professors ON professors.id = professor_id WHERE name = ?',
+            [name]
+        )
+    def by_category(self, department: str, kind: Optional[str] = None) -> List[Dict]:
+        """category/sub_category에 '이수구분-학과 약칭'으로 적힌 과목 (예: by_category('컴퓨터', '전필'))"""
+        sql = 'SELECT section_id FROM section_categories WHERE department = ?'
+        params = [department]
+        if kind:
+            sql += ' AND kind = ?'
+            params.append(kind)
+        return self._courses(sql, params)
+def open_catalog_db(folder_path: str) -> CatalogDatabase:
+    """학기 폴더의 SQLite 카탈로그를 열고, 없거나 원본이 바뀌었으면 먼저 일괄 적재"""
+    db_path = get_db_path(folder_path)
+    if os.path.exists(db_path):
+        with span('catalog_db.open'):
+            try:
+                database = CatalogDatabase(db_path)
+            except sqlite3.DatabaseError:
+                database = None
+        if database is not None:
+            if database.is_fresh(folder_path):
+                return database
+            database.close()
+    with span('catalog_db.import'):
+        import_semester(folder_path, db_path)
+    return CatalogDatabase(db_path)
+def main():
+    parser = argparse.ArgumentParser(description='학기 폴더를 SQLite 카탈로그(FTS5 검색 포함)로 일괄 적재')
+    parser.add_argument('folders', nargs='+', help='학기 폴더 (예: result/2025_1)')
+    parser.add_argument('--search', help='적재 후 키워드 검색 결과 수 출력')
+    args = parser.parse_args()
+    for folder_path in args.folders:
+        started = time.perf_counter()
+        stats = import_semester(folder_path)
+        print(f"✅ {get_db_path(folder_path)}: 파일 {stats['files']}개, 과목 {stats['sections']:,}개, "
+              f"시간표 {stats['courseTimes']:,}개 ({time.perf_counter() - started:.2f}초)")
+        if args.search:
+            with CatalogDatabase(get_db_path(folder_path)) as database:
+                print(f"🔍 '{args.search}': {len(database.search(args.search))}개 과목 (FTS5: {'사용' if database.fts else '미사용'})")
+if __name__ == '__main__':
+    main()
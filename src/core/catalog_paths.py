@@ -0,0 +1,54 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+CACHE_DIR_NAME = '.cache'
+DERIVED_PREFIXES = ('search_', 'parsed_', 'major_')
+DERIVED_FILES = ('category_index.json', 'parsing_statistics.json')
+STORAGE_BACKENDS = ('json', 'sqlite')
+SEMESTER_FOLDER_PATTERN = re.compile(r'^(\d{4})_(\d)$')
+def get_cache_dir(folder_path: str) -> str:
+    """학기 폴더의 파생 데이터(.cache) 디렉토리 경로"""
+    return os.path.join(folder_path, CACHE_DIR_NAME)
+def list_source_files(folder_path: str) -> List[str]:
+    """검색 대상 원본 JSON 파일 목록 (search_/major_ 결과와 parse_categories 출력 파일 제외)"""
+    if not os.path.isdir(folder_path):
+        return []
+    return sorted(
+        f for f in os.listdir(folder_path)
+        if f.endswith('.json') and not f.startswith(DERIVED_PREFIXES) and f not in DERIVED_FILES
+    )
+def parse_semester_name(name: str) -> Optional[Tuple[int, int]]:
+    """학기 폴더 이름 '2025_1' → (2025, 1), 형식이 다르면 None"""
+    match = SEMESTER_FOLDER_PATTERN.match(name)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+def discover_semesters(result_dir: str = 'result') -> List[str]:
+    """result/ 아래 원본 JSON이 있는 학기 폴더 이름 목록 (연도/학기 순, 예: ['2024_2', '2025_1'])"""
+    if not os.path.isdir(result_dir):
+        return []
+    names = [
+        name for name in os.listdir(result_dir)
+        if parse_semester_name(name) and list_source_files(os.path.join(result_dir, name))
+    ]
+    return sorted(names, key=parse_semester_name)
+def source_signature(folder_path: str, files: List[str]) -> Dict[str, List[int]]:
+    """파일별 (크기, mtime_ns) 시그니처 - 원본 변경 감지용"""
+    signature = {}
+    for filename in files:
+        stat = os.stat(os.path.join(folder_path, filename))
+        signature[filename] = [stat.st_size, stat.st_mtime_ns]
+    return signature
+def major_source_candidates(year: int, semester: int, college: str, department: str,
+                            major: Optional[str] = None, subdepartments: Optional[List[str]] = None) -> List[str]:
+    """rusaint-cli find-major가 만드는 원본 파일 이름 후보 (우선순위 순)"""
+    candidates = [
+        f"{year}_{semester}학기_{college}_{department}_전공.json",
+        f"{college}_{department}_{major}.json" if major else f"{college}_{department}.json"
+    ]
+    if subdepartments:
+        for subdept in subdepartments:
+            candidates.insert(0, f"{year}_{semester}학기_{college}_{department}_{subdept}_전공.json")
+    return candidates
+def add_backend_argument(parser):
+    """조회 백엔드 선택 옵션 (sqlite는 core/catalog_db의 {폴더}/.cache/catalog.sqlite3, 사용할 때만 import)"""
+    parser.add_argument('--backend', default='json', choices=STORAGE_BACKENDS,
+                        help='조회 백엔드: json(기본, 원본/정규화 스토어 직접 조회), sqlite(학기 SQLite 카탈로그, 없거나 오래되면 자동 적재)')
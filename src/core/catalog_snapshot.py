@@ -0,0 +1,341 @@
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import argparse
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from .catalog_paths import get_cache_dir
+SNAPSHOT_MAGIC = b'SSUCAT\x00\x01'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = '.snap'
+HEADER = struct.Struct('<8sIQqIII')
+U32 = struct.Struct('<I')
+OFFSET_PAIR = struct.Struct('<II')
+NONE_CELL = 0xFFFFFFFF
+ABSENT_CELL = 0xFFFFFFFE
+JSON_FLAG = 0x80000000
+STRING_CACHE_LIMIT = 65536
+ITER_CHUNK_RECORDS = 4096
+WRITE_BUFFER_BYTES = 1 << 20
+_json_encoder = json.JSONEncoder(ensure_ascii=False)
+class SnapshotError(Exception):
+    """스냅샷 파일 형식 오류 또는 변환 불가능한 입력"""
+def get_snapshot_path(json_path: str) -> str:
+    """원본 JSON에 대응하는 스냅샷 경로 ({폴더}/.cache/{파일명}.snap)"""
+    folder_path, filename = os.path.split(json_path)
+    return os.path.join(get_cache_dir(folder_path), filename + SNAPSHOT_SUFFIX)
+class CatalogSnapshot(Sequence):
+    """
+    mmap 기반 학기 카탈로그 스냅샷 (읽기 전용)
+    파일 구성: 헤더 | 필드명 id[u32] | 문자열 offset[u32] | 레코드 셀[u32 × 필드 수] | UTF-8 문자열 blob
+    셀 값은 문자열 테이블 id이며, 최상위 비트가 켜져 있으면 JSON 인코딩된 값(숫자, 리스트 등)이다.
+    과목 dict는 접근할 때마다 새로 만들어지므로 수정해도 스냅샷에는 영향이 없다.
+    """
+    def __init__(self, snapshot_path: str):
+        self.path = snapshot_path
+        with open(snapshot_path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header()
+        except (struct.error, SnapshotError):
+            self._mm.close()
+            raise
+    def _read_header(self):
+        if len(self._mm) < HEADER.size:
+            raise SnapshotError(f"스냅샷 헤더가 손상되었습니다: {self.path}")
+        magic, version, size, mtime_ns, n_fields, n_records, n_strings = HEADER.unpack_from(self._mm, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise SnapshotError(f"지원하지 않는 스냅샷 형식입니다: {self.path}")
+        self.source_size = size
+        self.source_mtime_ns = mtime_ns
+        self.n_records = n_records
+        self._row = struct.Struct(f'<{n_fields}I')
+        fields_offset = HEADER.size
+        self._string_offsets = fields_offset + 4 * n_fields
+        self._records_offset = self._string_offsets + 4 * (n_strings + 1)
+        self._blob_offset = self._records_offset + self._row.size * n_records
+        field_ids = struct.unpack_from(f'<{n_fields}I', self._mm, fields_offset)
+        self._strings = {}
+        self.fields: List[str] = [self._string(i) for i in field_ids]
+    def _string(self, string_id: int) -> str:
+        value = self._strings.get(string_id)
+        if value is None:
+            start, end = OFFSET_PAIR.unpack_from(self._mm, self._string_offsets + 4 * string_id)
+            value = self._mm[self._blob_offset + start:self._blob_offset + end].decode('utf-8')
+            if len(self._strings) >= STRING_CACHE_LIMIT:
+                self._strings.clear()
+            self._strings[string_id] = value
+        return value
+    def _value(self, cell: int) -> Any:
+        if cell == NONE_CELL:
+            return None
+        if cell & JSON_FLAG:
+            return json.loads(self._string(cell & ~JSON_FLAG))
+        return self._string(cell)
+    def is_fresh(self, json_path: str) -> bool:
+        """원본 JSON의 크기/mtime이 스냅샷 생성 시점과 같은지 확인"""
+        try:
+            stat = os.stat(json_path)
+        except OSError:
+            return False
+        return stat.st_size == self.source_size and stat.st_mtime_ns == self.source_mtime_ns
+    def __len__(self) -> int:
+        return self.n_records
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.n_records))]
+        if index < 0:
+            index += self.n_records
+        if not 0 <= index < self.n_records:
+            raise IndexError(index)
+        cells = self._row.unpack_from(self._mm, self._records_offset + self._row.size * index)
+        return {
+            field: self._value(cell)
+            for field, cell in zip(self.fields, cells)
+            if cell != ABSENT_CELL
+        }
+    def __iter__(self) -> Iterator[Dict]:
+        n_fields = len(self.fields)
+        if not n_fields:
+            return
+        chunk_bytes = self._row.size * ITER_CHUNK_RECORDS
+        for offset in range(self._records_offset, self._blob_offset, chunk_bytes):
+            cells = array('I')
+            cells.frombytes(self._mm[offset:min(offset + chunk_bytes, self._blob_offset)])
+            if sys.byteorder == 'big':
+                cells.byteswap()
+            for start in range(0, len(cells), n_fields):
+                yield {
+                    field: self._value(cell)
+                    for field, cell in zip(self.fields, cells[start:start + n_fields])
+                    if cell != ABSENT_CELL
+                }
+            self._release_pages()
+    def _release_pages(self):
+        """
+        순회 중 읽은 mmap 페이지를 프로세스 RSS에서 내려놓음 (페이지 캐시에는 남아 다시 읽어도 디스크 I/O 없음)
+        전체 순회의 최대 RSS가 스냅샷 크기만큼 늘지 않게 한다. madvise가 없는 환경(Python 3.7 등)에서는 아무것도 하지 않음.
+        """
+        advice = getattr(mmap, 'MADV_DONTNEED', None)
+        if advice is not None and hasattr(self._mm, 'madvise'):
+            self._mm.madvise(advice)
+    def column(self, field: str) -> Iterator[Any]:
+        """과목 dict를 만들지 않고 한 필드의 값만 순회 (없는 필드는 None)"""
+        position = self.fields.index(field) if field in self.fields else -1
+        for index in range(self.n_records):
+            if position < 0:
+                yield None
+                continue
+            cell = U32.unpack_from(self._mm, self._records_offset + self._row.size * index + 4 * position)[0]
+            yield None if cell == ABSENT_CELL else self._value(cell)
+    def close(self):
+        self._mm.close()
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+class SnapshotWriter:
+    """
+    과목 dict를 하나씩 받아 스냅샷 파일을 만드는 스트리밍 기록기 (과목 목록을 메모리에 모으지 않음)
+    레코드·문자열 offset·문자열 blob을 WRITE_BUFFER_BYTES 단위로 임시 파일에 흘려 쓰고 close()에서 한 파일로 이어 붙여 교체한다.
+    중복 문자열은 최근 STRING_CACHE_LIMIT개 안에서만 합치므로 메모리는 과목 수와 무관하다
+    (그보다 작은 파일은 전체를 중복 제거한 것과 같은 크기).
+    source_path의 크기/mtime은 만들 때 재 두므로, 읽는 도중 원본이 바뀌면 스냅샷은 오래된 것으로 판정된다.
+    """
+    def __init__(self, snapshot_path: str, source_path: Optional[str] = None):
+        self.snapshot_path = snapshot_path
+        self.source_size, self.source_mtime_ns = 0, 0
+        if source_path:
+            stat = os.stat(source_path)
+            self.source_size, self.source_mtime_ns = stat.st_size, stat.st_mtime_ns
+        os.makedirs(os.path.dirname(snapshot_path) or '.', exist_ok=True)
+        prefix = f"{snapshot_path}.{os.getpid()}"
+        self._paths = [f"{prefix}.rows.tmp", f"{prefix}.offsets.tmp", f"{prefix}.blob.tmp"]
+        self._files = [open(path, 'w+b') for path in self._paths]
+        self.fields: List[str] = []
+        self._field_positions: Dict[str, int] = {}
+        self._field_ids: List[int] = []
+        self._row_keys: tuple = ()
+        self._row_positions: List[int] = []
+        self._string_ids: Dict[str, int] = {}
+        self._n_strings = 0
+        self._blob_size = 0
+        self.n_records = 0
+        # 레코드 하나 = [필드 수 n, 필드 위치 n개, 셀 n개]
+        self._rows = array('I')
+        self._offsets = array('I', [0])
+        self._blob = bytearray()
+    def _intern(self, text: str) -> int:
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            if self._n_strings >= JSON_FLAG - 2:
+                raise SnapshotError("문자열 테이블이 너무 커서 스냅샷을 만들 수 없습니다.")
+            if len(self._string_ids) >= STRING_CACHE_LIMIT:
+                self._string_ids.clear()
+            data = text.encode('utf-8')
+            self._blob_size += len(data)
+            if self._blob_size > 0xFFFFFFFF:
+                raise SnapshotError("문자열 테이블이 너무 커서 스냅샷을 만들 수 없습니다.")
+            self._blob += data
+            self._offsets.append(self._blob_size)
+            string_id = self._string_ids[text] = self._n_strings
+            self._n_strings += 1
+        return string_id
+    def _positions(self, keys: tuple) -> List[int]:
+        """과목 키 순서에 대한 필드 위치 (대부분의 과목은 키 순서가 같으므로 직전 결과를 재사용)"""
+        if keys != self._row_keys:
+            positions = []
+            for key in keys:
+                position = self._field_positions.get(key)
+                if position is None:
+                    position = self._field_positions[key] = len(self.fields)
+                    self.fields.append(key)
+                    self._field_ids.append(self._intern(key))
+                positions.append(position)
+            self._row_keys, self._row_positions = keys, positions
+        return self._row_positions
+    def add(self, course: Dict):
+        """과목 하나 기록"""
+        if not isinstance(course, dict):
+            raise SnapshotError("과목 dict의 JSON 배열만 스냅샷으로 변환할 수 있습니다.")
+        rows = self._rows
+        positions = self._positions(tuple(course))
+        rows.append(len(positions))
+        rows.extend(positions)
+        intern, encode = self._intern, _json_encoder.encode
+        for value in course.values():
+            if value is None:
+                rows.append(NONE_CELL)
+            elif isinstance(value, str):
+                rows.append(intern(value))
+            else:
+                rows.append(intern(encode(value)) | JSON_FLAG)
+        self.n_records += 1
+        if len(self._blob) + 4 * (len(rows) + len(self._offsets)) >= WRITE_BUFFER_BYTES:
+            self._flush()
+    def _flush(self):
+        for f, buffer in zip(self._files, (self._rows, self._offsets)):
+            if sys.byteorder == 'big':
+                buffer.byteswap()
+            buffer.tofile(f)
+        self._files[2].write(self._blob)
+        self._rows, self._offsets, self._blob = array('I'), array('I'), bytearray()
+    def _write_cells(self, out):
+        """[필드 수, 위치들, 셀들] 레코드를 필드 수 고정 폭 행으로 바꿔 기록 (ITER_CHUNK_RECORDS개씩)"""
+        n_fields = len(self.fields)
+        rows_file = self._files[0]
+        rows_file.seek(0)
+        cells = array('I')
+        for index in range(self.n_records):
+            length = U32.unpack(rows_file.read(4))[0]
+            record = array('I')
+            record.frombytes(rows_file.read(8 * length))
+            if sys.byteorder == 'big':
+                record.byteswap()
+            row = [ABSENT_CELL] * n_fields
+            for position, cell in zip(record[:length], record[length:]):
+                row[position] = cell
+            cells.extend(row)
+            if (index + 1) % ITER_CHUNK_RECORDS == 0 or index + 1 == self.n_records:
+                if sys.byteorder == 'big':
+                    cells.byteswap()
+                cells.tofile(out)
+                cells = array('I')
+    def close(self):
+        """임시 파일들을 스냅샷 형식으로 이어 붙여 snapshot_path로 교체"""
+        tmp_path = self.snapshot_path + '.tmp'
+        try:
+            self._flush()
+            with open(tmp_path, 'wb') as out:
+                out.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.source_size, self.source_mtime_ns,
+                                      len(self.fields), self.n_records, self._n_strings))
+                out.write(struct.pack(f'<{len(self._field_ids)}I', *self._field_ids))
+                offsets_file, blob_file = self._files[1], self._files[2]
+                offsets_file.seek(0)
+                shutil.copyfileobj(offsets_file, out)
+                self._write_cells(out)
+                blob_file.seek(0)
+                shutil.copyfileobj(blob_file, out)
+            os.replace(tmp_path, self.snapshot_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            self.abort()
+    def abort(self):
+        """임시 파일 정리 (스냅샷은 만들지 않음)"""
+        for f, path in zip(self._files, self._paths):
+            f.close()
+            if os.path.exists(path):
+                os.remove(path)
+    def __enter__(self) -> 'SnapshotWriter':
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+def write_snapshot(courses: Iterable[Dict], snapshot_path: str, source_path: Optional[str] = None):
+    """과목 dict들을 스냅샷 파일로 저장 (source_path의 크기/mtime을 헤더에 기록)"""
+    with SnapshotWriter(snapshot_path, source_path) as writer:
+        for course in courses:
+            writer.add(course)
+def convert_json_to_snapshot(json_path: str, snapshot_path: Optional[str] = None) -> str:
+    """rusaint-cli JSON 파일을 스냅샷으로 변환하고 스냅샷 경로를 반환"""
+    snapshot_path = snapshot_path or get_snapshot_path(json_path)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        courses = json.load(f)
+    write_snapshot(courses, snapshot_path, json_path)
+    return snapshot_path
+def open_fresh_snapshot(json_path: str) -> Optional[CatalogSnapshot]:
+    """원본과 일치하는 스냅샷이 있으면 열어서 반환, 없거나 오래되었으면 None"""
+    snapshot_path = get_snapshot_path(json_path)
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        snapshot = CatalogSnapshot(snapshot_path)
+    except (OSError, ValueError, struct.error, SnapshotError):
+        return None
+    if not snapshot.is_fresh(json_path):
+        snapshot.close()
+        return None
+    return snapshot
+def open_catalog(json_path: str, build: bool = True) -> Union[CatalogSnapshot, List[Dict]]:
+    """
+    과목 목록을 지연 로딩 가능한 시퀀스로 연다.
+    최신 스냅샷이 있으면 mmap 스냅샷을, 없으면 JSON을 읽고 (build=True일 때) 다음 실행을 위해 스냅샷을 만들어 둔다.
+    """
+    snapshot = open_fresh_snapshot(json_path)
+    if snapshot is not None:
+        return snapshot
+    with open(json_path, 'r', encoding='utf-8') as f:
+        courses = json.load(f)
+    if build:
+        try:
+            write_snapshot(courses, get_snapshot_path(json_path), json_path)
+        except (OSError, SnapshotError):
+            pass
+    return courses
+def load_courses(json_path: str, build: bool = True) -> List[Dict]:
+    """과목 dict 리스트로 읽기 (수정 가능한 리스트가 필요한 호출부용)"""
+    catalog = open_catalog(json_path, build)
+    if isinstance(catalog, CatalogSnapshot):
+        with catalog:
+            return list(catalog)
+    return catalog
+def main():
+    parser = argparse.ArgumentParser(description='rusaint-cli JSON → 카탈로그 스냅샷 변환')
+    parser.add_argument('json_files', nargs='+', help='변환할 JSON 파일 경로')
+    args = parser.parse_args()
+    for json_path in args.json_files:
+        try:
+            snapshot_path = convert_json_to_snapshot(json_path)
+            print(f"✅ 스냅샷 생성: {json_path} -> {snapshot_path}")
+        except (OSError, ValueError, SnapshotError) as e:
+            print(f"❌ 스냅샷 생성 실패: {json_path} - {e}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+CATEGORY_FIELDS = ('category', 'sub_category')
+CATEGORY_GROUPS = ('전필', '전선', '기타')
+KIND_SEPARATORS = ('-', '_')
+@dataclass(frozen=True)
+class CategoryEntry:
+    """category/sub_category의 항목 하나 (예: '전필-컴퓨터' → kind='전필', department='컴퓨터')"""
+    kind: str
+    department: Optional[str]
+    field: str = 'category'
+    @property
+    def group(self) -> str:
+        return classify_kind(self.kind)
+def classify_kind(kind: str) -> str:
+    """이수구분 → 전필/전선/기타 (전기는 전선으로 분류)"""
+    if not kind:
+        return "기타"
+    if kind.startswith("전필"):
+        return "전필"
+    if kind.startswith("전선") or kind.startswith("전기"):
+        return "전선"
+    return "기타"
+def parse_category(category_str: Optional[str]) -> str:
+    """category 문자열 전체를 맨 앞 이수구분 하나로 분류 (parsed_*_courses.json의 분류 기준)"""
+    return classify_kind(category_str or '')
+@lru_cache(maxsize=4096)
+def split_category(text: Optional[str]) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    '/'로 이어진 category 문자열 → ((이수구분, 학과 약칭), ...)
+    '전기-AI융합', '전공_에너지정책기술융합'처럼 구분자가 있으면 학과를 분리하고, '교필'처럼 없으면 학과는 None
+    """
+    pairs = []
+    for token in (text or '').split('/'):
+        token = token.strip()
+        if not token:
+            continue
+        cut = min((token.find(sep) for sep in KIND_SEPARATORS if sep in token), default=-1)
+        if cut > 0:
+            pairs.append((token[:cut].strip(), token[cut + 1:].strip() or None))
+        else:
+            pairs.append((token, None))
+    return tuple(pairs)
+def course_category_entries(course: Dict) -> List[CategoryEntry]:
+    """과목의 category와 sub_category를 (이수구분, 학과) 항목 목록으로 펼침"""
+    return [
+        CategoryEntry(kind, department, field)
+        for field in CATEGORY_FIELDS
+        for kind, department in split_category(course.get(field))
+    ]
+def match_department_labels(labels: Iterable[str], department: str) -> List[str]:
+    """학과 약칭 목록 중 조회 학과명(약칭, 정식 학과명, 상위 학부명)에 해당하는 약칭"""
+    from .target_parser import resolve_department_names
+    from ..utils.department_matcher import get_department_matcher
+    wanted = resolve_department_names([department])
+    matcher = get_department_matcher()
+    return [label for label in labels if label == department or wanted & matcher.match_all(label)]
+class CategoryIndex:
+    """
+    학과 → 이수구분 → 과목 id 목록 색인
+    과목 id는 add()한 순서이고 id 목록은 오름차순이라, 조회는 결과 크기에 비례하는 비용만 든다.
+    groups에는 parse_category 기준 분류(전필/전선/기타)별 id가 함께 모여 있어
+    parsed_{분류}_courses.json을 색인에서 그대로 만들 수 있다.
+    keep_courses=False면 과목 자체는 보관하지 않고 id만 센다 (과목을 흘려보내며 색인만 모을 때).
+    """
+    def __init__(self, keep_courses: bool = True):
+        self.keep_courses = keep_courses
+        self.size = 0
+        self.courses: List[Dict] = []
+        self.by_department: Dict[str, Dict[str, List[int]]] = {}
+        self.by_kind: Dict[str, List[int]] = {}
+        self.groups: Dict[str, List[int]] = {group: [] for group in CATEGORY_GROUPS}
+        self._labels: Dict[str, List[str]] = {}
+    @classmethod
+    def from_courses(cls, courses: Iterable[Dict]) -> 'CategoryIndex':
+        index = cls()
+        for course in courses:
+            index.add(course)
+        return index
+    def add(self, course: Dict) -> int:
+        course_id = self.size
+        self.size += 1
+        if self.keep_courses:
+            self.courses.append(course)
+        self.groups[parse_category(course.get('category'))].append(course_id)
+        for entry in course_category_entries(course):
+            ids = self.by_kind.setdefault(entry.kind, [])
+            if not ids or ids[-1] != course_id:
+                ids.append(course_id)
+            if entry.department is None:
+                continue
+            ids = self.by_department.setdefault(entry.department, {}).setdefault(entry.kind, [])
+            if not ids or ids[-1] != course_id:
+                ids.append(course_id)
+        self._labels.clear()
+        return course_id
+    def department_labels(self, department: str) -> List[str]:
+        """
+        조회 학과명 → 색인에 있는 학과 약칭 목록
+        약칭('컴퓨터')은 그대로 쓰고, 정식 학과명('컴퓨터학부')이나 상위 학부명('건축학부')은
+        약칭마다 학과 매칭한 결과로 찾는다.
+        """
+        if department not in self._labels:
+            self._labels[department] = match_department_labels(self.by_department, department)
+        return self._labels[department]
+    def lookup(self, department: str, kind: Optional[str] = None) -> List[int]:
+        """학과의 이수구분별 과목 id (kind가 None이면 모든 이수구분)"""
+        id_lists = []
+        for label in self.department_labels(department):
+            kinds = self.by_department[label]
+            if kind is None:
+                id_lists.extend(kinds.values())
+            elif kind in kinds:
+                id_lists.append(kinds[kind])
+        if len(id_lists) == 1:
+            return list(id_lists[0])
+        return sorted(set().union(*id_lists))
+    def find(self, department: str, kind: Optional[str] = None) -> List[Dict]:
+        """예: find('컴퓨터학부', '전필') → 컴퓨터학부 전필 과목 목록"""
+        return [self.courses[course_id] for course_id in self.lookup(department, kind)]
+    def group_courses(self, group: str) -> Iterator[Dict]:
+        """parse_category 기준 분류의 과목을 원래 순서대로"""
+        for course_id in self.groups[group]:
+            yield self.courses[course_id]
+    def merge(self, data: Dict):
+        """to_dict()로 저장한 다른 색인을 이 색인 뒤에 이어 붙임 (id는 현재 크기만큼 밀림)"""
+        offset = self.size
+        for label, kinds in data['departments'].items():
+            target = self.by_department.setdefault(label, {})
+            for kind, ids in kinds.items():
+                target.setdefault(kind, []).extend(course_id + offset for course_id in ids)
+        for kind, ids in data['kinds'].items():
+            self.by_kind.setdefault(kind, []).extend(course_id + offset for course_id in ids)
+        for group, ids in data['groups'].items():
+            self.groups.setdefault(group, []).extend(course_id + offset for course_id in ids)
+        self.size += data['size']
+        self._labels.clear()
+    def to_dict(self) -> Dict:
+        """JSON으로 저장할 수 있는 색인 (과목 id → courses 순서)"""
+        return {
+            'size': self.size,
+            'departments': self.by_department,
+            'kinds': self.by_kind,
+            'groups': self.groups
+        }
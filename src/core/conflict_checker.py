@@ -0,0 +1,166 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+from .schedule_parser import MINUTES_PER_DAY, TimeInterval, intervals_from_course_times
+WEEK_MINUTES = 7 * MINUTES_PER_DAY
+class _DayIndex:
+    """하루치 구간을 시작 시각 순으로 정렬해 둔 색인 (가장 긴 구간 길이로 탐색 범위를 제한)"""
+    __slots__ = ('starts', 'ends', 'sections', 'max_length', '_pending')
+    def __init__(self):
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.sections: List[Hashable] = []
+        self.max_length = 0
+        self._pending: List[TimeInterval] = []
+    def add(self, interval: TimeInterval):
+        self._pending.append(interval)
+        self.max_length = max(self.max_length, interval.end - interval.start)
+    def _flush(self):
+        if not self._pending:
+            return
+        rows = sorted(
+            list(zip(self.starts, self.ends, self.sections)) +
+            [(i.start, i.end, i.section) for i in self._pending],
+            key=lambda row: (row[0], row[1])
+        )
+        self.starts = [row[0] for row in rows]
+        self.ends = [row[1] for row in rows]
+        self.sections = [row[2] for row in rows]
+        self._pending = []
+    def overlapping(self, start: int, end: int) -> Iterable[Hashable]:
+        """[start, end)와 겹치는 구간의 분반 id (start > query_start - max_length 범위만 검사)"""
+        self._flush()
+        lo = bisect_right(self.starts, start - self.max_length)
+        hi = bisect_left(self.starts, end)
+        ends = self.ends
+        sections = self.sections
+        for i in range(lo, hi):
+            if ends[i] > start:
+                yield sections[i]
+class ConflictIndex:
+    """
+    분반(section) 시간표 충돌 검사 엔진
+    분반 id별 TimeInterval을 요일별 정렬 색인에 넣어 두고, 한 분반과 충돌하는 분반을
+    전체 스캔 없이 (이분 탐색 + 후보 구간만 검사) 찾는다.
+    """
+    def __init__(self):
+        self._days: Dict[int, _DayIndex] = {}
+        self._sections: Dict[Hashable, List[TimeInterval]] = {}
+    @classmethod
+    def from_courses(cls, courses: Iterable[Dict], key: Optional[str] = 'code') -> 'ConflictIndex':
+        """정규화된 과목 목록(courseTime 보유)으로 색인 생성, 분반 id는 course[key] (None이면 목록 내 위치)"""
+        index = cls()
+        for position, course in enumerate(courses):
+            section = position if key is None else course.get(key)
+            index.add_course_times(section, course.get('courseTime') or [])
+        return index
+    def __len__(self) -> int:
+        return len(self._sections)
+    def __contains__(self, section: Hashable) -> bool:
+        return section in self._sections
+    def add(self, section: Hashable, intervals: Iterable[TimeInterval]):
+        """분반의 구간들을 색인에 추가"""
+        stored = self._sections.setdefault(section, [])
+        for interval in intervals:
+            interval = TimeInterval(interval.start, interval.end, section)
+            stored.append(interval)
+            day = interval.start // MINUTES_PER_DAY
+            if day not in self._days:
+                self._days[day] = _DayIndex()
+            self._days[day].add(interval)
+    def add_course_times(self, section: Hashable, course_times: List[Dict]):
+        self.add(section, intervals_from_course_times(course_times, section))
+    def intervals(self, section: Hashable) -> List[TimeInterval]:
+        return self._sections.get(section, [])
+    def conflicts(self, intervals: Iterable[TimeInterval], exclude: Optional[Hashable] = None) -> Set[Hashable]:
+        """주어진 구간들과 겹치는 색인 내 분반 id 집합"""
+        result = set()
+        for interval in intervals:
+            day_index = self._days.get(interval.start // MINUTES_PER_DAY)
+            if day_index is None:
+                continue
+            result.update(day_index.overlapping(interval.start, interval.end))
+        result.discard(exclude)
+        return result
+    def conflicts_with_course_times(self, course_times: List[Dict]) -> Set[Hashable]:
+        return self.conflicts(intervals_from_course_times(course_times))
+    def conflicts_of(self, section: Hashable) -> Set[Hashable]:
+        """색인에 있는 분반과 충돌하는 다른 분반 id 집합"""
+        return self.conflicts(self.intervals(section), exclude=section)
+    def has_conflict(self, sections: Sequence[Hashable]) -> bool:
+        """색인에 있는 분반들끼리 서로 겹치는지 여부"""
+        return sections_overlap([self.intervals(section) for section in sections])
+    def sections(self) -> List[Hashable]:
+        """색인에 넣은 순서의 분반 id 목록"""
+        return list(self._sections)
+    def conflict_free(self, intervals: Iterable[TimeInterval],
+                      candidates: Optional[Iterable[Hashable]] = None) -> List[Hashable]:
+        """
+        주어진 구간들(예: 학생의 현재 시간표)과 겹치지 않는 분반 id 목록
+        candidates를 주면 그 분반들만 그 순서대로 검사하고, 없으면 색인 전체를 넣은 순서대로 검사한다.
+        """
+        blocked = self.conflicts(intervals)
+        return [section for section in (self._sections if candidates is None else candidates)
+                if section in self._sections and section not in blocked]
+    def slot_counts(self, slot_minutes: int = 30) -> List[int]:
+        """주간 slot_minutes분 슬롯마다 수업이 있는 분반 수 (월요일 00:00부터 WEEK_MINUTES // slot_minutes개)"""
+        counts = [0] * (WEEK_MINUTES // slot_minutes)
+        for intervals in self._sections.values():
+            slots = set()
+            for interval in intervals:
+                slots.update(range(interval.start // slot_minutes,
+                                   min((interval.end - 1) // slot_minutes + 1, len(counts))))
+            for slot in slots:
+                counts[slot] += 1
+        return counts
+CONFLICT_BACKENDS = ('auto', 'python', 'numpy')
+def get_conflict_index_class(backend: str = 'auto'):
+    """
+    충돌 검사 백엔드 선택
+    - 'python': ConflictIndex (요일별 정렬 색인)
+    - 'numpy' : SlotMatrixIndex (분반 × 주간 분 단위 비트 행렬, NumPy 필요)
+    - 'auto'  : NumPy가 설치되어 있으면 numpy, 아니면 python
+    두 백엔드는 같은 메서드와 같은 결과를 제공한다.
+    """
+    if backend not in CONFLICT_BACKENDS:
+        raise ValueError(f"지원하지 않는 충돌 검사 백엔드입니다: {backend}")
+    if backend == 'python':
+        return ConflictIndex
+    try:
+        from .slot_matrix import SlotMatrixIndex
+    except ImportError:
+        if backend == 'numpy':
+            raise
+        return ConflictIndex
+    return SlotMatrixIndex
+def build_conflict_index(courses: Iterable[Dict], key: Optional[str] = 'code', backend: str = 'auto'):
+    """선택한 백엔드로 과목 목록의 충돌 색인 생성 (ConflictIndex.from_courses와 같은 인자)"""
+    return get_conflict_index_class(backend).from_courses(courses, key)
+def _sweep(groups: Sequence[Sequence[TimeInterval]]) -> List[Tuple[int, int, int]]:
+    """(start, end, 분반 인덱스) 이벤트를 시작 시각 순으로 정렬"""
+    return sorted(
+        (interval.start, interval.end, group)
+        for group, intervals in enumerate(groups) for interval in intervals
+    )
+def sections_overlap(groups: Sequence[Sequence[TimeInterval]]) -> bool:
+    """
+    N개 분반(각각 구간 목록)이 서로 겹치는지 검사 - 시작 시각 정렬 후 한 번 훑기 O(M log M)
+    같은 분반 안의 구간끼리는 충돌로 보지 않는다.
+    """
+    active: List[Tuple[int, int]] = []
+    for start, end, group in _sweep(groups):
+        active = [(active_end, active_group) for active_end, active_group in active if active_end > start]
+        if any(active_group != group for _, active_group in active):
+            return True
+        active.append((end, group))
+    return False
+def find_conflicting_pairs(groups: Sequence[Sequence[TimeInterval]]) -> Set[Tuple[int, int]]:
+    """서로 겹치는 분반 쌍 (groups의 인덱스, 작은 쪽이 앞)"""
+    pairs = set()
+    active: List[Tuple[int, int]] = []
+    for start, end, group in _sweep(groups):
+        active = [(active_end, active_group) for active_end, active_group in active if active_end > start]
+        for _, active_group in active:
+            if active_group != group:
+                pairs.add((min(group, active_group), max(group, active_group)))
+        active.append((end, group))
+    return pairs
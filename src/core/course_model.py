@@ -0,0 +1,221 @@
+import os
+import argparse
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .catalog_paths import list_source_files
+POOL_SIZE_LIMIT = 1 << 20
+SHARE_SAMPLE = 256
+PLAIN_KEY_TYPES = frozenset((str, int, type(None)))
+class RecordShape:
+    """
+    같은 키 구성(순서 포함)을 가진 레코드들이 공유하는 키 목록과 키 → 위치 표
+    lookups/hits는 이 구성의 레코드를 풀에서 찾은 횟수와 기존 객체를 재사용한 횟수 (공유 여부 판단용)
+    """
+    __slots__ = ('keys', 'positions', 'lookups', 'hits')
+    def __init__(self, keys: Tuple[str, ...]):
+        self.keys = keys
+        self.positions = {key: i for i, key in enumerate(keys)}
+        self.lookups = 0
+        self.hits = 0
+    @property
+    def worth_sharing(self) -> bool:
+        """처음 SHARE_SAMPLE개를 본 뒤 재사용률이 절반 미만이면 공유하지 않음 (courseTime처럼 거의 겹치지 않는 레코드)"""
+        return self.lookups < SHARE_SAMPLE or self.hits * 2 >= self.lookups
+class Record(Mapping):
+    """
+    읽기 전용 dict 대용 레코드 (키 구성은 RecordShape로 공유하고 값만 튜플로 보관)
+    course['name'], course.get('courseTime'), dict(course), 'target' in course 등 dict 읽기 방식을 그대로 지원하고,
+    to_dict()로 원래 JSON dict를 손실 없이 돌려준다. 중첩된 dict는 Record, 리스트는 튜플로 보관된다.
+    """
+    __slots__ = ('_shape', '_values')
+    def __init__(self, shape: RecordShape, values: Tuple):
+        self._shape = shape
+        self._values = values
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._shape.positions[key]]
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self._shape.positions.get(key)
+        return default if position is None else self._values[position]
+    def __contains__(self, key) -> bool:
+        return key in self._shape.positions
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape.keys)
+    def __len__(self) -> int:
+        return len(self._shape.keys)
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Record):
+            return self._shape.keys == other._shape.keys and self._values == other._values
+        return NotImplemented
+    def __hash__(self) -> int:
+        return hash((self._shape.keys, self._values))
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+    def to_dict(self) -> Dict:
+        return {key: thaw(value) for key, value in zip(self._shape.keys, self._values)}
+class Course(Record):
+    """과목 레코드 (정규화된 과목 dict와 같은 키/값, 문자열·학년/학과 해석·교수 목록은 StringPool로 공유)"""
+    __slots__ = ()
+def thaw(value: Any) -> Any:
+    """Record/튜플로 보관한 값을 JSON dict/리스트로 되돌림"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+def pool_key(value: Any) -> Any:
+    """
+    풀 조회 키: 값과 함께 타입까지 비교하는 키
+    True == 1 == 1.0, 0.0 == -0.0처럼 ==와 hash가 같은 값을 한 객체로 합치면 to_dict() 결과가 바뀌므로
+    bool과 실수에는 타입을 붙인다. 문자열·정수·None과 그런 값만 담은 튜플/레코드는 서로 같을 수 없으므로 값 자체를 키로 쓴다
+    (타입을 붙인 키는 첫 항목이 타입 객체라 이런 값과 겹치지 않음).
+    """
+    value_type = type(value)
+    if value_type in PLAIN_KEY_TYPES:
+        return value
+    if value_type is tuple:
+        if set(map(type, value)) <= PLAIN_KEY_TYPES:
+            return value
+        return (tuple, tuple(map(pool_key, value)))
+    if value_type is float:
+        return (float, value.hex())
+    if value_type is bool or not isinstance(value, Record):
+        return (value_type, value)
+    if set(map(type, value._values)) <= PLAIN_KEY_TYPES:
+        return value
+    return (value_type, value._shape.keys, tuple(map(pool_key, value._values)))
+def to_json(value: Any) -> Any:
+    """json.dump에 넘길 수 있는 값으로 변환 (Course/Record가 아닌 값은 그대로)"""
+    if isinstance(value, (Record, tuple)):
+        return thaw(value)
+    if isinstance(value, list):
+        return [to_json(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    return value
+class StringPool:
+    """
+    여러 파일·학기에 걸쳐 같은 값을 한 객체로 공유하는 풀
+    - 문자열, 실수(학점/시간), 해시 가능한 튜플(교수 목록 등)과 중첩 레코드(targetInfo 등)를 값 단위로 공유
+    - 키 구성(RecordShape)도 공유하므로 과목마다 키 문자열/해시 테이블을 따로 갖지 않는다
+    - 재사용률이 낮은 레코드 구성과 레코드를 담은 튜플은 풀에 넣지 않는다 (풀 항목 자체도 메모리를 쓰므로)
+    풀이 POOL_SIZE_LIMIT를 넘으면 비운다 (이미 만든 레코드는 그대로 유효하고, 이후 값만 새로 공유).
+    실수·튜플·레코드는 pool_key(값과 타입)로 찾으므로 True/1/1.0이나 0.0/-0.0이 서로 바뀌지 않는다.
+    """
+    def __init__(self):
+        self._strings: Dict[str, str] = {}
+        self._numbers: Dict[str, float] = {}
+        self._tuples: Dict[Tuple, Tuple] = {}
+        self._records: Dict[Tuple, Record] = {}
+        self._shapes: Dict[Tuple[str, ...], RecordShape] = {}
+    def __len__(self) -> int:
+        return len(self._strings) + len(self._numbers) + len(self._tuples) + len(self._records)
+    @staticmethod
+    def _share(table: Dict, value: Any, key: Any = None) -> Any:
+        """key(기본: 값 자체)로 찾아 이미 있는 객체를 돌려주고, 없으면 value를 등록"""
+        if key is None:
+            key = value
+        shared = table.get(key)
+        if shared is None:
+            if len(table) >= POOL_SIZE_LIMIT:
+                table.clear()
+            table[key] = shared = value
+        return shared
+    def shape(self, keys: Tuple[str, ...]) -> RecordShape:
+        shape = self._shapes.get(keys)
+        if shape is None:
+            keys = tuple(self._share(self._strings, key) for key in keys)
+            self._shapes[keys] = shape = RecordShape(keys)
+        return shape
+    def freeze(self, value: Any) -> Any:
+        """JSON 값 → 공유 가능한 불변 값 (dict → Record, list → tuple)"""
+        if isinstance(value, str):
+            return self._share(self._strings, value)
+        if isinstance(value, float):
+            return self._share(self._numbers, value, value.hex())
+        if isinstance(value, dict):
+            return self.record(value)
+        if isinstance(value, list):
+            frozen = tuple(self.freeze(item) for item in value)
+            if any(isinstance(item, (Record, tuple)) for item in frozen):
+                return frozen
+            return self._share(self._tuples, frozen, pool_key(frozen))
+        return value
+    def record(self, data: Dict, record_type: type = Record, share: bool = True) -> Record:
+        """dict → Record (share=True면 키 구성과 값이 모두 같은 레코드는 한 객체를 공유)"""
+        shape = self.shape(tuple(data))
+        record = record_type(shape, tuple(self.freeze(value) for value in data.values()))
+        if not share or not shape.worth_sharing:
+            return record
+        shape.lookups += 1
+        key = pool_key(record)
+        shared = self._records.get(key)
+        if shared is not None:
+            shape.hits += 1
+            return shared
+        if len(self._records) >= POOL_SIZE_LIMIT:
+            self._records.clear()
+        self._records[key] = record
+        return record
+    def course(self, data: Dict) -> Course:
+        """과목 dict → Course (과목 자체는 거의 겹치지 않으므로 공유하지 않음)"""
+        return self.record(data, Course, share=False)
+class Catalog(Sequence):
+    """
+    Course 목록 (여러 파일·학기를 하나의 StringPool로 묶어 보관)
+    add_file/add_folder로 정규화 스토어를 읽어 들이고, to_dicts()로 원래 과목 dict 목록을 돌려준다.
+    """
+    def __init__(self, pool: Optional[StringPool] = None):
+        self.pool = pool if pool is not None else StringPool()
+        self.courses: List[Course] = []
+    def __len__(self) -> int:
+        return len(self.courses)
+    def __getitem__(self, index):
+        return self.courses[index]
+    def __iter__(self) -> Iterator[Course]:
+        return iter(self.courses)
+    def add(self, course: Dict) -> Course:
+        record = course if isinstance(course, Course) else self.pool.course(course)
+        self.courses.append(record)
+        return record
+    def extend(self, courses: Iterable[Dict]):
+        for course in courses:
+            self.add(course)
+    def add_file(self, json_path: str) -> int:
+        """원본 JSON 하나의 정규화된 과목을 추가하고 추가한 과목 수 반환"""
+        from .ingest import open_canonical
+        before = len(self.courses)
+        self.extend(open_canonical(json_path))
+        return len(self.courses) - before
+    def add_folder(self, folder_path: str) -> int:
+        """학기 폴더의 모든 원본 파일 추가"""
+        return sum(self.add_file(os.path.join(folder_path, filename)) for filename in list_source_files(folder_path))
+    def to_dicts(self) -> List[Dict]:
+        return [course.to_dict() for course in self.courses]
+def load_catalog(folder_paths: Sequence[str], pool: Optional[StringPool] = None) -> Catalog:
+    """여러 학기 폴더를 하나의 Catalog로 읽기 (학기 간에도 문자열과 레코드를 공유)"""
+    catalog = Catalog(pool)
+    for folder_path in folder_paths:
+        catalog.add_folder(folder_path)
+    return catalog
+def main():
+    parser = argparse.ArgumentParser(description='Catalog(Course 레코드) 메모리 사용량 확인')
+    parser.add_argument('folders', nargs='+', help='학기 폴더 (예: result/2025_1)')
+    args = parser.parse_args()
+    import tracemalloc
+    from .ingest import load_canonical
+    tracemalloc.start()
+    dicts = [course for folder in args.folders for filename in list_source_files(folder)
+             for course in load_canonical(os.path.join(folder, filename))]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    del dicts
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    catalog = load_catalog(args.folders)
+    catalog_bytes = tracemalloc.get_traced_memory()[0] - start
+    print(f"📊 과목 {len(catalog):,}개")
+    print(f"  dict 목록: {dict_bytes / 1e6:.1f}MB")
+    print(f"  Catalog  : {catalog_bytes / 1e6:.1f}MB (공유 값 {len(catalog.pool):,}개)")
+    if catalog_bytes:
+        print(f"  절감 비율: {dict_bytes / catalog_bytes:.1f}x")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import json
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from .catalog_paths import discover_semesters, get_cache_dir, list_source_files, parse_semester_name, source_signature
+from .category_parser import CategoryIndex, course_category_entries, match_department_labels
+from .course_model import Catalog, Course, StringPool
+from .search_index import SEARCH_FIELDS, extract_grams, normalize_text
+from ..utils.json_writer import write_json_atomic
+from ..utils.profiling import count, span
+SemesterKey = Tuple[int, int]
+SUMMARY_VERSION = 1
+SUMMARY_FILE_NAME = 'partition_summary.json'
+SUMMARY_GRAM_SIZES = (1, 2)
+def semester_label(key: SemesterKey) -> str:
+    """(2025, 1) → '2025_1'"""
+    return f"{key[0]}_{key[1]}"
+def parse_semester_key(text: Optional[str]) -> Optional[SemesterKey]:
+    """'2025_1' 또는 '2025-1' → (2025, 1), 비어 있으면 None (범위의 한쪽 끝을 열어 둠)"""
+    if not text:
+        return None
+    key = parse_semester_name(text.replace('-', '_'))
+    if key is None:
+        raise ValueError(f"학기는 '2025_1' 형식이어야 합니다: {text}")
+    return key
+def in_range(key: SemesterKey, start: Optional[SemesterKey] = None, end: Optional[SemesterKey] = None) -> bool:
+    return (start is None or key >= start) and (end is None or key <= end)
+class PartitionSummary:
+    """
+    학기 파티션을 적재하지 않고도 질의 대상에서 뺄 수 있게 하는 작은 요약 ({폴더}/.cache/partition_summary.json)
+    - grams: 과목명/교수명/학과명의 1·2글자 조각 집합 (키워드의 조각이 하나라도 없으면 그 학기에는 일치 과목이 없음)
+    - labels: category/sub_category의 학과 약칭 → 이수구분 목록
+    원본 서명(크기/mtime)이 바뀌면 무효가 되고 파티션을 다시 적재할 때 새로 만든다.
+    """
+    def __init__(self, sources: Dict[str, List[int]], courses: int, grams: Set[str], labels: Dict[str, List[str]]):
+        self.sources = sources
+        self.courses = courses
+        self.grams = grams
+        self.labels = labels
+    @classmethod
+    def from_courses(cls, sources: Dict[str, List[int]], courses: Sequence[Course]) -> 'PartitionSummary':
+        grams: Set[str] = set()
+        labels: Dict[str, Set[str]] = {}
+        for course in courses:
+            for field in SEARCH_FIELDS:
+                grams |= extract_grams(normalize_text(course.get(field)), SUMMARY_GRAM_SIZES)
+            for entry in course_category_entries(course):
+                if entry.department is not None:
+                    labels.setdefault(entry.department, set()).add(entry.kind)
+        return cls(sources, len(courses), grams, {label: sorted(kinds) for label, kinds in labels.items()})
+    @classmethod
+    def load(cls, folder_path: str) -> Optional['PartitionSummary']:
+        try:
+            with open(os.path.join(get_cache_dir(folder_path), SUMMARY_FILE_NAME), encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != SUMMARY_VERSION:
+            return None
+        return cls(data['sources'], data['courses'], set(data['grams']), data['labels'])
+    def save(self, folder_path: str):
+        os.makedirs(get_cache_dir(folder_path), exist_ok=True)
+        write_json_atomic(os.path.join(get_cache_dir(folder_path), SUMMARY_FILE_NAME), {
+            'version': SUMMARY_VERSION,
+            'sources': self.sources,
+            'courses': self.courses,
+            'grams': sorted(self.grams),
+            'labels': self.labels
+        }, indent=None)
+    def may_contain(self, keyword: str) -> bool:
+        """검색 필드 중 하나에 keyword가 들어 있는 과목이 있을 수 있는지 (False면 확실히 없음)"""
+        normalized = normalize_text(keyword)
+        size = min(len(normalized), SUMMARY_GRAM_SIZES[-1])
+        return not normalized or extract_grams(normalized, (size,)) <= self.grams
+    def may_have_category(self, department: str, kind: Optional[str] = None) -> bool:
+        """학과의 (kind) 이수구분 과목이 있을 수 있는지"""
+        return any(kind is None or kind in self.labels[label]
+                   for label in match_department_labels(self.labels, department))
+class Partition:
+    """
+    한 학기(연도, 학기)의 과목 (Course 레코드, 문자열·중첩 값은 저장소 전체가 공유하는 StringPool 사용)
+    검색용 정규화 텍스트와 category 색인은 처음 질의할 때 만든다.
+    """
+    def __init__(self, key: SemesterKey, folder_path: str, pool: StringPool):
+        self.key = key
+        self.folder_path = folder_path
+        files = list_source_files(folder_path)
+        self.signature = source_signature(folder_path, files)
+        self.catalog = Catalog(pool)
+        for filename in files:
+            self.catalog.add_file(os.path.join(folder_path, filename))
+        self.summary = PartitionSummary.from_courses(self.signature, self.catalog)
+        self._texts: Optional[List[Tuple[str, ...]]] = None
+        self._categories: Optional[CategoryIndex] = None
+        self._lock = threading.Lock()
+    def __len__(self) -> int:
+        return len(self.catalog)
+    @property
+    def label(self) -> str:
+        return semester_label(self.key)
+    def is_stale(self) -> bool:
+        return source_signature(self.folder_path, list_source_files(self.folder_path)) != self.signature
+    def texts(self) -> List[Tuple[str, ...]]:
+        """과목별 정규화된 (과목명, 교수명, 학과명), 문자열은 풀에서 공유"""
+        with self._lock:
+            if self._texts is None:
+                pool = self.catalog.pool
+                self._texts = [
+                    tuple(pool.freeze(normalize_text(course.get(field))) for field in SEARCH_FIELDS)
+                    for course in self.catalog
+                ]
+            return self._texts
+    def categories(self) -> CategoryIndex:
+        with self._lock:
+            if self._categories is None:
+                self._categories = CategoryIndex.from_courses(self.catalog)
+            return self._categories
+    def search(self, keyword: str, fields: Sequence[str] = SEARCH_FIELDS, exact: bool = False) -> List[Course]:
+        """필드 중 하나에 keyword가 들어 있는(exact=True면 같은) 과목 (원래 순서)"""
+        normalized = normalize_text(keyword)
+        offsets = [SEARCH_FIELDS.index(field) for field in fields]
+        if exact:
+            return [course for course, text in zip(self.catalog, self.texts())
+                    if any(text[offset] == normalized for offset in offsets)]
+        return [course for course, text in zip(self.catalog, self.texts())
+                if any(normalized in text[offset] for offset in offsets)]
+class QueryPlan:
+    """학기 범위 질의에서 실제로 읽을 파티션과 가지치기된 파티션 (이유별)"""
+    def __init__(self):
+        self.scanned: List[SemesterKey] = []
+        self.pruned_range: List[SemesterKey] = []
+        self.pruned_summary: List[SemesterKey] = []
+    def describe(self) -> str:
+        total = len(self.scanned) + len(self.pruned_range) + len(self.pruned_summary)
+        return (f"파티션 {total}개 중 {len(self.scanned)}개 조회 "
+                f"(범위 밖 {len(self.pruned_range)}개, 요약으로 제외 {len(self.pruned_summary)}개)")
+class HistoryStore:
+    """
+    여러 학기 카탈로그를 (연도, 학기) 파티션으로 나눠 보관하는 저장소
+    - 파티션은 처음 필요할 때 적재하고, 모든 파티션이 StringPool 하나를 공유해 학기 간 같은 문자열·교수 목록·
+      targetInfo 등은 한 번만 메모리에 둔다 (학기 16개가 16배의 메모리를 쓰지 않음)
+    - 범위 질의는 범위 밖 파티션을 열지 않고, 범위 안이라도 파티션 요약으로 일치 과목이 없음을 알 수 있으면 적재하지 않는다
+    - 원본이 바뀐 파티션은 다음 조회 때 다시 적재한다
+    """
+    def __init__(self, result_dir: str = 'result', pool: Optional[StringPool] = None):
+        self.result_dir = result_dir
+        self.pool = pool if pool is not None else StringPool()
+        self.partitions: Dict[SemesterKey, Partition] = {}
+        self._lock = threading.Lock()
+    def keys(self) -> List[SemesterKey]:
+        """원본 파일이 있는 모든 학기 (오래된 순)"""
+        return [parse_semester_name(name) for name in discover_semesters(self.result_dir)]
+    def folder(self, key: SemesterKey) -> str:
+        return os.path.join(self.result_dir, semester_label(key))
+    def partition(self, key: SemesterKey) -> Partition:
+        """파티션 (없거나 원본이 바뀌었으면 적재)"""
+        with self._lock:
+            partition = self.partitions.get(key)
+            if partition is None or partition.is_stale():
+                with span('history.load_partition'):
+                    partition = Partition(key, self.folder(key), self.pool)
+                partition.summary.save(partition.folder_path)
+                self.partitions[key] = partition
+                count('history.partitions_loaded')
+            return partition
+    def unload(self, key: SemesterKey):
+        """파티션을 메모리에서 내림 (공유 풀의 값은 다른 파티션이 계속 사용)"""
+        with self._lock:
+            self.partitions.pop(key, None)
+    def summary(self, key: SemesterKey) -> Optional[PartitionSummary]:
+        """적재된 파티션의 요약, 아니면 원본과 일치하는 디스크 요약 (없으면 None)"""
+        partition = self.partitions.get(key)
+        if partition is not None and not partition.is_stale():
+            return partition.summary
+        folder_path = self.folder(key)
+        summary = PartitionSummary.load(folder_path)
+        if summary is None or summary.sources != source_signature(folder_path, list_source_files(folder_path)):
+            return None
+        return summary
+    def plan(self, start: Optional[SemesterKey] = None, end: Optional[SemesterKey] = None,
+             keyword: Optional[str] = None, department: Optional[str] = None, kind: Optional[str] = None) -> QueryPlan:
+        """범위와 파티션 요약으로 읽을 파티션 결정 (요약이 없는 파티션은 읽음)"""
+        plan = QueryPlan()
+        for key in self.keys():
+            if not in_range(key, start, end):
+                plan.pruned_range.append(key)
+                continue
+            if keyword is not None or department is not None:
+                summary = self.summary(key)
+                if summary is not None and (
+                        (keyword is not None and not summary.may_contain(keyword))
+                        or (department is not None and not summary.may_have_category(department, kind))):
+                    plan.pruned_summary.append(key)
+                    continue
+            plan.scanned.append(key)
+        count('history.partitions_pruned', len(plan.pruned_range) + len(plan.pruned_summary))
+        return plan
+    def search(self, keyword: str, start: Optional[SemesterKey] = None, end: Optional[SemesterKey] = None,
+               fields: Sequence[str] = SEARCH_FIELDS, exact: bool = False,
+               plan: Optional[QueryPlan] = None) -> Iterator[Tuple[SemesterKey, Course]]:
+        """학기 범위에서 keyword가 들어 있는 과목을 (학기, 과목)으로 오래된 학기부터"""
+        plan = plan or self.plan(start, end, keyword=keyword)
+        for key in plan.scanned:
+            with span('history.search'):
+                matches = self.partition(key).search(keyword, fields, exact)
+            for course in matches:
+                yield key, course
+    def professors(self, course_name: str, start: Optional[SemesterKey] = None, end: Optional[SemesterKey] = None,
+                   exact: bool = False, plan: Optional[QueryPlan] = None) -> Dict[SemesterKey, List[str]]:
+        """학기별로 과목명에 course_name이 들어 있는(exact=True면 같은) 과목을 가르친 교수 (예: 2020~2025 자료구조 담당 교수)"""
+        taught: Dict[SemesterKey, Set[str]] = {}
+        for key, course in self.search(course_name, start, end, ('name',), exact, plan):
+            taught.setdefault(key, set()).update(course.get('professors') or ())
+        return {key: sorted(names) for key, names in taught.items()}
+    def category_history(self, department: str, kind: Optional[str] = None, start: Optional[SemesterKey] = None,
+                         end: Optional[SemesterKey] = None,
+                         plan: Optional[QueryPlan] = None) -> Dict[SemesterKey, List[str]]:
+        """
+        학기별 학과의 (kind) 이수구분 과목명 목록 (예: 컴퓨터학부 전필)
+        범위 안인데 해당 과목이 없어 가지치기된 학기도 빈 목록으로 포함한다.
+        """
+        plan = plan or self.plan(start, end, department=department, kind=kind)
+        history = {key: [] for key in sorted(plan.scanned + plan.pruned_summary)}
+        for key in plan.scanned:
+            with span('history.category'):
+                courses = self.partition(key).categories().find(department, kind)
+            history[key] = sorted({course.get('name') for course in courses if course.get('name')})
+        return history
+    def stats(self) -> Dict:
+        return {
+            'partitions': [semester_label(key) for key in sorted(self.partitions)],
+            'courses': sum(len(partition) for partition in self.partitions.values()),
+            'sharedValues': len(self.pool)
+        }
+def category_changes(history: Dict[SemesterKey, List[str]]) -> List[Dict]:
+    """category_history 결과 → 학기별 과목 수와 직전 학기 대비 추가/제외된 과목명"""
+    changes = []
+    previous: Optional[Set[str]] = None
+    for key in sorted(history):
+        names = set(history[key])
+        changes.append({
+            'semester': semester_label(key),
+            'courses': sorted(names),
+            'added': sorted(names - previous) if previous is not None else [],
+            'removed': sorted(previous - names) if previous is not None else []
+        })
+        previous = names
+    return changes
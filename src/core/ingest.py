@@ -0,0 +1,230 @@
+import os
+import re
+import struct
+import sys
+import argparse
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from .catalog_paths import get_cache_dir, list_source_files
+from .catalog_snapshot import CatalogSnapshot, SnapshotError, SnapshotWriter, open_catalog, open_fresh_snapshot
+from .schedule_parser import parse_schedule_entry, parse_schedule_entry_regex, tokenize_schedule
+from .target_parser import parse_target
+from ..utils.json_reader import iter_json_array
+from ..utils.profiling import count, get_profiler, span, timed_iter
+CANONICAL_DIR_NAME = 'canonical'
+CANONICAL_FIELDS = ('targetInfo', 'courseTime')
+TABLE_PREFIX_PATTERN = re.compile(r'^SALV_WD_TABLE\.[^:]+:VIEW_TABLE\.[A-Z_]+_SALV_WD_CE\.')
+def get_canonical_path(json_path: str) -> str:
+    """원본 JSON에 대응하는 정규화 스토어 경로 ({폴더}/.cache/canonical/{파일명}.snap)"""
+    folder_path, filename = os.path.split(json_path)
+    return os.path.join(get_cache_dir(folder_path), CANONICAL_DIR_NAME, filename + '.snap')
+def strip_table_prefix(value: Optional[str]) -> Optional[str]:
+    """u-saint 테이블 셀 id 접두어(SALV_WD_TABLE...SALV_WD_CE.) 제거"""
+    if not isinstance(value, str):
+        return value
+    return TABLE_PREFIX_PATTERN.sub('', value)
+def parse_int(value) -> Optional[int]:
+    """'1,434' 같은 숫자 문자열을 int로 변환 (변환 불가 시 None)"""
+    if isinstance(value, int):
+        return value
+    if not value:
+        return None
+    try:
+        return int(str(value).replace(',', '').strip())
+    except ValueError:
+        return None
+def parse_time_points(value: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """'4.0/3.0' (시간/학점) → (4.0, 3.0)"""
+    if not value or '/' not in value:
+        return None, None
+    hours, credits = value.split('/', 1)
+    try:
+        return float(hours), float(credits)
+    except ValueError:
+        return None, None
+def parse_course_code(code) -> int:
+    try:
+        return int(code) if code else 0
+    except (ValueError, TypeError):
+        return 0
+def normalize_course(course: Dict) -> Dict:
+    """
+    rusaint-cli 원본 과목 dict를 정규화된 과목 dict로 변환
+    - code 접두어 제거, schedule_room → courseTime, professor 줄바꿈 분리(professors),
+      time_points → hours/credits, personeel/remaining_seats → int, target → targetInfo(학년/학과/제한 해석)
+    이미 정규화된 과목(courseTime 보유)을 넣어도 결과가 같다.
+    """
+    normalized = {k: v for k, v in course.items() if k != 'schedule_room'}
+    if 'code' in normalized:
+        normalized['code'] = strip_table_prefix(normalized['code'])
+    for key in ('personeel', 'remaining_seats'):
+        if key in normalized:
+            normalized[key] = parse_int(normalized[key])
+    professor = normalized.get('professor') or ''
+    normalized['professors'] = [name.strip() for name in professor.split('\n') if name.strip()]
+    normalized['hours'], normalized['credits'] = parse_time_points(normalized.get('time_points'))
+    normalized['targetInfo'] = parse_target(normalized.get('target') or '').to_dict()
+    if 'schedule_room' in course or 'courseTime' not in course:
+        course_code = parse_course_code(normalized.get('code'))
+        normalized['courseTime'] = [
+            {
+                'week': week,
+                'startTime': start_time,
+                'endTime': end_time,
+                'classroom': classroom,
+                'courseCode': course_code
+            }
+            for week, start_time, end_time, classroom in tokenize_schedule(course.get('schedule_room') or '')
+        ]
+    else:
+        normalized['courseTime'] = normalized.pop('courseTime')
+    return normalized
+def normalize_courses(courses: Sequence[Dict]) -> List[Dict]:
+    """과목 목록 전체 정규화"""
+    return [normalize_course(course) for course in courses]
+def profile_course_parsers(course: Dict):
+    """
+    프로파일링용: 과목 하나의 시간표/target 해석을 단계별로 먼저 재어 둔다
+    두 해석 모두 원본 문자열로 메모이즈되므로 이어지는 normalize_course는 캐시를 쓴다.
+    """
+    with span('ingest.schedule_parse'):
+        tokenize_schedule(course.get('schedule_room') or '')
+    with span('ingest.target_parse'):
+        parse_target(course.get('target') or '')
+def iter_raw_courses(json_path: str) -> Iterator[Dict]:
+    """원본 과목을 하나씩 읽기 (최신 원본 스냅샷이 있으면 그것을, 없으면 JSON을 조각 단위로 해석)"""
+    snapshot = open_fresh_snapshot(json_path)
+    if snapshot is None:
+        yield from iter_json_array(json_path)
+        return
+    with snapshot:
+        yield from snapshot
+def iter_ingest(json_path: str) -> Iterator[Dict]:
+    """
+    원본 JSON을 과목 단위로 읽어 정규화하며 돌려주고, 같은 흐름으로 정규화 스토어를 기록한다
+    파일 전체를 메모리에 올리지 않으므로 메모리는 과목 수와 무관하다.
+    끝까지 읽었을 때만 스토어가 완성되며, 중간에 멈추거나 오류가 나면 임시 파일만 지운다.
+    """
+    profiling = get_profiler() is not None
+    writer = None
+    try:
+        writer = SnapshotWriter(get_canonical_path(json_path), json_path)
+    except FileNotFoundError:
+        raise
+    except (OSError, SnapshotError) as e:
+        print(f"⚠️ 정규화 스토어 저장 실패: {json_path} - {e}")
+    n_courses = 0
+    try:
+        for raw_course in timed_iter('ingest.read_json', iter_raw_courses(json_path)):
+            with span('ingest.normalize'):
+                if profiling:
+                    profile_course_parsers(raw_course)
+                course = normalize_course(raw_course)
+            if writer is not None:
+                try:
+                    with span('ingest.write_snapshot'):
+                        writer.add(course)
+                except (OSError, SnapshotError) as e:
+                    print(f"⚠️ 정규화 스토어 저장 실패: {json_path} - {e}")
+                    writer.abort()
+                    writer = None
+            n_courses += 1
+            yield course
+        if writer is not None:
+            try:
+                with span('ingest.write_snapshot'):
+                    writer.close()
+            except (OSError, SnapshotError) as e:
+                print(f"⚠️ 정규화 스토어 저장 실패: {json_path} - {e}")
+            writer = None
+    finally:
+        if writer is not None:
+            writer.abort()
+        count('ingest.courses', n_courses)
+def ingest_file(json_path: str) -> List[Dict]:
+    """원본 JSON 하나를 정규화하여 스토어에 기록하고 정규화된 과목 목록을 반환"""
+    return list(iter_ingest(json_path))
+def open_canonical_snapshot(json_path: str) -> Optional[CatalogSnapshot]:
+    """원본과 일치하는 정규화 스토어가 있으면 열어서 반환, 없거나 오래되었으면 None"""
+    canonical_path = get_canonical_path(json_path)
+    if not os.path.exists(canonical_path):
+        return None
+    with span('ingest.open_snapshot'):
+        try:
+            snapshot = CatalogSnapshot(canonical_path)
+        except (OSError, ValueError, struct.error, SnapshotError):
+            return None
+        if not snapshot.is_fresh(json_path) or (len(snapshot) and not set(CANONICAL_FIELDS).issubset(snapshot.fields)):
+            snapshot.close()
+            return None
+    return snapshot
+def open_canonical(json_path: str) -> Union[CatalogSnapshot, List[Dict]]:
+    """
+    정규화된 과목 목록을 연다.
+    원본과 일치하는 스토어가 있으면 그대로 읽고(시간표 파싱 없음), 없거나 오래되었으면 다시 정규화한다.
+    """
+    snapshot = open_canonical_snapshot(json_path)
+    if snapshot is not None:
+        return snapshot
+    return ingest_file(json_path)
+def iter_canonical(json_path: str) -> Iterator[Dict]:
+    """
+    정규화된 과목을 하나씩 읽기 (open_canonical의 스트리밍 버전)
+    스토어가 최신이면 스냅샷을, 아니면 원본을 과목 단위로 정규화하며 스토어를 새로 기록한다.
+    """
+    snapshot = open_canonical_snapshot(json_path)
+    if snapshot is None:
+        yield from iter_ingest(json_path)
+        return
+    with snapshot:
+        yield from snapshot
+def load_canonical(json_path: str) -> List[Dict]:
+    """정규화된 과목 dict 리스트로 읽기"""
+    catalog = open_canonical(json_path)
+    if isinstance(catalog, CatalogSnapshot):
+        with catalog:
+            return list(catalog)
+    return catalog
+def verify_schedule_tokenizer(json_paths: List[str]) -> List[str]:
+    """
+    골든 검증: 모든 schedule_room에 대해 토크나이저 결과가 기존 정규식 파서와 동일한지 확인
+    불일치한 원본 문자열 목록을 반환한다.
+    """
+    mismatches = []
+    for json_path in json_paths:
+        for course in open_catalog(json_path, build=False):
+            schedule_room = course.get('schedule_room')
+            if schedule_room is None:
+                continue
+            if parse_schedule_entry(schedule_room) != parse_schedule_entry_regex(schedule_room):
+                mismatches.append(schedule_room)
+    return mismatches
+def main():
+    parser = argparse.ArgumentParser(description='rusaint-cli 원본 JSON 정규화(ingest)')
+    parser.add_argument('paths', nargs='+', help='원본 JSON 파일 또는 학기 폴더 (예: result/2025_1)')
+    parser.add_argument('--verify-schedule', action='store_true',
+                        help='정규화 대신 시간표 토크나이저를 기존 정규식 파서와 비교 (골든 검증)')
+    args = parser.parse_args()
+    json_paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            json_paths.extend(os.path.join(path, f) for f in list_source_files(path))
+        else:
+            json_paths.append(path)
+    if args.verify_schedule:
+        mismatches = verify_schedule_tokenizer(json_paths)
+        if mismatches:
+            print(f"❌ 시간표 파서 불일치 {len(mismatches)}건")
+            for schedule_room in mismatches[:10]:
+                print(f"  {schedule_room!r}")
+            sys.exit(1)
+        print("✅ 시간표 토크나이저 결과가 정규식 파서와 모두 일치합니다.")
+        return
+    for json_path in json_paths:
+        try:
+            courses = ingest_file(json_path)
+            total_times = sum(len(course['courseTime']) for course in courses)
+            print(f"✅ 정규화 완료: {json_path} ({len(courses)}개 과목, 시간표 {total_times}개)")
+        except Exception as e:
+            print(f"❌ 정규화 실패: {json_path} - {e}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+from .catalog_paths import discover_semesters, list_source_files, major_source_candidates, source_signature
+from .search_index import SEARCH_FIELDS, CourseSearchIndex
+from .target_parser import TargetIndex, filter_courses_by_department, filter_courses_by_grade, parse_grade, \
+    resolve_department_names
+def semester_name(year: int, semester: int) -> str:
+    return f"{year}_{semester}"
+class SemesterCatalog:
+    """
+    학기 폴더 하나를 메모리에 올린 상태 (원본 파일별 과목, 검색 색인, target 색인, 충돌 색인)
+    만든 뒤에는 바뀌지 않으므로 여러 스레드가 동시에 읽어도 되고, 원본이 바뀌면 새로 만들어 통째로 교체한다.
+    """
+    def __init__(self, folder_path: str, conflict_backend: str = 'auto'):
+        started = time.perf_counter()
+        self.folder_path = folder_path
+        self.name = os.path.basename(os.path.normpath(folder_path))
+        self.conflict_backend = conflict_backend
+        self.signature = source_signature(folder_path, list_source_files(folder_path))
+        self.search_index = CourseSearchIndex.load_or_build(folder_path)
+        self.courses_by_file = self.search_index.preload()
+        self.courses: List[Dict] = [course for courses in self.courses_by_file.values() for course in courses]
+        self.target_index = TargetIndex(self.courses)
+        self._conflict_index = None
+        self._conflict_lock = threading.Lock()
+        self.loaded_at = time.time()
+        self.load_seconds = time.perf_counter() - started
+    def is_stale(self) -> bool:
+        """원본 파일 목록이나 크기/mtime이 적재 시점과 다른지"""
+        try:
+            return source_signature(self.folder_path, list_source_files(self.folder_path)) != self.signature
+        except OSError:
+            return True
+    def info(self) -> Dict:
+        return {
+            'semester': self.name,
+            'files': len(self.courses_by_file),
+            'courses': len(self.courses),
+            'loadedAt': self.loaded_at,
+            'loadSeconds': round(self.load_seconds, 4)
+        }
+    def search(self, keyword: str, grade: Optional[str] = None,
+               fields: Sequence[str] = SEARCH_FIELDS) -> List[Dict]:
+        """find_by_lecture의 로컬 검색과 같은 결과 (이름/교수/학과 부분 일치 + 학년 필터)"""
+        results = self.search_index.search(keyword, tuple(fields))
+        if grade and grade != 'all':
+            results = filter_courses_by_grade(results, grade)
+        return results
+    def major(self, year: int, semester: int, college: str, department: str, major: Optional[str] = None,
+              subdepartments: Optional[List[str]] = None, grade: Optional[str] = None) -> Optional[List[Dict]]:
+        """get_major와 같은 결과 (학과 원본 파일 + 부전공/학년 필터), 원본 파일이 없으면 None"""
+        for filename in major_source_candidates(year, semester, college, department, major, subdepartments):
+            if filename in self.courses_by_file:
+                data = list(self.courses_by_file[filename])
+                break
+        else:
+            return None
+        if subdepartments:
+            data = filter_courses_by_department(data, [department] + list(subdepartments))
+        if grade and grade != 'all':
+            data = filter_courses_by_grade(data, grade)
+        return data
+    def filter(self, departments: Sequence[str] = (), grade: Optional[str] = None) -> List[Dict]:
+        """학기 전체에서 학과(들) 학생이 수강 대상이고 해당 학년이 들을 수 있는 과목 (target 색인의 집합 연산)"""
+        index = self.target_index
+        positions = None
+        if departments:
+            positions = index.departments_positions(resolve_department_names(departments)) - index.untargeted
+        grade_number = parse_grade(grade)
+        if grade_number is not None:
+            grade_positions = index.grade_positions(grade_number)
+            positions = grade_positions if positions is None else positions & grade_positions
+        return list(self.courses) if positions is None else index.select(positions)
+    def _conflict_index_locked(self):
+        if self._conflict_index is None:
+            from .conflict_checker import build_conflict_index
+            unique = {}
+            for course in self.courses:
+                unique.setdefault(course.get('code'), course)
+            self._conflict_index = build_conflict_index(unique.values(), 'code', self.conflict_backend)
+        return self._conflict_index
+    def conflicts(self, codes: Sequence[str], free: bool = False) -> Dict:
+        """
+        과목 코드 목록(시간표)의 충돌 검사
+        pairs는 서로 겹치는 코드 쌍, free=True면 이 시간표와 겹치지 않는 학기 전체 과목 코드도 함께 반환
+        충돌 색인은 처음 질의할 때 만들고(같은 코드가 여러 파일에 있으면 처음 것만 사용), 색인 내부의 지연 계산 때문에 질의는 한 번에 하나씩 처리한다.
+        """
+        with self._conflict_lock:
+            index = self._conflict_index_locked()
+            known = [code for code in dict.fromkeys(codes) if code in index]
+            selected = set(known)
+            pairs = sorted({
+                tuple(sorted((code, other)))
+                for code in known for other in index.conflicts_of(code) if other in selected
+            })
+            result = {
+                'codes': known,
+                'unknown': [code for code in codes if code not in selected],
+                'hasConflict': bool(pairs),
+                'pairs': [list(pair) for pair in pairs]
+            }
+            if free:
+                intervals = [interval for code in known for interval in index.intervals(code)]
+                result['free'] = [code for code in index.conflict_free(intervals) if code not in selected]
+        return result
+class QueryService:
+    """
+    여러 학기 카탈로그를 메모리에 두고 질의에 답하는 서비스 (serve 데몬의 본체)
+    refresh()는 원본이 바뀐 학기를 새로 적재해 교체하며, 적재 중에도 기존 카탈로그로 계속 응답한다.
+    semesters를 주지 않으면 result/ 아래 학기 폴더를 모두 적재하고, refresh() 때 새로 생긴 폴더도 추가한다.
+    """
+    def __init__(self, semesters: Optional[List[str]] = None, result_dir: str = 'result', conflict_backend: str = 'auto'):
+        self.result_dir = result_dir
+        self.pinned = list(semesters) if semesters else None
+        self.conflict_backend = conflict_backend
+        self.catalogs: Dict[str, SemesterCatalog] = {}
+        self.reloads = 0
+        self._reload_lock = threading.Lock()
+    def semester_names(self) -> List[str]:
+        return self.pinned if self.pinned is not None else discover_semesters(self.result_dir)
+    def load(self, name: str) -> SemesterCatalog:
+        catalog = SemesterCatalog(os.path.join(self.result_dir, name), self.conflict_backend)
+        self.catalogs = {**self.catalogs, name: catalog}
+        return catalog
+    def get(self, name: str) -> Optional[SemesterCatalog]:
+        return self.catalogs.get(name)
+    def refresh(self) -> List[str]:
+        """
+        새로 생기거나 원본이 바뀐 학기를 다시 적재하고 그 이름 목록 반환 (사라진 학기는 내림)
+        reloads는 이미 적재된 카탈로그를 교체한 경우에만 센다 (첫 적재, 새 학기 추가는 제외)
+        """
+        with self._reload_lock:
+            names = self.semester_names()
+            reloaded = []
+            replaced = False
+            for name in names:
+                catalog = self.catalogs.get(name)
+                if catalog is not None and not catalog.is_stale():
+                    continue
+                if not list_source_files(os.path.join(self.result_dir, name)):
+                    continue
+                self.load(name)
+                reloaded.append(name)
+                replaced = replaced or catalog is not None
+            removed = [name for name in self.catalogs if name not in names]
+            if removed:
+                self.catalogs = {name: catalog for name, catalog in self.catalogs.items() if name in names}
+            if replaced:
+                self.reloads += 1
+            return reloaded
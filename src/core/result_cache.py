@@ -0,0 +1,267 @@
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from .catalog_paths import get_cache_dir, list_source_files, source_signature
+from .search_index import normalize_text
+from .target_parser import TARGET_INFO_VERSION
+from ..utils.file_lock import FileLock
+CACHE_VERSION = 2
+RESULT_CACHE_DIR_NAME = 'search_results'
+INDEX_FILE_NAME = 'index.json'
+LOCK_FILE_NAME = 'index.lock'
+FLUSH_EVERY = 32
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MEMORY_ENTRIES = 64
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    evictions: int = 0
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+    def merge(self, other: Dict[str, int]):
+        for name, value in other.items():
+            if hasattr(self, name):
+                setattr(self, name, getattr(self, name) + value)
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        ratio = self.hits / lookups * 100 if lookups else 0.0
+        return (f"적중 {self.hits}회 (메모리 {self.memory_hits}, 디스크 {self.disk_hits}), "
+                f"미스 {self.misses}회 (만료 {self.stale}), 적중률 {ratio:.1f}%, 제거 {self.evictions}개")
+def normalize_keyword(keyword: str) -> str:
+    """검색과 같은 규칙(NFC + 소문자)에 공백 정리까지 적용한 캐시 키용 키워드"""
+    return ' '.join(normalize_text(keyword).split())
+def make_key(year: int, semester: int, keyword: str, grade: Optional[str] = None,
+             fields: Sequence[str] = ()) -> Tuple:
+    return (year, semester, normalize_keyword(keyword), grade if grade and grade != 'all' else 'all', tuple(fields))
+def _tmp_path(path: str) -> str:
+    """프로세스·스레드마다 다른 임시 파일 경로"""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+def _digest(value) -> str:
+    return hashlib.sha1(json.dumps(value, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+class SearchResultCache:
+    """
+    학기 폴더별 검색 결과 캐시
+    - 키: (년도, 학기, 정규화한 키워드, 학년, 검색 필드)
+    - 항목마다 원본 JSON들의 크기/mtime 서명(+ 수강 대상 해석 규칙 버전)을 기록해 두고, 서명이 바뀐 항목은 만료로 보고 버린다
+    - 디스크({폴더}/.cache/search_results/)는 항목 수와 총 바이트 수 한도를 넘으면 가장 오래 안 쓴 항목부터 제거(LRU)
+    - 같은 프로세스 안에서는 메모리 LRU를 먼저 확인한다 (오래 떠 있는 서비스용)
+    - 색인 읽기-수정-쓰기는 {캐시 폴더}/index.lock 파일 잠금 안에서 하므로 여러 CLI가 동시에 써도 항목을 잃지 않는다
+    - 디스크 적중은 색인을 바로 다시 쓰지 않고 last_used와 통계를 모아 두었다가 put/flush 때(또는 FLUSH_EVERY건마다) 반영한다
+    stats는 이 인스턴스의 적중/미스 횟수, 디스크 색인에는 누적 횟수가 함께 저장된다.
+    """
+    def __init__(self, folder_path: str, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES, memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.folder_path = folder_path
+        self.cache_dir = os.path.join(get_cache_dir(folder_path), RESULT_CACHE_DIR_NAME)
+        self.index_path = os.path.join(self.cache_dir, INDEX_FILE_NAME)
+        self.lock_path = os.path.join(self.cache_dir, LOCK_FILE_NAME)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.stats = CacheStats()
+        self._memory: 'OrderedDict[str, Tuple[str, List[Dict]]]' = OrderedDict()
+        self._touched: Dict[str, float] = {}
+        self._pending = CacheStats()
+        self._thread_lock = threading.Lock()
+    def sources_digest(self) -> str:
+        """
+        현재 원본 파일 서명과 수강 대상 해석 규칙 버전의 해시 (조회마다 stat만 수행)
+        학년 필터 결과는 targetInfo 해석 규칙에 따라 달라지므로, TARGET_INFO_VERSION이 바뀌면 이전 항목은 만료로 본다.
+        """
+        return _digest([TARGET_INFO_VERSION, source_signature(self.folder_path, list_source_files(self.folder_path))])
+    def _load_index(self) -> Dict:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') == CACHE_VERSION:
+                return index
+        except (OSError, ValueError):
+            pass
+        return {'version': CACHE_VERSION, 'entries': {}, 'stats': {}}
+    def _save_index(self, index: Dict, delta: CacheStats):
+        totals = CacheStats(**{name: value for name, value in index.get('stats', {}).items()
+                               if name in CacheStats.__dataclass_fields__})
+        totals.merge(asdict(delta))
+        index['stats'] = asdict(totals)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = _tmp_path(self.index_path)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+    def _apply_pending(self, index: Dict) -> CacheStats:
+        """모아 둔 last_used 갱신을 색인에 반영하고 모아 둔 통계를 돌려줌 (잠금 안에서 호출)"""
+        for digest, used in self._touched.items():
+            entry = index['entries'].get(digest)
+            if entry is not None and entry.get('last_used', 0) < used:
+                entry['last_used'] = used
+        delta, self._pending = self._pending, CacheStats()
+        self._touched.clear()
+        return delta
+    def flush(self):
+        """모아 둔 디스크 적중 기록(last_used, 통계)을 색인에 저장"""
+        with self._thread_lock:
+            if not self._touched and self._pending == CacheStats():
+                return
+            with FileLock(self.lock_path):
+                index = self._load_index()
+                self._save_index(index, self._apply_pending(index))
+    def _entry_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.json")
+    def _remember(self, digest: str, sources: str, results: List[Dict]):
+        if self.memory_entries <= 0:
+            return
+        self._memory[digest] = (sources, results)
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+    def get(self, key: Tuple) -> Optional[List[Dict]]:
+        """캐시된 결과 (없거나 원본이 바뀌었으면 None)"""
+        digest = _digest(list(key))
+        sources = self.sources_digest()
+        delta = CacheStats()
+        cached = self._memory.get(digest)
+        if cached is not None and cached[0] == sources:
+            self._memory.move_to_end(digest)
+            self.stats.memory_hits += 1
+            return [dict(course) for course in cached[1]]
+        index = self._load_index()
+        entry = index['entries'].get(digest)
+        results = None
+        if entry is not None and entry.get('sources') == sources:
+            try:
+                with open(self._entry_path(digest), 'r', encoding='utf-8') as f:
+                    results = json.load(f)
+            except (OSError, ValueError):
+                results = None
+        if results is None:
+            delta.misses += 1
+            self._memory.pop(digest, None)
+            if entry is not None:
+                delta.stale += 1
+                with self._thread_lock, FileLock(self.lock_path):
+                    index = self._load_index()
+                    self._drop(index, digest)
+                    self._save_index(index, delta)
+            else:
+                with self._thread_lock:
+                    self._pending.merge(asdict(delta))
+        else:
+            delta.disk_hits += 1
+            self._remember(digest, sources, results)
+            with self._thread_lock:
+                self._touched[digest] = time.time()
+                self._pending.merge(asdict(delta))
+                flush = len(self._touched) >= FLUSH_EVERY
+            if flush:
+                self.flush()
+        self.stats.merge(asdict(delta))
+        return None if results is None else [dict(course) for course in results]
+    def put(self, key: Tuple, results: List[Dict]):
+        """결과 저장 후 만료 항목과 한도 초과 항목(LRU) 제거"""
+        digest = _digest(list(key))
+        sources = self.sources_digest()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        payload = json.dumps(results, ensure_ascii=False).encode('utf-8')
+        entry_path = self._entry_path(digest)
+        tmp_path = _tmp_path(entry_path)
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        with self._thread_lock, FileLock(self.lock_path):
+            os.replace(tmp_path, entry_path)
+            index = self._load_index()
+            delta = self._apply_pending(index)
+            self._store_locked(index, digest, key, sources, len(payload), delta)
+        self._remember(digest, sources, results)
+    def _store_locked(self, index: Dict, digest: str, key: Tuple, sources: str, size: int, delta: CacheStats):
+        """색인에 항목을 추가하고 만료/한도 초과/색인에 없는 payload 파일을 지운 뒤 저장 (잠금 안에서 호출)"""
+        index['entries'][digest] = {
+            'key': list(key),
+            'sources': sources,
+            'size': size,
+            'last_used': time.time()
+        }
+        for stale_digest in [d for d, e in index['entries'].items() if e.get('sources') != sources]:
+            self._drop(index, stale_digest)
+            delta.evictions += 1
+        entries = index['entries']
+        total_bytes = sum(e.get('size', 0) for e in entries.values())
+        for old_digest in sorted(entries, key=lambda d: entries[d].get('last_used', 0)):
+            if len(entries) <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            if old_digest == digest:
+                continue
+            total_bytes -= entries[old_digest].get('size', 0)
+            self._drop(index, old_digest)
+            delta.evictions += 1
+        for name in os.listdir(self.cache_dir):
+            orphan = name.endswith('.json') and name != INDEX_FILE_NAME and name[:-len('.json')] not in entries
+            if orphan:
+                self._drop(index, name[:-len('.json')])
+                delta.evictions += 1
+        self.stats.evictions += delta.evictions
+        self._save_index(index, delta)
+    def _drop(self, index: Dict, digest: str):
+        index['entries'].pop(digest, None)
+        self._memory.pop(digest, None)
+        try:
+            os.remove(self._entry_path(digest))
+        except FileNotFoundError:
+            pass
+    def clear(self):
+        with self._thread_lock, FileLock(self.lock_path):
+            index = self._load_index()
+            for digest in list(index['entries']):
+                self._drop(index, digest)
+            self._memory.clear()
+            self._save_index(index, self._apply_pending(index))
+    def report(self) -> Dict:
+        """디스크 캐시 현황 (항목 수, 총 바이트, 누적 적중/미스)"""
+        self.flush()
+        index = self._load_index()
+        totals = CacheStats(**{name: value for name, value in index.get('stats', {}).items()
+                               if name in CacheStats.__dataclass_fields__})
+        return {
+            'entries': len(index['entries']),
+            'bytes': sum(e.get('size', 0) for e in index['entries'].values()),
+            'stats': totals
+        }
+_caches: Dict[str, SearchResultCache] = {}
+def get_result_cache(folder_path: str) -> SearchResultCache:
+    """폴더별 캐시 인스턴스 (같은 프로세스에서는 메모리 계층을 공유)"""
+    key = os.path.abspath(folder_path)
+    if key not in _caches:
+        _caches[key] = SearchResultCache(folder_path)
+    return _caches[key]
+@atexit.register
+def _flush_caches():
+    for cache in _caches.values():
+        try:
+            cache.flush()
+        except OSError:
+            pass
+def main():
+    parser = argparse.ArgumentParser(description='검색 결과 캐시 현황 조회/비우기')
+    parser.add_argument('folder', help='학기 폴더 (예: result/2025_1)')
+    parser.add_argument('--clear', action='store_true', help='캐시 항목 모두 삭제')
+    args = parser.parse_args()
+    cache = SearchResultCache(args.folder)
+    if args.clear:
+        cache.clear()
+        print(f"🧹 캐시 비움: {cache.cache_dir}")
+    report = cache.report()
+    print(f"📦 {cache.cache_dir}: 항목 {report['entries']}개, {report['bytes'] / 1024:.1f}KB")
+    print(f"📊 누적 {report['stats'].summary()}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import asyncio
+import weakref
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional, TypeVar
+from ..utils.profiling import count, span
+T = TypeVar('T')
+RUSAINT_CLI = 'rusaint-cli'
+def find_by_lecture_args(year: int, semester: int, keyword: str) -> List[str]:
+    return [
+        'find-by-lecture',
+        '--year', str(year),
+        '--semester', str(semester),
+        '--keyword', keyword
+    ]
+def find_major_args(year: int, semester: int, college: str, department: str,
+                    major: Optional[str] = None) -> List[str]:
+    args = [
+        'find-major',
+        '--year', str(year),
+        '--semester', str(semester),
+        '--college', college,
+        '--department', department
+    ]
+    if major:
+        args.extend(['--major', major])
+    return args
+@dataclass
+class RunResult:
+    """rusaint-cli 한 번 실행한 결과 (returncode는 시간 초과로 종료시킨 경우 None)"""
+    args: List[str]
+    returncode: Optional[int]
+    stderr: str
+    timed_out: bool = False
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+class AsyncRusaintRunner:
+    """
+    rusaint-cli 비동기 실행기 (asyncio.create_subprocess_exec)
+    - max_concurrency개까지만 동시에 프로세스를 띄우고 나머지는 대기
+    - stderr는 줄 단위로 읽으며 on_stderr 콜백에 넘기고, stdout은 버퍼에 쌓지 않고 흘려보낸다
+    - timeout 초과나 작업 취소(CancelledError) 시 프로세스를 kill하고 회수한다
+    """
+    def __init__(self, max_concurrency: int = 4, executable: str = RUSAINT_CLI,
+                 on_stderr: Optional[Callable[[str], None]] = None):
+        self.max_concurrency = max(1, max_concurrency)
+        self.executable = executable
+        self.on_stderr = on_stderr
+        self._loop: Optional['weakref.ReferenceType[asyncio.AbstractEventLoop]'] = None
+        self._bound_semaphore: Optional[asyncio.Semaphore] = None
+    def _semaphore(self) -> asyncio.Semaphore:
+        """
+        실행 중인 이벤트 루프의 Semaphore (처음 쓸 때 만들고, 다른 루프에서 쓰이면 새로 만든다)
+        Semaphore는 처음 기다린 루프에 묶이므로 asyncio.run마다 새 루프를 쓰는 동기 래퍼에서도 이전 루프의 것을 쓰지 않는다.
+        한 실행기는 한 번에 한 이벤트 루프에서만 사용한다.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is None or self._loop() is not loop:
+            self._loop = weakref.ref(loop)
+            self._bound_semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._bound_semaphore
+    async def _pump_stderr(self, stream: asyncio.StreamReader, lines: List[str]):
+        while True:
+            raw = await stream.readline()
+            if not raw:
+                break
+            line = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+            lines.append(line)
+            if self.on_stderr:
+                self.on_stderr(line)
+    async def _drain(self, stream: asyncio.StreamReader):
+        while await stream.read(65536):
+            pass
+    async def run(self, args: List[str], cwd: str, timeout: Optional[float] = None) -> RunResult:
+        """rusaint-cli {args}를 cwd에서 실행 (실행 파일이 없으면 FileNotFoundError)"""
+        async with self._semaphore():
+            process = await asyncio.create_subprocess_exec(
+                self.executable, *args,
+                cwd=cwd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stderr_lines: List[str] = []
+            communicate = asyncio.gather(
+                self._pump_stderr(process.stderr, stderr_lines),
+                self._drain(process.stdout),
+                process.wait()
+            )
+            try:
+                await asyncio.wait_for(communicate, timeout)
+            except asyncio.TimeoutError:
+                await self._kill(process)
+                return RunResult(args, None, '\n'.join(stderr_lines), timed_out=True)
+            except asyncio.CancelledError:
+                await self._kill(process)
+                raise
+            return RunResult(args, process.returncode, '\n'.join(stderr_lines))
+    async def _kill(self, process: asyncio.subprocess.Process):
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        await process.wait()
+    async def find_by_lecture(self, year: int, semester: int, keyword: str, cwd: str,
+                              timeout: Optional[float] = None) -> RunResult:
+        return await self.run(find_by_lecture_args(year, semester, keyword), cwd, timeout)
+    async def find_major(self, year: int, semester: int, college: str, department: str,
+                         major: Optional[str] = None, cwd: str = '.',
+                         timeout: Optional[float] = None) -> RunResult:
+        return await self.run(find_major_args(year, semester, college, department, major), cwd, timeout)
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """동기 코드에서 코루틴 실행 (호출 스레드마다 새 이벤트 루프 사용)"""
+    return asyncio.run(awaitable)
+def run_rusaint_cli(args: List[str], cwd: str, timeout: Optional[float] = None) -> RunResult:
+    """동기 API용 얇은 래퍼 - 한 번의 rusaint-cli 실행"""
+    count('rusaint.calls')
+    with span('rusaint.subprocess'):
+        return run_sync(AsyncRusaintRunner(max_concurrency=1).run(args, cwd, timeout))
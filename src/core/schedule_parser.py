@@ -1,8 +1,13 @@
 import json
 import re
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
+WEEKDAYS = ('월', '화', '수', '목', '금', '토', '일')
+_WEEKDAY_SET = frozenset(WEEKDAYS)
+_WEEKDAY_INDEX = {day: i for i, day in enumerate(WEEKDAYS)}
+MINUTES_PER_DAY = 24 * 60
 @dataclass
 class ScheduleEntry:
     week: str
@@ -10,6 +15,56 @@ class ScheduleEntry:
     endTime: str
     classroom: Optional[str]
     courseCode: int
+    def to_interval(self, section: Any = None) -> Optional['TimeInterval']:
+        return TimeInterval.from_strings(self.week, self.startTime, self.endTime, section)
+def parse_clock(time_str: str) -> int:
+    """'16:30' → 990 (minutes since 00:00)"""
+    hours, minutes = time_str.split(':', 1)
+    return int(hours) * 60 + int(minutes)
+class TimeInterval:
+    """
+    Weekly time slot as integer minutes since Monday 00:00, half-open [start, end).
+    A single-time entry ('13:00', start == end) is widened to one minute so it still conflicts.
+    """
+    __slots__ = ('start', 'end', 'section')
+    def __init__(self, start: int, end: int, section: Any = None):
+        self.start = start
+        self.end = end if end > start else start + 1
+        self.section = section
+    @classmethod
+    def from_strings(cls, week: str, start_time: str, end_time: str, section: Any = None) -> Optional['TimeInterval']:
+        """('목', '16:30', '17:45') → TimeInterval, 요일/시각을 해석할 수 없으면 None"""
+        day = _WEEKDAY_INDEX.get(week)
+        if day is None:
+            return None
+        try:
+            start = parse_clock(start_time)
+            end = parse_clock(end_time) if end_time else start
+        except (ValueError, AttributeError):
+            return None
+        offset = day * MINUTES_PER_DAY
+        return cls(offset + start, offset + end, section)
+    @property
+    def day(self) -> int:
+        return self.start // MINUTES_PER_DAY
+    def overlaps(self, other: 'TimeInterval') -> bool:
+        return self.start < other.end and other.start < self.end
+    def __repr__(self) -> str:
+        return f"TimeInterval({self.start}, {self.end}, section={self.section!r})"
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TimeInterval):
+            return NotImplemented
+        return (self.start, self.end, self.section) == (other.start, other.end, other.section)
+    def __hash__(self) -> int:
+        return hash((self.start, self.end, self.section))
+def intervals_from_course_times(course_times: List[Dict], section: Any = None) -> List[TimeInterval]:
+    """courseTime dict 목록을 TimeInterval 목록으로 변환 (해석 불가 항목은 제외)"""
+    intervals = []
+    for ct in course_times:
+        interval = TimeInterval.from_strings(ct.get('week'), ct.get('startTime'), ct.get('endTime'), section)
+        if interval is not None:
+            intervals.append(interval)
+    return intervals
 def parse_time_range(time_str: str) -> tuple:
     """Parse time range like '10:30-11:45' or '13:00-13:50'"""
     time_str = time_str.strip()
@@ -31,8 +86,8 @@ def parse_classroom(room_str: str) -> Optional[str]:
     if match:
         return match.group(1).strip()
     return room_str.strip() if room_str.strip() != '-' else None
-def parse_schedule_entry(entry: str) -> List[ScheduleEntry]:
-    """Parse a single schedule entry like '화 목 10:30-11:45 (진리관 11304-김기일)'"""
+def parse_schedule_entry_regex(entry: str) -> List[ScheduleEntry]:
+    """Regex-based reference parser (kept to verify tokenize_schedule output)"""
     if not entry.strip():
         return []
     entries = entry.strip().split('\n')
@@ -70,6 +125,89 @@ def parse_schedule_entry(entry: str) -> List[ScheduleEntry]:
                     courseCode=0
                 ))
     return results
+ScheduleTuple = Tuple[str, str, str, Optional[str]]
+def _strip_parentheses(line: str) -> Tuple[str, Optional[str]]:
+    """Remove every '(...)' group (non-empty, no nested ')') and return the first group's classroom"""
+    classroom = None
+    pieces = []
+    pos = 0
+    i = line.find('(')
+    while i != -1:
+        j = line.find(')', i + 1)
+        if j == -1:
+            break
+        if j == i + 1:
+            i = line.find('(', j)
+            continue
+        if not pieces:
+            classroom_info = line[i + 1:j]
+            if '-' in classroom_info:
+                classroom = classroom_info.split('-')[0].strip()
+            else:
+                classroom = classroom_info.strip()
+        pieces.append(line[pos:i])
+        pos = j + 1
+        i = line.find('(', pos)
+    if not pieces:
+        return line, None
+    pieces.append(line[pos:])
+    return ''.join(pieces).strip(), classroom
+def _two_digits(text: str, pos: int) -> bool:
+    return pos + 2 <= len(text) and text[pos:pos + 2].isdecimal()
+def _tokenize_line(line: str) -> List[ScheduleTuple]:
+    """Single pass over one schedule line: '(room)' groups, first H:MM[-H:MM], then weekday tokens"""
+    classroom = None
+    if '(' in line:
+        line, classroom = _strip_parentheses(line)
+    colon = line.find(':')
+    while colon != -1:
+        if colon >= 1 and line[colon - 1].isdecimal() and _two_digits(line, colon + 1):
+            break
+        colon = line.find(':', colon + 1)
+    else:
+        return []
+    start = colon - 2 if colon >= 2 and line[colon - 2].isdecimal() else colon - 1
+    start_time = line[start:colon + 3]
+    end_time = start_time
+    length = len(line)
+    k = colon + 3
+    while k < length and line[k].isspace():
+        k += 1
+    if k < length and line[k] == '-':
+        k += 1
+        while k < length and line[k].isspace():
+            k += 1
+        if k < length and line[k].isdecimal():
+            if k + 1 < length and line[k + 1].isdecimal() and line[k + 2:k + 3] == ':' and _two_digits(line, k + 3):
+                end_time = line[k:k + 5]
+            elif line[k + 1:k + 2] == ':' and _two_digits(line, k + 2):
+                end_time = line[k:k + 4]
+    return [
+        (day, start_time, end_time, classroom)
+        for day in line[:start].split()
+        if day in _WEEKDAY_SET
+    ]
+@lru_cache(maxsize=8192)
+def tokenize_schedule(entry: str) -> Tuple[ScheduleTuple, ...]:
+    """
+    Parse a schedule_room string into (week, startTime, endTime, classroom) tuples.
+    Memoized on the raw string because many sections share identical schedule_room text.
+    """
+    entry = entry.strip()
+    if not entry:
+        return ()
+    results = []
+    for single_entry in entry.split('\n'):
+        single_entry = single_entry.strip()
+        if single_entry:
+            results.extend(_tokenize_line(single_entry))
+    return tuple(results)
+def parse_schedule_entry(entry: str) -> List[ScheduleEntry]:
+    """Parse a single schedule entry like '화 목 10:30-11:45 (진리관 11304-김기일)'"""
+    return [
+        ScheduleEntry(week=week, startTime=start, endTime=end, classroom=classroom, courseCode=0)
+        for week, start, end, classroom in tokenize_schedule(entry)
+    ]
 def convert_json_file(input_file: str, output_file: str):
     """Convert a JSON file to the new format"""
     with open(input_file, 'r', encoding='utf-8') as f:
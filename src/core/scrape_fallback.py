@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+from .catalog_paths import get_cache_dir
+from .result_cache import normalize_keyword
+from ..utils.file_lock import FileLock
+FALLBACK_DIR_NAME = 'fallback'
+LOCK_DIR_NAME = 'locks'
+LOCK_STRIPES = 16
+NEGATIVE_TTL_SECONDS = 6 * 60 * 60
+SHARED_TTL_SECONDS = 10 * 60
+class ScrapeFallback:
+    """
+    로컬 검색이 빗나갔을 때의 rusaint-cli 호출을 조정
+    - 음성 캐시: 스크래퍼도 결과가 없었던 키워드는 ttl초 동안 다시 호출하지 않는다
+    - 단일 비행(single-flight): 같은 키워드의 동시 호출은 파일 잠금으로 줄을 세우고,
+      잠금을 기다리는 동안 앞선 호출이 끝냈다면 그 결과를 그대로 쓴다 (같은 호스트의 여러 프로세스 간에도 동작)
+    상태 파일은 {폴더}/.cache/fallback/{키워드 해시}.json, 잠금은 키워드 해시로 고른 LOCK_STRIPES개 중 하나
+    (locks/{0-f}.lock, 키워드마다 잠금 파일이 쌓이지 않음)
+    결과가 있는 상태는 기다리던 호출에 넘겨주기 위한 것이라 shared_ttl초만, 결과 없음(음성)은 ttl초만 두고
+    스크래퍼를 실행할 때마다 기한이 지난 상태 파일을 지운다.
+    """
+    def __init__(self, folder_path: str, ttl: float = NEGATIVE_TTL_SECONDS,
+                 shared_ttl: float = SHARED_TTL_SECONDS):
+        self.folder_path = folder_path
+        self.ttl = ttl
+        self.shared_ttl = shared_ttl
+        self.state_dir = os.path.join(get_cache_dir(folder_path), FALLBACK_DIR_NAME)
+    def _base_path(self, keyword: str) -> str:
+        digest = hashlib.sha1(normalize_keyword(keyword).encode('utf-8')).hexdigest()[:20]
+        return os.path.join(self.state_dir, digest)
+    def _lock_path(self, keyword: str) -> str:
+        stripe = int(os.path.basename(self._base_path(keyword))[0], 16) % LOCK_STRIPES
+        return os.path.join(self.state_dir, LOCK_DIR_NAME, f"{stripe:x}.lock")
+    def _read_state(self, keyword: str) -> Optional[Dict]:
+        try:
+            with open(self._base_path(keyword) + '.json', 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    def _write_state(self, keyword: str, state: Dict):
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = self._base_path(keyword) + '.json'
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    def is_negative(self, keyword: str) -> bool:
+        """스크래퍼가 최근(ttl 이내)에 결과 없음으로 끝난 키워드인지"""
+        state = self._read_state(keyword)
+        return bool(state) and not state.get('results') and time.time() - state.get('finished', 0) < self.ttl
+    def _expired(self, state: Dict, now: float) -> bool:
+        return now - state.get('finished', 0) >= (self.shared_ttl if state.get('results') else self.ttl)
+    def prune(self) -> int:
+        """
+        기한이 지난 상태 파일(결과 있음: shared_ttl, 음성: ttl)과 남은 임시 파일, 이전 형식의 키워드별 .lock 파일을 지우고 지운 개수를 반환
+        """
+        now = time.time()
+        removed = 0
+        try:
+            names = os.listdir(self.state_dir)
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            path = os.path.join(self.state_dir, name)
+            try:
+                if name.endswith('.json'):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        stale = self._expired(json.load(f), now)
+                elif name.endswith(('.tmp', '.lock')):
+                    stale = now - os.path.getmtime(path) >= self.ttl
+                else:
+                    continue
+            except ValueError:
+                stale = True
+            except OSError:
+                continue
+            if stale:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+    def forget(self, keyword: str):
+        try:
+            os.remove(self._base_path(keyword) + '.json')
+        except FileNotFoundError:
+            pass
+    def run(self, keyword: str, scrape: Callable[[], Optional[List[Dict]]],
+            use_negative_cache: bool = True) -> Optional[List[Dict]]:
+        """
+        scrape()를 키워드당 한 번만 실행하고 결과를 공유
+        scrape()가 None을 반환하면(실행 실패) 아무것도 기록하지 않고, 빈 목록이면 음성 캐시에 기록한다.
+        """
+        if use_negative_cache and self.is_negative(keyword):
+            print(f"🚫 '{keyword}': 최근 rusaint-cli 검색 결과가 없어 재검색을 건너뜁니다.")
+            return []
+        waiting_since = time.time()
+        with FileLock(self._lock_path(keyword)):
+            state = self._read_state(keyword)
+            if state and state.get('finished', 0) >= waiting_since:
+                print(f"🤝 '{keyword}': 동시에 실행된 rusaint-cli 검색 결과를 공유합니다.")
+                return state.get('results') or []
+            results = scrape()
+            if results is not None:
+                self._write_state(keyword, {
+                    'keyword': keyword,
+                    'finished': time.time(),
+                    'results': results
+                })
+            self.prune()
+            return results
@@ -0,0 +1,182 @@
+import json
+import os
+import unicodedata
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from .catalog_paths import get_cache_dir, list_source_files, source_signature
+from .ingest import load_canonical, open_canonical
+from ..utils.profiling import span
+INDEX_VERSION = 1
+INDEX_FILE_NAME = 'search_index.json'
+SEARCH_FIELDS = ('name', 'professor', 'department')
+GRAM_SIZES = (2, 3)
+def normalize_text(text: Optional[str]) -> str:
+    """NFC 정규화 + 소문자 변환 (자모 분리 입력도 같은 음절로 매칭되도록)"""
+    if not text:
+        return ''
+    return unicodedata.normalize('NFC', text).lower()
+def extract_grams(text: str, sizes: Tuple[int, ...] = GRAM_SIZES) -> Set[str]:
+    """문자 단위 n-gram 추출 (한글 음절 1자 = 1문자)"""
+    grams = set()
+    for n in sizes:
+        for i in range(len(text) - n + 1):
+            grams.add(text[i:i + n])
+    return grams
+def query_grams(keyword: str) -> Set[str]:
+    """질의어에서 후보 검색에 사용할 n-gram (3자 이상은 trigram, 2자는 bigram)"""
+    if len(keyword) >= 3:
+        return extract_grams(keyword, (3,))
+    if len(keyword) == 2:
+        return {keyword}
+    return set()
+def _encode_postings(doc_ids: List[int]) -> str:
+    """정렬된 문서 id 목록을 델타 + 36진수 문자열로 압축"""
+    parts = []
+    previous = 0
+    for doc_id in doc_ids:
+        parts.append(_to_base36(doc_id - previous))
+        previous = doc_id
+    return ' '.join(parts)
+def _decode_postings(encoded: str) -> List[int]:
+    doc_ids = []
+    current = 0
+    for part in encoded.split():
+        current += int(part, 36)
+        doc_ids.append(current)
+    return doc_ids
+def _to_base36(value: int) -> str:
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    if value == 0:
+        return '0'
+    result = []
+    while value:
+        value, remainder = divmod(value, 36)
+        result.append(digits[remainder])
+    return ''.join(reversed(result))
+class CourseSearchIndex:
+    """
+    학기 폴더의 과목 JSON에 대한 문자 2/3-gram 역색인
+    색인은 {폴더}/.cache/search_index.json에 저장되며 원본 파일의 크기/mtime이 바뀌면 자동 재생성된다.
+    """
+    def __init__(self, folder_path: str):
+        self.folder_path = folder_path
+        self.index_path = os.path.join(get_cache_dir(folder_path), INDEX_FILE_NAME)
+        self.files: List[str] = []
+        self.sources: Dict[str, List[int]] = {}
+        self.docs: List[List] = []
+        self.postings: Dict[str, str] = {}
+        self._decoded: Dict[str, Set[int]] = {}
+        self._loaded_files: Dict[str, Sequence[Dict]] = {}
+    @classmethod
+    def load_or_build(cls, folder_path: str) -> 'CourseSearchIndex':
+        """디스크 색인을 불러오고, 없거나 오래되었으면 재생성"""
+        index = cls(folder_path)
+        files = list_source_files(folder_path)
+        signature = source_signature(folder_path, files)
+        with span('search_index.load'):
+            loaded = index._load(signature)
+        if not loaded:
+            with span('search_index.build'):
+                index.build(files, signature)
+        return index
+    def _load(self, signature: Dict[str, List[int]]) -> bool:
+        if not os.path.exists(self.index_path):
+            return False
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != INDEX_VERSION or data.get('sources') != signature:
+            return False
+        self.files = data['files']
+        self.sources = data['sources']
+        self.docs = data['docs']
+        self.postings = data['postings']
+        return True
+    def build(self, files: List[str], signature: Dict[str, List[int]]):
+        """원본 JSON 파일들을 읽어 색인을 생성하고 디스크에 저장"""
+        postings: Dict[str, List[int]] = {}
+        self.files = []
+        self.docs = []
+        for filename in files:
+            try:
+                courses = self._read_file(filename)
+            except Exception as e:
+                # 서명은 그대로 기록해 둔다: 파일이 고쳐지면(크기/mtime 변경) 다시 만들고, 그대로면 매번 재생성하지 않음
+                print(f"⚠️ 파일 읽기 오류 (바뀔 때까지 건너뜀): {filename} - {e}")
+                continue
+            self._loaded_files[filename] = courses
+            file_idx = len(self.files)
+            self.files.append(filename)
+            for position, values in enumerate(_iter_search_fields(courses)):
+                doc_id = len(self.docs)
+                fields = [normalize_text(value) for value in values]
+                self.docs.append([file_idx, position] + fields)
+                grams = set()
+                for text in fields:
+                    grams |= extract_grams(text)
+                for gram in grams:
+                    postings.setdefault(gram, []).append(doc_id)
+        self.sources = signature
+        self.postings = {gram: _encode_postings(ids) for gram, ids in postings.items()}
+        self._decoded = {}
+        self._save()
+    def _save(self):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'sources': self.sources,
+                'files': self.files,
+                'docs': self.docs,
+                'postings': self.postings,
+            }, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+    def _posting(self, gram: str) -> Set[int]:
+        if gram not in self._decoded:
+            self._decoded[gram] = set(_decode_postings(self.postings.get(gram, '')))
+        return self._decoded[gram]
+    def candidates(self, keyword: str) -> List[int]:
+        """posting list 교집합으로 후보 문서 id 목록 반환 (검증 전)"""
+        grams = query_grams(keyword)
+        if not grams:
+            return list(range(len(self.docs)))
+        postings = sorted((self._posting(gram) for gram in grams), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return sorted(result)
+    def search_ids(self, keyword: str, fields: Tuple[str, ...] = SEARCH_FIELDS) -> List[int]:
+        """후보를 실제 부분 문자열 포함 여부로 검증한 문서 id 목록"""
+        normalized = normalize_text(keyword)
+        offsets = [2 + SEARCH_FIELDS.index(field) for field in fields]
+        return [
+            doc_id for doc_id in self.candidates(normalized)
+            if any(normalized in self.docs[doc_id][offset] for offset in offsets)
+        ]
+    def search(self, keyword: str, fields: Tuple[str, ...] = SEARCH_FIELDS) -> List[Dict]:
+        """키워드와 일치하는 과목 dict 목록 (일치 과목이 있는 원본 파일만 읽음)"""
+        results = []
+        for doc_id in self.search_ids(keyword, fields):
+            file_idx, position = self.docs[doc_id][0], self.docs[doc_id][1]
+            filename = self.files[file_idx]
+            if filename not in self._loaded_files:
+                self._loaded_files[filename] = self._read_file(filename)
+            results.append(dict(self._loaded_files[filename][position]))
+        return results
+    def preload(self) -> Dict[str, List[Dict]]:
+        """색인된 모든 원본 파일의 과목을 dict 목록으로 메모리에 올림 (이후 search는 파일을 다시 읽지 않음, 상주 서버용)"""
+        for filename in self.files:
+            if not isinstance(self._loaded_files.get(filename), list):
+                self._loaded_files[filename] = load_canonical(os.path.join(self.folder_path, filename))
+        return {filename: self._loaded_files[filename] for filename in self.files}
+    def _read_file(self, filename: str) -> Sequence[Dict]:
+        return open_canonical(os.path.join(self.folder_path, filename))
+def _iter_search_fields(courses: Sequence[Dict]) -> Iterator[Tuple]:
+    """검색 대상 필드 값 튜플 순회 (스냅샷이면 dict를 만들지 않고 컬럼 단위로 읽음)"""
+    if hasattr(courses, 'column'):
+        return zip(*(courses.column(field) for field in SEARCH_FIELDS))
+    return (tuple(course.get(field) for field in SEARCH_FIELDS) for course in courses)
@@ -0,0 +1,160 @@
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set
+import numpy as np
+from .conflict_checker import WEEK_MINUTES
+from .schedule_parser import TimeInterval, intervals_from_course_times
+WORD_BITS = 64
+FULL_WORD = np.uint64(0xFFFFFFFFFFFFFFFF)
+def _words_for(minutes: int) -> int:
+    return max(1, -(-minutes // WORD_BITS))
+def _expand_ranges(first: np.ndarray, last: np.ndarray) -> tuple:
+    """[first[i], last[i]] 구간들을 펼친 (구간 번호, 값) 배열"""
+    lengths = last - first + 1
+    owner = np.repeat(np.arange(len(first)), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owner, first[owner] + offsets
+def _pack_intervals(rows: np.ndarray, starts: np.ndarray, ends: np.ndarray, n_rows: int, words: int) -> np.ndarray:
+    """
+    (행, 시작 분, 끝 분) 배열 → (n_rows × words) uint64 비트 행렬 (비트 i = 월요일 00:00부터 i분째)
+    구간마다 걸치는 64분 단위 워드들의 비트 마스크를 계산해 OR 한다 (분 단위 bool 행렬을 만들지 않음).
+    """
+    matrix = np.zeros((n_rows, words), dtype=np.uint64)
+    if not len(starts):
+        return matrix
+    owner, word = _expand_ranges(starts // WORD_BITS, (ends - 1) // WORD_BITS)
+    base = word * WORD_BITS
+    low = np.maximum(starts[owner], base) - base
+    width = np.minimum(ends[owner], base + WORD_BITS) - base - low
+    masks = (FULL_WORD >> (WORD_BITS - width).astype(np.uint64)) << low.astype(np.uint64)
+    np.bitwise_or.at(matrix, (rows[owner], word), masks)
+    return matrix
+def _interval_arrays(groups: Sequence[Sequence[TimeInterval]], limit: int) -> tuple:
+    """분반별 구간 목록 → (행, 시작, 끝) int64 배열 (limit분을 넘는 부분은 자름)"""
+    rows, starts, ends = [], [], []
+    for row, intervals in enumerate(groups):
+        for interval in intervals:
+            if interval.start < limit:
+                rows.append(row)
+                starts.append(interval.start)
+                ends.append(min(interval.end, limit))
+    return (np.array(rows, dtype=np.int64), np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64))
+class SlotMatrixIndex:
+    """
+    NumPy 비트 행렬 기반 분반 충돌 검사 엔진 (ConflictIndex와 같은 메서드, 같은 결과)
+    분반마다 주간 분 단위 점유 비트를 uint64 행 하나로 묶어 (분반 수 × 주간 슬롯) 행렬을 만들고,
+    "이 시간표와 겹치지 않는 분반", "슬롯별 수업 분반 수" 같은 일괄 질의를 행렬 연산 한 번으로 계산한다.
+    분 단위라 구간 경계 처리도 ConflictIndex와 같다. 행렬은 분반이 추가된 뒤 처음 질의할 때 다시 만든다.
+    """
+    def __init__(self):
+        self._sections: Dict[Hashable, List[TimeInterval]] = {}
+        self._rows: Dict[Hashable, int] = {}
+        self._order: List[Hashable] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._arrays: tuple = ()
+        self._interval_rows: List[int] = []
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+    @classmethod
+    def from_courses(cls, courses: Iterable[Dict], key: Optional[str] = 'code') -> 'SlotMatrixIndex':
+        """정규화된 과목 목록(courseTime 보유)으로 색인 생성, 분반 id는 course[key] (None이면 목록 내 위치)"""
+        index = cls()
+        for position, course in enumerate(courses):
+            section = position if key is None else course.get(key)
+            index.add_course_times(section, course.get('courseTime') or [])
+        return index
+    def __len__(self) -> int:
+        return len(self._sections)
+    def __contains__(self, section: Hashable) -> bool:
+        return section in self._sections
+    def add(self, section: Hashable, intervals: Iterable[TimeInterval]):
+        """분반의 구간들을 색인에 추가"""
+        if section not in self._sections:
+            self._rows[section] = len(self._order)
+            self._order.append(section)
+        row = self._rows[section]
+        stored = self._sections.setdefault(section, [])
+        for interval in intervals:
+            if interval.section != section:
+                interval = TimeInterval(interval.start, interval.end, section)
+            stored.append(interval)
+            self._interval_rows.append(row)
+            self._starts.append(interval.start)
+            self._ends.append(interval.end)
+        self._matrix = None
+    def add_course_times(self, section: Hashable, course_times: List[Dict]):
+        self.add(section, intervals_from_course_times(course_times, section))
+    def intervals(self, section: Hashable) -> List[TimeInterval]:
+        return self._sections.get(section, [])
+    def sections(self) -> List[Hashable]:
+        """색인에 넣은 순서의 분반 id 목록"""
+        return list(self._order)
+    @property
+    def matrix(self) -> np.ndarray:
+        """(분반 수 × 주간 분 / 64) uint64 비트 행렬 (행 순서 = sections(), 열 단위 질의가 빠르도록 열 우선 배치)"""
+        if self._matrix is None:
+            words = _words_for(max(max(self._ends, default=0), WEEK_MINUTES))
+            self._arrays = (np.array(self._interval_rows, dtype=np.int64), np.array(self._starts, dtype=np.int64),
+                            np.array(self._ends, dtype=np.int64))
+            self._matrix = np.asfortranarray(_pack_intervals(*self._arrays, len(self._order), words))
+        return self._matrix
+    def _mask(self, intervals: Iterable[TimeInterval]) -> np.ndarray:
+        """질의 구간 → 행렬과 같은 폭의 비트 행 (행렬 폭을 넘는 부분은 겹칠 분반이 없으므로 버림)"""
+        words = self.matrix.shape[1]
+        return _pack_intervals(*_interval_arrays([list(intervals)], words * WORD_BITS), 1, words)[0]
+    def _hit_rows(self, mask: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """mask와 겹치는 행 여부 (mask가 0이 아닌 열만 검사)"""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        hits = np.zeros(len(matrix), dtype=bool)
+        for column in np.flatnonzero(mask):
+            hits |= (matrix[:, column] & mask[column]) != 0
+        return hits
+    def conflicts(self, intervals: Iterable[TimeInterval], exclude: Optional[Hashable] = None) -> Set[Hashable]:
+        """주어진 구간들과 겹치는 색인 내 분반 id 집합"""
+        if not self._order:
+            return set()
+        result = {self._order[row] for row in np.flatnonzero(self._hit_rows(self._mask(intervals)))}
+        result.discard(exclude)
+        return result
+    def conflicts_with_course_times(self, course_times: List[Dict]) -> Set[Hashable]:
+        return self.conflicts(intervals_from_course_times(course_times))
+    def conflicts_of(self, section: Hashable) -> Set[Hashable]:
+        """색인에 있는 분반과 충돌하는 다른 분반 id 집합"""
+        return self.conflicts(self.intervals(section), exclude=section)
+    def has_conflict(self, sections: Sequence[Hashable]) -> bool:
+        """색인에 있는 분반들끼리 서로 겹치는지 여부"""
+        rows = [self._rows[section] for section in sections if section in self._rows]
+        if len(rows) < 2:
+            return False
+        occupied = np.zeros(self.matrix.shape[1], dtype=np.uint64)
+        for row in rows:
+            if (occupied & self.matrix[row]).any():
+                return True
+            occupied |= self.matrix[row]
+        return False
+    def conflict_free(self, intervals: Iterable[TimeInterval],
+                      candidates: Optional[Iterable[Hashable]] = None) -> List[Hashable]:
+        """
+        주어진 구간들(예: 학생의 현재 시간표)과 겹치지 않는 분반 id 목록
+        candidates를 주면 그 분반들만 그 순서대로 검사하고, 없으면 색인 전체를 넣은 순서대로 검사한다.
+        """
+        if not self._order:
+            return []
+        if candidates is None:
+            sections = self._order
+            rows = None
+        else:
+            sections = [section for section in candidates if section in self._rows]
+            rows = np.fromiter((self._rows[section] for section in sections), dtype=np.intp, count=len(sections))
+        hits = self._hit_rows(self._mask(intervals), rows)
+        return [section for section, hit in zip(sections, hits.tolist()) if not hit]
+    def slot_counts(self, slot_minutes: int = 30) -> List[int]:
+        """주간 slot_minutes분 슬롯마다 수업이 있는 분반 수 (월요일 00:00부터 WEEK_MINUTES // slot_minutes개)"""
+        n_slots = WEEK_MINUTES // slot_minutes
+        self.matrix
+        rows, starts, ends = self._arrays
+        keep = starts < n_slots * slot_minutes
+        rows, first = rows[keep], starts[keep] // slot_minutes
+        last = np.minimum((ends[keep] - 1) // slot_minutes, n_slots - 1)
+        owner, slots = _expand_ranges(first, last)
+        keys = np.sort(rows[owner] * n_slots + slots)
+        occupied = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+        return np.bincount(occupied % n_slots, minlength=n_slots).tolist()
@@ -0,0 +1,293 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+from .ssu_data import SSU_DATA
+COLLEGE_ALIASES = {
+    'IT대학': ('IT대',),
+    '경영대학': ('경영대',),
+    '경제통상대학': ('경통대',),
+    '공과대학': ('공대', '공과대'),
+    '법과대학': ('법대',),
+    '베어드학부대학': ('베어드',),
+    '사회과학대학': ('사회대',),
+    '인문대학': ('인문대',),
+    '자연과학대학': ('자연대',),
+}
+RESTRICTED_NOTES = ('대상외수강제한', '타학과 학생 수강 제한', '타학과수강제한', '타학과 수강 불가')
+EXCLUSION_WORDS = ('제외', '수강제한', '수강 제한', '수강불가', '수강 불가')
+FOREIGN_WORDS = ('외국인', '유학생')
+LINE_GRADE_PATTERN = re.compile(r'^\s*(?:(\d)\s*~\s*(\d)학년|(\d)학년|(전체학년))')
+GRADE_NOTE_PATTERN = re.compile(r'^\s*(\d)\s*(?:~\s*(\d)\s*)?학년(.*)$')
+ALL_GRADE_NUMBERS = frozenset(range(1, 6))
+TARGET_INFO_VERSION = 2
+PAREN_PATTERN = re.compile(r'\(([^()]*)\)')
+DEPARTMENT_COLLEGE = {
+    department: college['name']
+    for college in SSU_DATA['colleges']
+    for department in college['departments']
+}
+@dataclass(frozen=True)
+class TargetInfo:
+    """
+    수강 대상(target) 문자열의 구조화된 해석
+    - grades: 명시된 학년, all_grades: 학년 제한 없음('전체학년', '전체')
+      '(1학년 제외)'는 학년에서 빼고(전체면 나머지 학년만), '(1학년 외국인유학생 포함)'은 학년에 더한다
+    - departments/colleges: 대상으로 적힌 학과(줄임말 포함)와 단과대학, open_to_all: 학과 제한 없음
+    - excluded_departments/excluded_colleges: '(영문제외)', '(전자공학 수강제한)' 등으로 빠지는 학과/단과대학
+    - restricted: 대상외 수강 제한, foreign: 외국인/유학생 대상 언급, teaching: 교직이수자 대상,
+      exchange_excluded: 교환학생 수강 불가
+    """
+    grades: FrozenSet[int] = frozenset()
+    all_grades: bool = False
+    departments: FrozenSet[str] = frozenset()
+    colleges: FrozenSet[str] = frozenset()
+    open_to_all: bool = False
+    excluded_departments: FrozenSet[str] = frozenset()
+    excluded_colleges: FrozenSet[str] = frozenset()
+    restricted: bool = False
+    foreign: bool = False
+    teaching: bool = False
+    exchange_excluded: bool = False
+    def matches_grade(self, grade: int) -> bool:
+        return self.all_grades or grade in self.grades
+    def allows_department(self, department: str) -> bool:
+        """정식 학과명 기준으로 이 학과 학생이 대상에 포함되는지"""
+        if department in self.excluded_departments or DEPARTMENT_COLLEGE.get(department) in self.excluded_colleges:
+            return False
+        return (self.open_to_all or department in self.departments
+                or DEPARTMENT_COLLEGE.get(department) in self.colleges)
+    def to_dict(self) -> Dict:
+        return {
+            'grades': sorted(self.grades),
+            'allGrades': self.all_grades,
+            'departments': sorted(self.departments),
+            'colleges': sorted(self.colleges),
+            'openToAll': self.open_to_all,
+            'excludedDepartments': sorted(self.excluded_departments),
+            'excludedColleges': sorted(self.excluded_colleges),
+            'restricted': self.restricted,
+            'foreign': self.foreign,
+            'teaching': self.teaching,
+            'exchangeExcluded': self.exchange_excluded,
+            'version': TARGET_INFO_VERSION,
+        }
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TargetInfo':
+        return cls(
+            grades=frozenset(data.get('grades', ())),
+            all_grades=data.get('allGrades', False),
+            departments=frozenset(data.get('departments', ())),
+            colleges=frozenset(data.get('colleges', ())),
+            open_to_all=data.get('openToAll', False),
+            excluded_departments=frozenset(data.get('excludedDepartments', ())),
+            excluded_colleges=frozenset(data.get('excludedColleges', ())),
+            restricted=data.get('restricted', False),
+            foreign=data.get('foreign', False),
+            teaching=data.get('teaching', False),
+            exchange_excluded=data.get('exchangeExcluded', False),
+        )
+def _match_departments(text: str) -> Set[str]:
+    from ..utils.department_matcher import get_department_matcher
+    return get_department_matcher().match_all(text)
+def _take_colleges(text: str) -> Tuple[Set[str], str]:
+    """단과대학 이름/약칭을 찾아 집합으로 돌려주고, 학과 매칭에 섞이지 않도록 문자열에서 지운다"""
+    colleges = set()
+    for college, aliases in COLLEGE_ALIASES.items():
+        for name in (college,) + aliases:
+            if name in text:
+                colleges.add(college)
+                text = text.replace(name, ' ')
+    return colleges, text
+def _line_grades(line: str) -> Tuple[FrozenSet[int], bool, str]:
+    """줄 앞의 학년 표기 → (학년 집합, 전체학년 여부, 나머지 문자열)"""
+    match = LINE_GRADE_PATTERN.match(line)
+    if not match:
+        return frozenset(), False, line
+    low, high, single, all_grades = match.groups()
+    rest = line[match.end():]
+    if all_grades:
+        return frozenset(), True, rest
+    if single:
+        return frozenset({int(single)}), False, rest
+    return frozenset(range(int(low), int(high) + 1)), False, rest
+def _grade_note(note: str) -> Tuple[FrozenSet[int], Optional[bool]]:
+    """괄호 안 학년 표기 → (학년 집합, 제외이면 False/포함이면 True/학년 표기가 아니면 None)"""
+    match = GRADE_NOTE_PATTERN.match(note)
+    if not match:
+        return frozenset(), None
+    low, high, rest = match.groups()
+    if any(word in rest for word in EXCLUSION_WORDS):
+        included = False
+    elif '포함' in rest:
+        included = True
+    else:
+        return frozenset(), None
+    return frozenset(range(int(low), int(high or low) + 1)), included
+def _is_open_scope(scope: str) -> bool:
+    stripped = scope.strip(' ,;·')
+    return not stripped or stripped.startswith('전체')
+@lru_cache(maxsize=4096)
+def parse_target(target: Optional[str]) -> TargetInfo:
+    """
+    target 문자열 해석 (예: '1학년 IT대(컴퓨터,글로벌미디어,소프트) (대상외수강제한)')
+    줄마다 '{N}학년'/'{N}~{M}학년'/'전체학년' 뒤의 학과 목록을 읽고, 괄호 안의 제외·제한 표기와
+    ';순수외국인입학생', ';교직이수자' 같은 한정어를 플래그로 분리한다.
+    괄호 안 학년 표기는 그 줄의 학년에 반영한다 ('전체(1학년 제외)' → 2~5학년, '2~4학년 전체(1학년 외국인유학생 포함)' → 1~4학년).
+    """
+    if not target:
+        return TargetInfo()
+    grades: Set[int] = set()
+    all_grades = False
+    open_to_all = False
+    departments: Set[str] = set()
+    colleges: Set[str] = set()
+    excluded_departments: Set[str] = set()
+    excluded_colleges: Set[str] = set()
+    restricted = any(note in target for note in RESTRICTED_NOTES)
+    exchange_excluded = False
+    for line in target.split('\n'):
+        line_grades, line_all_grades, rest = _line_grades(line)
+        if rest.strip().startswith('전체') and not line_grades:
+            line_all_grades = True
+        grade_notes = []
+        for note in PAREN_PATTERN.findall(rest):
+            note_grades, included = _grade_note(note)
+            if included is not None:
+                grade_notes.append((note_grades, included))
+                continue
+            if any(word in note for word in RESTRICTED_NOTES):
+                continue
+            if '교환학생' in note:
+                exchange_excluded = True
+                continue
+            if any(word in note for word in EXCLUSION_WORDS):
+                note_colleges, note_text = _take_colleges(note)
+                excluded_colleges |= note_colleges
+                excluded_departments |= _match_departments(note_text)
+        for note_grades, included in grade_notes:
+            if included:
+                line_grades |= note_grades
+            else:
+                if line_all_grades:
+                    line_grades, line_all_grades = ALL_GRADE_NUMBERS, False
+                line_grades -= note_grades
+        grades |= line_grades
+        all_grades = all_grades or line_all_grades
+        scope = PAREN_PATTERN.sub(
+            lambda m: ' ' if (any(word in m.group(1) for word in EXCLUSION_WORDS + RESTRICTED_NOTES) or '교환학생' in m.group(1)
+                              or _grade_note(m.group(1))[1] is not None)
+            else f" {m.group(1)} ",
+            rest
+        )
+        for word in RESTRICTED_NOTES + ('순수외국인입학생', '교직이수자'):
+            scope = scope.replace(word, ' ')
+        if _is_open_scope(scope.replace(';', ' ')):
+            open_to_all = True
+            continue
+        scope_colleges, scope = _take_colleges(scope)
+        colleges |= scope_colleges
+        departments |= _match_departments(scope)
+    return TargetInfo(
+        grades=frozenset(grades),
+        all_grades=all_grades,
+        departments=frozenset(departments),
+        colleges=frozenset(colleges),
+        open_to_all=open_to_all,
+        excluded_departments=frozenset(excluded_departments),
+        excluded_colleges=frozenset(excluded_colleges),
+        restricted=restricted,
+        foreign=any(word in target for word in FOREIGN_WORDS),
+        teaching='교직이수자' in target,
+        exchange_excluded=exchange_excluded,
+    )
+def course_target_info(course: Dict) -> TargetInfo:
+    """ingest 때 저장된 targetInfo를 사용하고, 없거나 이전 해석 규칙으로 만든 것이면(이전 결과 파일 등) target을 해석"""
+    stored = course.get('targetInfo')
+    if stored and stored.get('version') == TARGET_INFO_VERSION:
+        return TargetInfo.from_dict(stored)
+    return parse_target(course.get('target') or '')
+def parse_grade(grade: Optional[str]) -> Optional[int]:
+    """'1'~'5' → int, 'all'/None → None (학년 필터 없음)"""
+    if not grade or grade == 'all':
+        return None
+    try:
+        return int(grade)
+    except ValueError:
+        return 0
+class TargetIndex:
+    """
+    과목 목록의 target 해석 결과를 학년/학과별 과목 위치 집합으로 모아 둔 색인
+    학년·학과 필터는 과목마다 문자열을 검사하지 않고 집합 합/교/차로 계산한다.
+    """
+    def __init__(self, courses: Sequence[Dict]):
+        self.courses = courses
+        self.all_grades: Set[int] = set()
+        self.by_grade: Dict[int, Set[int]] = {}
+        self.open_to_all: Set[int] = set()
+        self.by_department: Dict[str, Set[int]] = {}
+        self.by_college: Dict[str, Set[int]] = {}
+        self.excluded_department: Dict[str, Set[int]] = {}
+        self.excluded_college: Dict[str, Set[int]] = {}
+        self.untargeted: Set[int] = set()
+        infos: Dict[str, TargetInfo] = {}
+        for position, course in enumerate(courses):
+            target = course.get('target') or ''
+            info = infos.get(target)
+            if info is None:
+                info = infos[target] = course_target_info(course)
+            if not target:
+                self.untargeted.add(position)
+            if info.all_grades:
+                self.all_grades.add(position)
+            for grade in info.grades:
+                self.by_grade.setdefault(grade, set()).add(position)
+            if info.open_to_all:
+                self.open_to_all.add(position)
+            for department in info.departments:
+                self.by_department.setdefault(department, set()).add(position)
+            for college in info.colleges:
+                self.by_college.setdefault(college, set()).add(position)
+            for department in info.excluded_departments:
+                self.excluded_department.setdefault(department, set()).add(position)
+            for college in info.excluded_colleges:
+                self.excluded_college.setdefault(college, set()).add(position)
+    def grade_positions(self, grade: int) -> Set[int]:
+        return self.all_grades | self.by_grade.get(grade, set())
+    def department_positions(self, department: str) -> Set[int]:
+        """학과 학생이 수강 대상인 과목 위치 (학과 제한 없음 + 학과/단과대학 지정 - 제외)"""
+        college = DEPARTMENT_COLLEGE.get(department)
+        included = self.open_to_all | self.by_department.get(department, set()) | self.by_college.get(college, set())
+        return included - self.excluded_department.get(department, set()) - self.excluded_college.get(college, set())
+    def departments_positions(self, departments: Iterable[str]) -> Set[int]:
+        positions: Set[int] = set()
+        for department in departments:
+            positions |= self.department_positions(department)
+        return positions
+    def select(self, positions: Set[int]) -> List[Dict]:
+        """위치 집합 → 원래 순서의 과목 목록"""
+        return [self.courses[position] for position in sorted(positions)]
+def filter_courses_by_grade(courses: Sequence[Dict], grade: Optional[str]) -> List[Dict]:
+    """해당 학년이 수강 대상인 과목 ('전체학년'/'전체'처럼 학년 제한이 없는 과목 포함)"""
+    grade_number = parse_grade(grade)
+    if grade_number is None:
+        return list(courses)
+    index = TargetIndex(courses)
+    return index.select(index.grade_positions(grade_number))
+def resolve_department_names(departments: Iterable[str]) -> Set[str]:
+    """입력 학과명(정식명, 줄임말, '건축학부' 같은 상위 학부명)을 정식 학과명 집합으로"""
+    resolved: Set[str] = set()
+    for department in departments:
+        if not department:
+            continue
+        if department in DEPARTMENT_COLLEGE:
+            resolved.add(department)
+            continue
+        matched = {official for official in DEPARTMENT_COLLEGE if official.split(' ')[0] == department}
+        resolved |= matched or _match_departments(department)
+    return resolved
+def filter_courses_by_department(courses: Sequence[Dict], departments: Iterable[str]) -> List[Dict]:
+    """지정한 학과 중 하나라도 수강 대상인 과목 (target이 비어 있는 과목 제외)"""
+    index = TargetIndex(courses)
+    positions = index.departments_positions(resolve_department_names(departments)) - index.untargeted
+    return index.select(positions)
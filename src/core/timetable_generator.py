@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from itertools import product
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from .schedule_parser import MINUTES_PER_DAY, intervals_from_course_times
+DEFAULT_SLOT_MINUTES = 5
+def course_time_mask(course_times: List[Dict], slot_minutes: int = DEFAULT_SLOT_MINUTES) -> int:
+    """
+    courseTime을 주간 슬롯 비트마스크(Python int)로 변환
+    시작은 내림, 종료는 올림하므로 슬롯 경계에 맞지 않는 시각은 보수적으로(충돌 쪽으로) 처리된다.
+    """
+    mask = 0
+    for interval in intervals_from_course_times(course_times):
+        first = interval.start // slot_minutes
+        last = -(-interval.end // slot_minutes)
+        mask |= ((1 << (last - first)) - 1) << first
+    return mask
+def slots_per_week(slot_minutes: int = DEFAULT_SLOT_MINUTES) -> int:
+    return 7 * MINUTES_PER_DAY // slot_minutes
+@dataclass
+class GeneratorStats:
+    nodes: int = 0
+    pruned: int = 0
+    dead_ends: int = 0
+    timetables: int = 0
+class TimetableGenerator:
+    """
+    과목별 분반 후보에서 시간이 겹치지 않는 시간표 조합을 지연 생성
+    - 분반 시간을 슬롯 비트마스크로 바꿔 AND 한 번으로 충돌 판정
+    - 같은 시간대의 분반은 하나의 선택지로 묶어 탐색 폭을 줄이고, 결과를 낼 때만 펼친다
+    - 매 단계마다 남은 선택지가 가장 적은 과목부터 고른다 (most-constrained-first)
+    stats.pruned는 비트 충돌로 제외된 (부분 시간표, 선택지) 수, stats.dead_ends는 선택지가 0이 된 분기 수
+    """
+    def __init__(self, sections_by_course: Dict[str, Sequence[Dict]],
+                 slot_minutes: int = DEFAULT_SLOT_MINUTES):
+        self.course_names = list(sections_by_course)
+        self.slot_minutes = slot_minutes
+        self.stats = GeneratorStats()
+        self._options: List[List[Tuple[int, List[Dict]]]] = []
+        for name in self.course_names:
+            grouped: Dict[int, List[Dict]] = {}
+            for section in sections_by_course[name]:
+                mask = course_time_mask(section.get('courseTime') or [], slot_minutes)
+                grouped.setdefault(mask, []).append(section)
+            self._options.append(list(grouped.items()))
+    def generate(self) -> Iterator[List[Dict]]:
+        """충돌 없는 시간표를 하나씩 반환 (각 시간표는 course_names 순서의 분반 dict 목록)"""
+        self.stats = GeneratorStats()
+        if not self.course_names:
+            return
+        if any(not options for options in self._options):
+            self.stats.dead_ends += 1
+            return
+        chosen: List[Optional[List[Dict]]] = [None] * len(self.course_names)
+        yield from self._search(0, list(range(len(self.course_names))), chosen)
+    def _search(self, used: int, remaining: List[int], chosen: List[Optional[List[Dict]]]) -> Iterator[List[Dict]]:
+        self.stats.nodes += 1
+        if not remaining:
+            for combination in product(*chosen):
+                self.stats.timetables += 1
+                yield list(combination)
+            return
+        best_course = -1
+        best_options: List[Tuple[int, List[Dict]]] = []
+        for course in remaining:
+            options = [option for option in self._options[course] if not option[0] & used]
+            self.stats.pruned += len(self._options[course]) - len(options)
+            if not options:
+                self.stats.dead_ends += 1
+                return
+            if best_course < 0 or len(options) < len(best_options):
+                best_course, best_options = course, options
+        rest = [course for course in remaining if course != best_course]
+        for mask, sections in best_options:
+            chosen[best_course] = sections
+            yield from self._search(used | mask, rest, chosen)
+        chosen[best_course] = None
+def group_sections_by_name(courses: Sequence[Dict], names: Sequence[str], exact: bool = True) -> Dict[str, List[Dict]]:
+    """
+    과목 목록에서 원하는 과목명별 분반 후보를 모은다.
+    exact=False이면 과목명에 키워드가 포함된 분반을 모두 후보로 본다.
+    """
+    grouped: Dict[str, List[Dict]] = {name: [] for name in names}
+    for course in courses:
+        course_name = course.get('name') or ''
+        for name in names:
+            if course_name == name or (not exact and name in course_name):
+                grouped[name].append(course)
+    return grouped
@@ -0,0 +1,52 @@
+from collections import deque
+from typing import Dict, FrozenSet, Generic, Hashable, Iterable, List, Set, Tuple, TypeVar
+T = TypeVar('T', bound=Hashable)
+class AhoCorasick(Generic[T]):
+    """
+    다중 패턴 부분 문자열 검색 오토마톤
+    패턴마다 값(payload)을 붙여 두면, 텍스트를 한 번 훑어서 등장한 패턴들의 값 집합을 돌려준다.
+    """
+    def __init__(self, patterns: Iterable[Tuple[str, T]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        outputs: List[Set[T]] = [set()]
+        for pattern, value in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(value)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fallback = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fallback if fallback != next_state else 0
+                outputs[next_state] |= outputs[self._fail[next_state]]
+        self._outputs: List[FrozenSet[T]] = [frozenset(output) for output in outputs]
+    def find_all(self, text: str) -> Set[T]:
+        """텍스트에 등장하는 모든 패턴의 값 집합"""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        found: Set[T] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
@@ -1,5 +1,6 @@
 import glob
 import json
+from src.core.ingest import strip_table_prefix
 
 for filename in glob.glob('result/2025_1/2025_1학기_*.json'):
     with open(filename, 'r', encoding='utf-8') as f:
@@ -9,9 +10,7 @@ for filename in glob.glob('result/2025_1/2025_1학기_*.json'):
         if isinstance(obj, dict):
             for k, v in obj.items():
                 if k == "code" and isinstance(v, str):
-                    prefix = "SALV_WD_TABLE.ID_DE0D9128A4327646C94670E2A892C99C:VIEW_TABLE.SE_SHORT_SALV_WD_CE."
-                    if v.startswith(prefix):
-                        obj[k] = v.replace(prefix, "")
+                    obj[k] = strip_table_prefix(v)
                 else:
                     process(v)
         elif isinstance(obj, list):
@@ -0,0 +1,94 @@
+import csv
+import os
+import shutil
+from typing import Any, Dict, Iterable, List
+class CsvStreamWriter:
+    """
+    dict 행을 하나씩 CSV로 기록 (pandas.DataFrame(rows).to_csv(index=False)와 같은 열 구성)
+    열 목록은 처음 나온 순서대로 늘어나므로 본문은 임시 파일에 쓰고, close()에서 최종 헤더를 앞에 붙여 원래 경로로 교체한다.
+    나중에 생긴 열은 끝에 붙기 때문에 그 전에 쓴 행은 뒤쪽 칸이 빈 것으로 읽힌다.
+    """
+    def __init__(self, path: str, encoding: str = 'utf-8-sig'):
+        self.path = path
+        self.encoding = encoding
+        self.count = 0
+        self.fieldnames: List[str] = []
+        self._known = set()
+        self._body_path = f"{path}.{os.getpid()}.body.tmp"
+        self._file = open(self._body_path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file, lineterminator='\n')
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        return '' if value is None else value
+    def write(self, row: Dict):
+        for name in row:
+            if name not in self._known:
+                self._known.add(name)
+                self.fieldnames.append(name)
+        self._writer.writerow([self._cell(row.get(name)) for name in self.fieldnames])
+        self.count += 1
+    def write_all(self, rows: Iterable[Dict]) -> int:
+        for row in rows:
+            self.write(row)
+        return self.count
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding=self.encoding, newline='') as out:
+                csv.writer(out, lineterminator='\n').writerow(self.fieldnames)
+                with open(self._body_path, 'r', encoding='utf-8', newline='') as body:
+                    shutil.copyfileobj(body, out)
+            os.replace(tmp_path, self.path)
+        finally:
+            for path in (tmp_path, self._body_path):
+                if os.path.exists(path):
+                    os.remove(path)
+    def abort(self):
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._body_path):
+            os.remove(self._body_path)
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+def read_csv_header(path: str, encoding: str = 'utf-8-sig') -> List[str]:
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        return next(csv.reader(f), [])
+def join_csv_parts(path: str, part_paths: List[str], encoding: str = 'utf-8-sig') -> List[str]:
+    """
+    CsvStreamWriter로 쓴 CSV 조각들을 순서대로 이어 하나의 CSV로 저장하고 최종 열 목록 반환
+    열 구성은 모든 행을 CsvStreamWriter 하나로 쓴 것과 같다. 조각의 열이 최종 열의 앞부분과 같으면 본문을 그대로 복사하고,
+    아니면 그 조각만 행 단위로 열을 다시 맞춘다.
+    """
+    headers = [read_csv_header(part_path, encoding) for part_path in part_paths]
+    fieldnames: List[str] = []
+    for header in headers:
+        fieldnames.extend(name for name in header if name not in fieldnames)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding=encoding, newline='') as out:
+            writer = csv.writer(out, lineterminator='\n')
+            writer.writerow(fieldnames)
+            for part_path, header in zip(part_paths, headers):
+                with open(part_path, 'r', encoding=encoding, newline='') as part:
+                    part.readline()
+                    if header == fieldnames[:len(header)]:
+                        shutil.copyfileobj(part, out)
+                        continue
+                    position = {name: i for i, name in enumerate(header)}
+                    width = max(fieldnames.index(name) for name in header) + 1
+                    for row in csv.reader(part):
+                        writer.writerow([row[position[name]] if position.get(name, len(row)) < len(row) else ''
+                                         for name in fieldnames[:width]])
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return fieldnames
@@ -0,0 +1,38 @@
+import json
+import os
+from typing import Dict, Optional
+DAEMON_STATE_PATH = os.path.join('result', '.cache', 'daemon.json')
+def read_daemon_state(path: str = DAEMON_STATE_PATH) -> Optional[Dict]:
+    """실행 중인 serve 데몬이 남긴 상태 파일 (host, port, pid, semesters), 없거나 깨졌으면 None"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) and 'port' in state else None
+def query_daemon(endpoint: str, params: Optional[Dict] = None, timeout: float = 5.0, state: Optional[Dict] = None):
+    """
+    serve 데몬에 GET 질의를 보내고 응답의 result 반환
+    데몬이 없거나(상태 파일 없음, 연결 거부), 오류 응답이거나, 시간 초과면 None (호출하는 쪽은 로컬 처리로 진행)
+    """
+    state = state or read_daemon_state()
+    if state is None:
+        return None
+    import http.client
+    from urllib.parse import urlencode
+    query = urlencode({key: value for key, value in (params or {}).items() if value is not None}, doseq=True)
+    connection = http.client.HTTPConnection(state.get('host', '127.0.0.1'), state['port'], timeout=timeout)
+    try:
+        connection.request('GET', f"/{endpoint}?{query}" if query else f"/{endpoint}")
+        response = connection.getresponse()
+        body = response.read()
+        if response.status != 200:
+            return None
+        return json.loads(body).get('result')
+    except (OSError, ValueError, http.client.HTTPException):
+        return None
+    finally:
+        connection.close()
+def add_daemon_argument(parser):
+    """serve 데몬을 쓰지 않고 항상 로컬에서 처리하는 옵션"""
+    parser.add_argument('--no-daemon', action='store_true', help='실행 중인 serve 데몬이 있어도 로컬 파일에서 직접 처리')
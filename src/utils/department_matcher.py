@@ -1,14 +1,40 @@
 import json
 import os
-from typing import Dict, Set, List
+from typing import Dict, FrozenSet, List, Optional, Set
 from src.core.ssu_data import SSU_DATA
+from src.utils.aho_corasick import AhoCorasick
+from src.utils.profiling import count, span
+CLASSIFICATION_FILES = [
+    'classification/수강분류_가공_전 (3).json',
+    'classification/수강분류_가공_후 (3).json'
+]
+ABBREVIATION_CACHE_PATH = os.path.join('classification', '.cache', 'department_abbreviations.json')
+ABBREVIATION_CACHE_VERSION = 1
 class DepartmentMatcher:
     def __init__(self):
         self.official_departments = set()
         for college in SSU_DATA['colleges']:
             for dept in college['departments']:
                 self.official_departments.add(dept)
-        self.department_to_abbreviations = self._create_department_abbreviations()
+        self._substring_to_departments: Optional[Dict[str, Set[str]]] = None
+        with span('department_matcher.abbreviations'):
+            self.department_to_abbreviations = self._create_department_abbreviations()
+        self._automaton: Optional[AhoCorasick] = None
+        self._match_cache: Dict[str, FrozenSet[str]] = {}
+    def _create_substring_table(self) -> Dict[str, Set[str]]:
+        """정식 학과명의 모든 부분 문자열(2자 이상) → 해당 학과명 집합"""
+        table: Dict[str, Set[str]] = {}
+        for official_name in self.official_departments:
+            for start in range(len(official_name)):
+                for end in range(start + 2, len(official_name) + 1):
+                    table.setdefault(official_name[start:end], set()).add(official_name)
+        return table
+    def _build_automaton(self) -> AhoCorasick:
+        """정식 학과명과 모든 줄임말을 하나의 Aho-Corasick 오토마톤으로 컴파일"""
+        patterns = [(dept, dept) for dept in self.official_departments]
+        for dept, abbreviations in self.department_to_abbreviations.items():
+            patterns.extend((abbrev, dept) for abbrev in abbreviations)
+        return AhoCorasick(patterns)
     def _create_department_abbreviations(self) -> Dict[str, Set[str]]:
         """각 정식 학과명에 대한 가능한 줄임말들 매핑 생성"""
         mapping = {}
@@ -66,18 +92,57 @@ class DepartmentMatcher:
         for official_name, abbreviations in base_mappings.items():
             if official_name in self.official_departments:
                 mapping[official_name] = abbreviations.copy()
+        cache_key = self._abbreviation_cache_key(mapping)
+        cached = self._load_cached_abbreviations(cache_key)
+        if cached is not None:
+            return cached
         try:
             self._extract_from_classification_files(mapping)
         except Exception as e:
             print(f"Warning: Could not load classification files: {e}")
+        self._save_cached_abbreviations(cache_key, mapping)
         return mapping
+    def _abbreviation_cache_key(self, base_mapping: Dict[str, Set[str]]) -> str:
+        """줄임말 캐시 키: 정식 학과 목록 + 기본 줄임말 + 수강분류 파일 내용의 해시"""
+        import hashlib
+        digest = hashlib.sha256()
+        digest.update(json.dumps([
+            ABBREVIATION_CACHE_VERSION,
+            sorted(self.official_departments),
+            sorted((dept, sorted(abbrevs)) for dept, abbrevs in base_mapping.items()),
+        ], ensure_ascii=False).encode('utf-8'))
+        for file_path in CLASSIFICATION_FILES:
+            digest.update(file_path.encode('utf-8'))
+            try:
+                with open(file_path, 'rb') as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+            except OSError:
+                digest.update(b'missing')
+        return digest.hexdigest()
+    def _load_cached_abbreviations(self, cache_key: str) -> Optional[Dict[str, Set[str]]]:
+        try:
+            with open(ABBREVIATION_CACHE_PATH, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('key') != cache_key:
+            return None
+        return {dept: set(abbrevs) for dept, abbrevs in data['mapping'].items()}
+    def _save_cached_abbreviations(self, cache_key: str, mapping: Dict[str, Set[str]]):
+        try:
+            os.makedirs(os.path.dirname(ABBREVIATION_CACHE_PATH), exist_ok=True)
+            tmp_path = ABBREVIATION_CACHE_PATH + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'key': cache_key,
+                    'mapping': {dept: sorted(abbrevs) for dept, abbrevs in mapping.items()},
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, ABBREVIATION_CACHE_PATH)
+        except OSError:
+            pass
     def _extract_from_classification_files(self, mapping: Dict[str, Set[str]]):
         """수강분류 파일들에서 추가 줄임말 추출"""
-        classification_files = [
-            'classification/수강분류_가공_전 (3).json',
-            'classification/수강분류_가공_후 (3).json'
-        ]
-        for file_path in classification_files:
+        for file_path in CLASSIFICATION_FILES:
             if os.path.exists(file_path):
                 try:
                     with open(file_path, 'r', encoding='utf-8') as f:
@@ -94,27 +159,53 @@ class DepartmentMatcher:
         for part in parts:
             if any(exclude in part for exclude in ['학년', '전체', '제한', '수강', '가능', '불가', '대상외', '순수외국인']):
                 continue
-            for official_name in self.official_departments:
-                if part in official_name and len(part) >= 2:
-                    if official_name not in mapping:
-                        mapping[official_name] = {official_name}
-                    mapping[official_name].add(part)
+            if self._substring_to_departments is None:
+                self._substring_to_departments = self._create_substring_table()
+            for official_name in self._substring_to_departments.get(part, ()):
+                if official_name not in mapping:
+                    mapping[official_name] = {official_name}
+                mapping[official_name].add(part)
+    def _lookup(self, target_text: str) -> FrozenSet[str]:
+        matched = self._match_cache.get(target_text)
+        if matched is None:
+            if self._automaton is None:
+                with span('department_matcher.automaton'):
+                    self._automaton = self._build_automaton()
+            count('department_matcher.scans')
+            with span('department_matcher.scan'):
+                matched = frozenset(self._automaton.find_all(target_text))
+            if len(self._match_cache) >= 10000:
+                self._match_cache.clear()
+            self._match_cache[target_text] = matched
+        return matched
+    def match_all(self, target_text: str) -> Set[str]:
+        """target 텍스트에 정식 학과명 또는 줄임말이 등장하는 모든 학과 (한 번의 선형 탐색)"""
+        if not target_text:
+            return set()
+        return set(self._lookup(target_text))
+    def _matches(self, target_text: str, department: str, matched: FrozenSet[str]) -> bool:
+        if department in self.official_departments or department in self.department_to_abbreviations:
+            return department in matched
+        return department in target_text
     def matches_department(self, target_text: str, department: str) -> bool:
         """target 텍스트가 주어진 학과와 매칭되는지 확인 (줄임말 지원)"""
         if not target_text or not department:
             return False
-        if department in target_text:
-            return True
-        if department in self.department_to_abbreviations:
-            abbreviations = self.department_to_abbreviations[department]
-            for abbrev in abbreviations:
-                if abbrev in target_text:
-                    return True
-        return False
+        return self._matches(target_text, department, self._lookup(target_text))
     def matches_any_department(self, target_text: str, departments: List[str]) -> bool:
         """target 텍스트가 주어진 학과들 중 하나와 매칭되는지 확인"""
-        for dept in departments:
-            if self.matches_department(target_text, dept):
-                return True
-        return False
-department_matcher = DepartmentMatcher()
+        if not target_text:
+            return False
+        matched = self._lookup(target_text)
+        return any(dept and self._matches(target_text, dept, matched) for dept in departments)
+_department_matcher: Optional[DepartmentMatcher] = None
+def get_department_matcher() -> DepartmentMatcher:
+    """처음 사용할 때 한 번만 생성되는 전역 DepartmentMatcher"""
+    global _department_matcher
+    if _department_matcher is None:
+        _department_matcher = DepartmentMatcher()
+    return _department_matcher
+def __getattr__(name: str):
+    if name == 'department_matcher':
+        return get_department_matcher()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,59 @@
+import os
+import time
+from typing import Optional
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+class LockTimeout(Exception):
+    pass
+class FileLock:
+    """
+    같은 호스트의 여러 프로세스(및 스레드) 사이의 배타적 파일 잠금
+    POSIX는 fcntl.flock, Windows는 msvcrt.locking을 사용하며 잠금 파일은 지우지 않고 재사용한다.
+    """
+    def __init__(self, path: str, timeout: Optional[float] = None, poll_interval: float = 0.05):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+    def _try_lock(self, fd: int) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+    def acquire(self):
+        """잠금을 얻을 때까지 대기 (timeout 초과 시 LockTimeout)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self._try_lock(fd):
+            if deadline is not None and time.monotonic() >= deadline:
+                os.close(fd)
+                raise LockTimeout(self.path)
+            time.sleep(self.poll_interval)
+        self._fd = fd
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+    def __exit__(self, *exc):
+        self.release()
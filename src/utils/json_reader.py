@@ -0,0 +1,68 @@
+import json
+from typing import Any, Iterator
+CHUNK_CHARS = 1 << 16
+_decoder = json.JSONDecoder()
+def _skip_whitespace(buffer: str, position: int) -> int:
+    while position < len(buffer) and buffer[position] in ' \t\n\r':
+        position += 1
+    return position
+def iter_json_array(path: str, chunk_chars: int = CHUNK_CHARS) -> Iterator[Any]:
+    """
+    최상위 JSON 배열의 항목을 하나씩 읽어 돌려줌 (json.load와 같은 값, 파일 전체를 메모리에 올리지 않음)
+    chunk_chars 글자씩 읽어 JSONDecoder.raw_decode로 항목 하나씩 해석하므로, 메모리는 가장 큰 항목 크기 정도만 쓴다.
+    배열이 아니거나 형식이 잘못되었으면 ValueError(json.JSONDecodeError)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        position = 0
+        eof = False
+        def fill() -> bool:
+            nonlocal buffer, position, eof
+            if eof:
+                return False
+            chunk = f.read(chunk_chars)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[position:] + chunk
+            position = 0
+            return True
+        def next_token() -> str:
+            nonlocal position
+            while True:
+                position = _skip_whitespace(buffer, position)
+                if position < len(buffer):
+                    return buffer[position]
+                if not fill():
+                    return ''
+        if next_token() != '[':
+            raise json.JSONDecodeError("JSON 배열이 아닙니다", buffer, position)
+        position += 1
+        if next_token() == ']':
+            position += 1
+        else:
+            while True:
+                if not next_token():
+                    raise json.JSONDecodeError("배열이 끝나지 않았습니다", buffer, position)
+                while True:
+                    try:
+                        item, end = _decoder.raw_decode(buffer, position)
+                    except json.JSONDecodeError:
+                        if fill():
+                            continue
+                        raise
+                    # 숫자는 조각 끝에서 잘렸을 수 있으므로('2.' + '5') 뒤에 ',' 또는 ']'가 보일 때만 확정
+                    after = _skip_whitespace(buffer, end)
+                    if (after == len(buffer) or buffer[after] not in ',]') and fill():
+                        continue
+                    break
+                position = end
+                yield item
+                token = next_token()
+                position += 1
+                if token == ']':
+                    break
+                if token != ',':
+                    raise json.JSONDecodeError("',' 또는 ']'가 필요합니다", buffer, max(position - 1, 0))
+        if next_token():
+            raise json.JSONDecodeError("배열 뒤에 다른 값이 있습니다", buffer, position)
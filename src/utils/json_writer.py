@@ -0,0 +1,133 @@
+import json
+import os
+import shutil
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Optional
+OUTPUT_FORMATS = ('json', 'ndjson')
+def write_json_atomic(path: str, data: Any, indent: int = 2):
+    """임시 파일에 쓴 뒤 os.replace로 교체하여 중간 상태의 JSON이 보이지 않게 저장"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+class _StreamWriter(ABC):
+    """항목을 하나씩 임시 파일에 쓰고 close()에서 원래 경로로 교체 (예외로 끝나면 임시 파일 삭제)"""
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._tmp_path = f"{path}.{os.getpid()}.tmp"
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+    @abstractmethod
+    def write(self, item: Any):
+        """항목 하나 기록 (self.count 증가)"""
+    def write_all(self, items: Iterable[Any]) -> int:
+        for item in items:
+            self.write(item)
+        return self.count
+    def _finish(self):
+        pass
+    def close(self):
+        if self._file.closed:
+            return
+        self._finish()
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+    def abort(self):
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+class JsonArrayWriter(_StreamWriter):
+    """
+    JSON 배열을 항목 단위로 바로 기록 (메모리에 목록을 모으지 않음)
+    결과 파일은 json.dump(items, ensure_ascii=False, indent=indent)와 바이트 단위로 같다.
+    """
+    def __init__(self, path: str, indent: Optional[int] = 2):
+        super().__init__(path)
+        self.indent = indent
+    def write(self, item: Any):
+        self._file.write((_array_open(self.indent) if self.count == 0 else _array_separator(self.indent))
+                         + encode_array_item(item, self.indent))
+        self.count += 1
+    def _finish(self):
+        if self.count == 0:
+            self._file.write('[]')
+        else:
+            self._file.write(_array_close(self.indent))
+class JsonArrayPartWriter(_StreamWriter):
+    """
+    JSON 배열의 일부(대괄호 없이 항목과 구분자만)를 기록
+    여러 조각을 join_json_array_parts로 이어 붙이면 전체를 JsonArrayWriter로 쓴 것과 같은 파일이 된다.
+    """
+    def __init__(self, path: str, indent: Optional[int] = 2):
+        super().__init__(path)
+        self.indent = indent
+    def write(self, item: Any):
+        self._file.write(('' if self.count == 0 else _array_separator(self.indent))
+                         + encode_array_item(item, self.indent))
+        self.count += 1
+def _array_open(indent: Optional[int]) -> str:
+    return '[' if indent is None else '[\n'
+def _array_separator(indent: Optional[int]) -> str:
+    return ', ' if indent is None else ',\n'
+def _array_close(indent: Optional[int]) -> str:
+    return ']' if indent is None else '\n]'
+def encode_array_item(item: Any, indent: Optional[int] = 2) -> str:
+    """json.dump(indent=indent)가 배열 안의 항목 하나를 쓰는 모양 그대로 인코딩"""
+    encoded = json.dumps(item, ensure_ascii=False, indent=indent)
+    if indent is None:
+        return encoded
+    pad = ' ' * indent
+    return pad + encoded.replace('\n', '\n' + pad)
+def join_json_array_parts(path: str, part_paths: Iterable[str], indent: Optional[int] = 2) -> int:
+    """JsonArrayPartWriter 조각들을 순서대로 이어 하나의 JSON 배열로 저장 (조각 내용은 다시 파싱하지 않음), 기록한 조각 수 반환"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    written = 0
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            for part_path in part_paths:
+                if os.path.getsize(part_path) == 0:
+                    continue
+                out.write(_array_open(indent) if written == 0 else _array_separator(indent))
+                with open(part_path, 'r', encoding='utf-8') as part:
+                    shutil.copyfileobj(part, out)
+                written += 1
+            out.write(_array_close(indent) if written else '[]')
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return written
+class NdjsonWriter(_StreamWriter):
+    """한 줄에 JSON 객체 하나 (NDJSON / JSON Lines)"""
+    def write(self, item: Any):
+        self._file.write(json.dumps(item, ensure_ascii=False))
+        self._file.write('\n')
+        self.count += 1
+def open_json_writer(path: str, fmt: str = 'json', indent: Optional[int] = 2) -> _StreamWriter:
+    """fmt: 'json'(배열) 또는 'ndjson'"""
+    if fmt == 'ndjson':
+        return NdjsonWriter(path)
+    if fmt == 'json':
+        return JsonArrayWriter(path, indent)
+    raise ValueError(f"지원하지 않는 출력 형식입니다: {fmt}")
+def output_path_for_format(path: str, fmt: str) -> str:
+    """ndjson이면 확장자를 .ndjson으로 바꾼 경로"""
+    if fmt == 'ndjson':
+        return os.path.splitext(path)[0] + '.ndjson'
+    return path
+def write_json_stream(path: str, items: Iterable[Any], fmt: str = 'json', indent: Optional[int] = 2) -> int:
+    """items를 스트리밍으로 기록하고 기록한 항목 수 반환"""
+    with open_json_writer(path, fmt, indent) as writer:
+        return writer.write_all(items)
@@ -1,85 +1,180 @@
+import argparse
+import hashlib
 import json
 import os
+import shutil
 from collections import defaultdict
-import pandas as pd
-def parse_category(category_str):
+from contextlib import ExitStack
+from typing import Dict, Optional
+from src.core.catalog_paths import discover_semesters, get_cache_dir, list_source_files
+from src.core.category_parser import CATEGORY_GROUPS, CategoryIndex, parse_category
+from src.core.ingest import iter_canonical
+from src.utils.csv_writer import CsvStreamWriter, join_csv_parts
+from src.utils.json_writer import JsonArrayPartWriter, join_json_array_parts, write_json_atomic
+from src.utils.profiling import add_profile_arguments, count, profile_run, span, timed_iter
+MANIFEST_VERSION = 1
+PARTS_DIR_NAME = 'categories'
+MANIFEST_FILE_NAME = 'manifest.json'
+OUTPUT_FILES = tuple(f"parsed_{category}_courses.json" for category in CATEGORY_GROUPS) + (
+    'category_index.json', 'parsing_statistics.json')
+def file_sha1(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+def get_parts_dir(folder_path: str) -> str:
+    return os.path.join(get_cache_dir(folder_path), PARTS_DIR_NAME)
+def get_part_dir(folder_path: str, filename: str) -> str:
+    """입력 파일별 결과 조각 디렉토리 ({폴더}/.cache/categories/{파일명 해시})"""
+    return os.path.join(get_parts_dir(folder_path), hashlib.sha1(filename.encode('utf-8')).hexdigest()[:20])
+def load_manifest(folder_path: str) -> Dict:
+    try:
+        with open(os.path.join(get_parts_dir(folder_path), MANIFEST_FILE_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': MANIFEST_VERSION, 'files': {}}
+def save_manifest(folder_path: str, manifest: Dict):
+    os.makedirs(get_parts_dir(folder_path), exist_ok=True)
+    write_json_atomic(os.path.join(get_parts_dir(folder_path), MANIFEST_FILE_NAME), manifest)
+def is_unchanged(folder_path: str, filename: str, entry: Optional[Dict]) -> bool:
+    """
+    manifest 항목과 비교해 다시 처리할 필요가 없는지
+    크기/mtime이 같으면 그대로 쓰고, 다르면 내용 해시를 비교한다 (touch만 된 파일은 mtime만 갱신)
     """
-    category 문자열을 파싱하여 전필, 전선, 기타로 분류
-    전기는 전선으로 분류
+    if not entry or not os.path.isdir(get_part_dir(folder_path, filename)):
+        return False
+    file_path = os.path.join(folder_path, filename)
+    stat = os.stat(file_path)
+    if entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+        return True
+    if entry.get('size') != stat.st_size or file_sha1(file_path) != entry.get('sha1'):
+        return False
+    entry['mtime_ns'] = stat.st_mtime_ns
+    return True
+def process_file(folder_path: str, filename: str) -> Dict:
     """
-    if not category_str:
-        return "기타"
-    if category_str.startswith("전필"):
-        return "전필"
-    elif category_str.startswith("전선") or category_str.startswith("전기"):
-        return "전선"
-    else:
-        return "기타"
-def parse_2025_1_courses():
+    입력 파일 하나를 파싱해 결과 조각(분류별 JSON 배열 조각, CSV, 색인)을 쓰고 manifest 항목 반환
+    """
+    file_path = os.path.join(folder_path, filename)
+    stat = os.stat(file_path)
+    sha1 = file_sha1(file_path)
+    part_dir = get_part_dir(folder_path, filename)
+    os.makedirs(part_dir, exist_ok=True)
+    index = CategoryIndex(keep_courses=False)
+    file_category_count = defaultdict(int)
+    with ExitStack() as stack:
+        writers = {
+            category: stack.enter_context(JsonArrayPartWriter(os.path.join(part_dir, f"parsed_{category}.part")))
+            for category in CATEGORY_GROUPS
+        }
+        csv_writer = stack.enter_context(CsvStreamWriter(os.path.join(part_dir, 'courses.csv')))
+        for course in timed_iter('parse.read', iter_canonical(file_path)):
+            original_category = course.get('category', '')
+            parsed_category = parse_category(original_category)
+            course_data = dict(course)
+            course_data['parsed_category'] = parsed_category
+            course_data['source_file'] = filename
+            index.add(course_data)
+            writers[parsed_category].write(course_data)
+            csv_writer.write(course_data)
+            file_category_count[parsed_category] += 1
+    write_json_atomic(os.path.join(part_dir, 'index.json'), index.to_dict(), indent=None)
+    count('parse.courses', index.size)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha1': sha1,
+        'courses': index.size,
+        'categories': dict(file_category_count)
+    }
+def parse_2025_1_courses(folder_path="result/2025_1", full=False):
     """
-    result/2025_1 폴더의 모든 JSON 파일을 읽어서 category별로 파싱
+    학기 폴더(기본: result/2025_1)의 모든 JSON 파일을 읽어서 category별로 파싱
+    manifest(파일 경로, 크기, mtime, 내용 해시, 파일별 통계)와 비교해 바뀐 입력 파일만 다시 처리하고,
+    파일별 결과 조각은 {폴더}/.cache/categories/에 남겨 둔다. 이 함수의 출력 파일과 search_ 결과는 입력에서 제외된다.
+    반환: (manifest, 다시 처리하거나 사라진 파일 수)
     """
-    folder_path = "result/2025_1"
     if not os.path.exists(folder_path):
         print(f"❌ {folder_path} 폴더를 찾을 수 없습니다.")
         return
-    results = {
-        "전필": [],
-        "전선": [],
-        "기타": []
-    }
-    all_courses = []
-    file_stats = {}
-    for filename in os.listdir(folder_path):
-        if filename.endswith('.json'):
-            file_path = os.path.join(folder_path, filename)
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    courses = json.load(f)
-                file_category_count = defaultdict(int)
-                for course in courses:
-                    original_category = course.get('category', '')
-                    parsed_category = parse_category(original_category)
-                    course_data = course.copy()
-                    course_data['parsed_category'] = parsed_category
-                    course_data['source_file'] = filename
-                    results[parsed_category].append(course_data)
-                    all_courses.append(course_data)
-                    file_category_count[parsed_category] += 1
-                file_stats[filename] = dict(file_category_count)
-                print(f"✓ 처리 완료: {filename} ({len(courses)}개 과목)")
-            except Exception as e:
-                print(f"✗ 오류 발생: {filename} - {e}")
-    return results, all_courses, file_stats
-def save_results(results, all_courses, file_stats):
+    manifest = {'version': MANIFEST_VERSION, 'files': {}} if full else load_manifest(folder_path)
+    previous = manifest['files']
+    files = {}
+    changed = 0
+    for filename in list_source_files(folder_path):
+        entry = previous.get(filename)
+        with span('parse.check_unchanged'):
+            unchanged = is_unchanged(folder_path, filename, entry)
+        if unchanged:
+            files[filename] = entry
+            print(f"= 변경 없음: {filename} ({entry['courses']}개 과목)")
+            continue
+        changed += 1
+        try:
+            with span('parse.process_file'):
+                files[filename] = process_file(folder_path, filename)
+            print(f"✓ 처리 완료: {filename} ({files[filename]['courses']}개 과목)")
+        except Exception as e:
+            shutil.rmtree(get_part_dir(folder_path, filename), ignore_errors=True)
+            print(f"✗ 오류 발생: {filename} - {e}")
+    for filename in set(previous) - set(files):
+        changed += 1
+        shutil.rmtree(get_part_dir(folder_path, filename), ignore_errors=True)
+        if not os.path.exists(os.path.join(folder_path, filename)):
+            print(f"🗑️ 삭제된 파일 제외: {filename}")
+    manifest['files'] = files
+    save_manifest(folder_path, manifest)
+    return manifest, changed
+def outputs_exist(output_dir: str) -> bool:
+    return all(os.path.exists(os.path.join(output_dir, name)) for name in OUTPUT_FILES)
+def save_results(manifest, output_dir="result/2025_1", folder_path="result/2025_1"):
     """
-    결과를 다양한 형태로 저장
+    파일별 결과 조각을 파일명 순서대로 이어 붙여 분류별 JSON, CSV, 색인, 통계를 저장
+    조각은 다시 파싱하지 않고 그대로 복사하므로, 전체를 한 번에 처리한 결과와 같은 파일이 나온다.
     """
-    output_dir = "result/2025_1"
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
         print(f"📁 디렉토리 생성: {output_dir}")
-    for category, courses in results.items():
+    filenames = sorted(manifest['files'])
+    entries = [manifest['files'][filename] for filename in filenames]
+    part_dirs = [get_part_dir(folder_path, filename) for filename in filenames]
+    for category in CATEGORY_GROUPS:
         output_file = os.path.join(output_dir, f"parsed_{category}_courses.json")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(courses, f, ensure_ascii=False, indent=2)
-        print(f"저장 완료: {output_file} ({len(courses)}개 과목)")
-    if all_courses:
-        df = pd.DataFrame(all_courses)
+        with span('parse.join_json'):
+            join_json_array_parts(output_file, [os.path.join(d, f"parsed_{category}.part") for d in part_dirs])
+        count = sum(e['categories'].get(category, 0) for e in entries)
+        print(f"저장 완료: {output_file} ({count}개 과목)")
+    with span('parse.index'):
+        index = CategoryIndex(keep_courses=False)
+        for part_dir in part_dirs:
+            with open(os.path.join(part_dir, 'index.json'), 'r', encoding='utf-8') as f:
+                index.merge(json.load(f))
+        index_file = os.path.join(output_dir, 'category_index.json')
+        with open(index_file, 'w', encoding='utf-8') as f:
+            json.dump(index.to_dict(), f, ensure_ascii=False)
+    print(f"저장 완료: {index_file} ({len(index.by_department)}개 학과)")
+    if index.size:
         csv_file = os.path.join(output_dir, 'all_courses_with_parsed_category.csv')
-        df.to_csv(csv_file, index=False, encoding='utf-8-sig')
-        print(f"저장 완료: {csv_file} ({len(all_courses)}개 과목)")
-    create_statistics_report(results, file_stats, output_dir)
-def create_statistics_report(results, file_stats, output_dir):
+        with span('parse.join_csv'):
+            join_csv_parts(csv_file, [os.path.join(d, 'courses.csv') for d in part_dirs])
+        print(f"저장 완료: {csv_file} ({index.size}개 과목)")
+    file_stats = {filename: entry['categories'] for filename, entry in zip(filenames, entries)}
+    with span('parse.statistics'):
+        create_statistics_report(index, file_stats, output_dir)
+def create_statistics_report(index, file_stats, output_dir):
     """
     통계 보고서 생성
     """
     print("\n" + "="*60)
     print("📊 카테고리별 과목 통계")
     print("="*60)
-    total_courses = sum(len(courses) for courses in results.values())
-    for category, courses in results.items():
-        count = len(courses)
+    total_courses = index.size
+    for category in CATEGORY_GROUPS:
+        count = len(index.groups[category])
         percentage = (count / total_courses * 100) if total_courses > 0 else 0
         print(f"{category}: {count:,}개 과목 ({percentage:.1f}%)")
     print(f"\n총 과목 수: {total_courses:,}개")
@@ -93,26 +188,41 @@ def create_statistics_report(results, file_stats, output_dir):
             print(f"  {category}: {count}개")
     summary_stats = {
         "total_courses": total_courses,
-        "category_distribution": {category: len(courses) for category, courses in results.items()},
+        "category_distribution": {category: len(index.groups[category]) for category in CATEGORY_GROUPS},
         "file_statistics": file_stats
     }
     stats_file = os.path.join(output_dir, 'parsing_statistics.json')
     with open(stats_file, 'w', encoding='utf-8') as f:
         json.dump(summary_stats, f, ensure_ascii=False, indent=2)
     print(f"\n저장 완료: {stats_file}")
-def main():
-    """
-    메인 실행 함수
-    """
-    print("🚀 result/2025_1 폴더 과목 카테고리 파싱 시작...")
-    if not os.path.exists("result/2025_1"):
-        print("❌ result/2025_1 폴더를 찾을 수 없습니다.")
+def parse_semester_folder(folder_path: str, full: bool = False):
+    """학기 폴더 하나의 category 파싱 (바뀐 입력 파일이 없고 결과가 있으면 그대로 둠)"""
+    print(f"🚀 {folder_path} 폴더 과목 카테고리 파싱 시작...")
+    if not os.path.exists(folder_path):
+        print(f"❌ {folder_path} 폴더를 찾을 수 없습니다.")
         return
     try:
-        results, all_courses, file_stats = parse_2025_1_courses()
-        save_results(results, all_courses, file_stats)
+        manifest, changed = parse_2025_1_courses(folder_path, full=full)
+        if changed == 0 and outputs_exist(folder_path):
+            print("\n✅ 바뀐 입력 파일이 없어 기존 결과를 그대로 둡니다.")
+            return
+        save_results(manifest, folder_path, folder_path)
         print("\n✅ 파싱 완료!")
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
+def main():
+    """
+    메인 실행 함수
+    """
+    parser = argparse.ArgumentParser(description='학기 폴더 과목 카테고리 일괄 파싱 (기본: result/2025_1)')
+    parser.add_argument('--full', action='store_true', help='manifest를 무시하고 모든 입력 파일을 다시 처리')
+    parser.add_argument('--semester', action='append', help='파싱할 학기 폴더 이름 (여러 번 사용 가능, 기본: 2025_1)')
+    parser.add_argument('--all', action='store_true', help='result/ 아래 원본 파일이 있는 모든 학기 폴더 파싱')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    semesters = discover_semesters() if args.all else (args.semester or ['2025_1'])
+    with profile_run(args):
+        for name in semesters:
+            parse_semester_folder(os.path.join("result", name), full=args.full)
 if __name__ == "__main__":
     main()
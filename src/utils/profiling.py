@@ -0,0 +1,182 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+class _NullSpan:
+    """프로파일링이 꺼져 있을 때 span()이 돌려주는 공유 객체 (아무것도 하지 않음)"""
+    __slots__ = ()
+    def __enter__(self):
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        return False
+_NULL_SPAN = _NullSpan()
+_active: Optional['Profiler'] = None
+class StageStats:
+    """단계 하나의 호출 수, 전체 시간, 자기 시간(안쪽 단계 시간을 뺀 값)"""
+    __slots__ = ('calls', 'total', 'self_time')
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.self_time = 0.0
+class Span:
+    """
+    with 블록 하나의 시간을 재는 구간 (스레드마다 열린 구간 스택을 두어 바깥 구간의 자기 시간에서 뺌)
+    """
+    __slots__ = ('profiler', 'name', 'started', 'children')
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0.0
+        self.children = 0.0
+    def __enter__(self):
+        self.profiler._stack().append(self)
+        self.started = time.perf_counter()
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        stack = self.profiler._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        self.profiler._record(self.name, self.started, elapsed, elapsed - self.children)
+        return False
+class Profiler:
+    """
+    단계별 시간(span)과 카운터 수집기
+    trace=True면 구간마다 Chrome trace 이벤트를 남겨 dump_trace()로 저장할 수 있다 (chrome://tracing, Perfetto).
+    """
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.events: List[Dict] = []
+        self.started = time.perf_counter()
+        self.wall = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    def _record(self, name: str, started: float, elapsed: float, self_time: float):
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats()
+            stats.calls += 1
+            stats.total += elapsed
+            stats.self_time += self_time
+            if self.trace:
+                self.events.append({
+                    'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                    'ts': (started - self.started) * 1e6, 'dur': elapsed * 1e6
+                })
+    def span(self, name: str) -> Span:
+        return Span(self, name)
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    def timed_iter(self, name: str, iterable: Iterable) -> Iterator:
+        """이터레이터의 next() 호출마다 name 구간으로 재며 항목을 그대로 흘려보냄 (생성기 파이프라인의 단계별 시간)"""
+        iterator = iter(iterable)
+        while True:
+            with Span(self, name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+    def stop(self):
+        self.wall = time.perf_counter() - self.started
+    def report(self) -> str:
+        """전체 시간 순 단계별 표 (자기 시간 비율은 전체 실행 시간 대비, 동시 실행 스레드가 있으면 합이 100%를 넘을 수 있음)"""
+        wall = self.wall or time.perf_counter() - self.started
+        width = max([len(name) for name in self.stages] + [20])
+        lines = [
+            f"⏱️ 단계별 시간 (전체 {wall:.3f}초)",
+            f"  {'stage':<{width}} {'calls':>7} {'total':>9} {'self':>9} {'self%':>6}"
+        ]
+        for name, stats in sorted(self.stages.items(), key=lambda item: item[1].total, reverse=True):
+            share = stats.self_time / wall * 100 if wall else 0.0
+            lines.append(f"  {name:<{width}} {stats.calls:>7} {stats.total:>8.3f}s {stats.self_time:>8.3f}s {share:>5.1f}%")
+        if self.counters:
+            lines.append("  카운터: " + ', '.join(f"{name}={value:,}" for name, value in sorted(self.counters.items())))
+        return '\n'.join(lines)
+    def to_trace(self) -> Dict:
+        """Chrome trace 형식 (구간 이벤트 + 마지막 시점의 카운터 이벤트)"""
+        events = list(self.events)
+        if self.counters:
+            events.append({
+                'name': 'counters', 'ph': 'C', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                'ts': (self.wall or time.perf_counter() - self.started) * 1e6, 'args': dict(self.counters)
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+    def dump_trace(self, path: str):
+        from .json_writer import write_json_atomic
+        write_json_atomic(path, self.to_trace(), indent=None)
+def span(name: str):
+    """프로파일링 중이면 name 단계 시간을 재는 구간, 아니면 공유 no-op 객체 (with span('search.index'): ...)"""
+    profiler = _active
+    if profiler is None:
+        return _NULL_SPAN
+    return Span(profiler, name)
+def count(name: str, value: int = 1):
+    """프로파일링 중일 때만 카운터 증가"""
+    profiler = _active
+    if profiler is not None:
+        profiler.count(name, value)
+def timed_iter(name: str, iterable: Iterable) -> Iterable:
+    """프로파일링 중이면 항목마다 시간을 재는 이터레이터, 아니면 iterable 그대로"""
+    profiler = _active
+    if profiler is None:
+        return iterable
+    return profiler.timed_iter(name, iterable)
+def get_profiler() -> Optional[Profiler]:
+    return _active
+def enable(trace: bool = False) -> Profiler:
+    global _active
+    _active = Profiler(trace)
+    return _active
+def disable() -> Optional[Profiler]:
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+def add_profile_arguments(parser):
+    """CLI 공통 프로파일링 옵션 (--profile, --profile-trace, --cprofile)"""
+    parser.add_argument('--profile', action='store_true', help='실행 후 단계별 시간(JSON 파싱, 시간표 파싱, 학과 매칭, rusaint-cli 실행, 출력 기록 등) 출력')
+    parser.add_argument('--profile-trace', metavar='PATH', help='단계별 구간을 Chrome trace JSON으로 저장 (--profile 포함)')
+    parser.add_argument('--cprofile', metavar='PATH', help='cProfile 결과를 저장 (python -m pstats PATH로 확인, --profile 포함)')
+@contextmanager
+def profile_run(args):
+    """
+    add_profile_arguments로 받은 옵션에 따라 with 블록 실행을 프로파일링
+    옵션이 없으면 아무것도 켜지 않는다 (span/count는 전역 변수 확인 한 번으로 끝남).
+    """
+    trace_path = getattr(args, 'profile_trace', None)
+    cprofile_path = getattr(args, 'cprofile', None)
+    if not (getattr(args, 'profile', False) or trace_path or cprofile_path):
+        yield None
+        return
+    profiler = enable(trace=bool(trace_path))
+    cprofiler = None
+    if cprofile_path:
+        import cProfile
+        cprofiler = cProfile.Profile()
+        cprofiler.enable()
+    try:
+        yield profiler
+    finally:
+        if cprofiler is not None:
+            cprofiler.disable()
+        disable()
+        print("\n" + profiler.report())
+        if trace_path:
+            profiler.dump_trace(trace_path)
+            print(f"📁 trace 저장: {trace_path}")
+        if cprofiler is not None:
+            cprofiler.dump_stats(cprofile_path)
+            print(f"📁 cProfile 저장: {cprofile_path} (python -m pstats {cprofile_path})")
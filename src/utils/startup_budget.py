@@ -0,0 +1,69 @@
+import os
+import re
+import subprocess
+import sys
+import argparse
+from typing import Dict, List, Tuple
+DEFAULT_MODULES = [
+    'src.cli.get_major',
+    'src.cli.find_by_lecture',
+    'src.cli.rusaint_cli_wrapper',
+    'src.utils.parse_categories',
+]
+DEFAULT_FORBIDDEN = ['pandas', 'numpy']
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+def measure_import(module: str) -> Tuple[int, Dict[str, Tuple[int, int]]]:
+    """
+    새 인터프리터에서 `python -X importtime -c "import module"`을 실행하여
+    (모듈 누적 import 시간[us], {모듈명: (self us, cumulative us)})를 반환
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+        cwd=os.getcwd()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else module)
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            timings[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    if module not in timings:
+        raise RuntimeError(f"importtime 출력에서 {module}을 찾을 수 없습니다.")
+    return timings[module][1], timings
+def check_budget(modules: List[str], budget_ms: float, forbidden: List[str], repeat: int = 3) -> bool:
+    """각 모듈의 import 시간(반복 중 최솟값)이 예산 이내이고 금지 모듈을 끌어오지 않는지 확인"""
+    ok = True
+    for module in modules:
+        best_us = None
+        timings: Dict[str, Tuple[int, int]] = {}
+        for _ in range(max(1, repeat)):
+            cumulative_us, timings = measure_import(module)
+            best_us = cumulative_us if best_us is None else min(best_us, cumulative_us)
+        loaded_forbidden = [name for name in forbidden if name in timings]
+        within_budget = best_us / 1000 <= budget_ms
+        status = "✅" if within_budget and not loaded_forbidden else "❌"
+        print(f"{status} {module}: {best_us / 1000:.1f}ms (예산 {budget_ms:.0f}ms)")
+        if loaded_forbidden:
+            print(f"   무거운 모듈이 import 시점에 로드됨: {', '.join(loaded_forbidden)}")
+        if not within_budget:
+            slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:5]
+            for name, (self_us, _) in slowest:
+                print(f"   {name}: {self_us / 1000:.1f}ms")
+        ok = ok and within_budget and not loaded_forbidden
+    return ok
+def main():
+    parser = argparse.ArgumentParser(description='CLI 모듈 import 시간 예산 검사 (-X importtime)')
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help='검사할 모듈')
+    parser.add_argument('--budget-ms', type=float, default=100.0, help='모듈별 누적 import 시간 예산(ms)')
+    parser.add_argument('--forbid', action='append', default=None, help='import 시점에 로드되면 안 되는 모듈')
+    parser.add_argument('--repeat', type=int, default=3, help='측정 반복 횟수 (최솟값 사용)')
+    args = parser.parse_args()
+    forbidden = args.forbid if args.forbid is not None else DEFAULT_FORBIDDEN
+    if not check_budget(args.modules, args.budget_ms, forbidden, args.repeat):
+        sys.exit(1)
+if __name__ == "__main__":
+    main()